@@ -0,0 +1,3 @@
+"""
+Headless benchmarks for the dashboard data pipelines; see ``benchmarks.run``.
+"""
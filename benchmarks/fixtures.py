@@ -0,0 +1,168 @@
+"""
+API response fixtures shaped exactly like the real upstream payloads.
+
+Each builder returns the decoded JSON body the real endpoint would send for
+a request, filled with deterministic synthetic values (see
+``iuoe_data.synthetic``): the same request always gets the same response,
+so timings are comparable from run to run without network access.
+
+``iuoe_data`` is only imported when a fixture is first built: importing it
+reads the endpoint overrides from the environment, and the benchmark
+harness has to set those (to this server's address) first.
+"""
+
+import calendar
+
+import numpy as np
+import pandas as pd
+
+_MONTH_NAMES = list(calendar.month_name)
+
+
+def _series_values(series_id, months, level=1000.0):
+    """A reproducible random walk for ``series_id``, one value per month"""
+    from iuoe_data import synthetic
+
+    rng = synthetic.generator(f"fixture:{series_id}")
+    steps = rng.normal(0.002, 0.01, size=months)
+    return np.round(level * rng.uniform(0.5, 2.0) * np.cumprod(1 + steps), 1)
+
+
+def bls_series_ids(count):
+    """``count`` distinct NJ construction-style BLS series IDs"""
+    return [f"SMU34{i:05d}2000000001" for i in range(count)]
+
+
+def bls_response(series_ids, start_year, end_year):
+    """Body of a successful ``publicAPI/v2/timeseries/data`` response, newest observation first"""
+    start_year, end_year = int(start_year), int(end_year)
+    years = np.repeat(np.arange(start_year, end_year + 1), 12)
+    months = np.tile(np.arange(1, 13), end_year - start_year + 1)
+
+    series = []
+    for series_id in series_ids:
+        values = _series_values(series_id, len(years))
+        series.append({
+            "seriesID": series_id,
+            "data": [
+                {"year": str(year), "period": f"M{month:02d}", "periodName": _MONTH_NAMES[month],
+                 "value": f"{value:.1f}", "footnotes": [{}]}
+                for year, month, value in zip(years[::-1].tolist(), months[::-1].tolist(),
+                                              values[::-1].tolist())
+            ],
+        })
+    return {
+        "status": "REQUEST_SUCCEEDED",
+        "responseTime": 12,
+        "message": [],
+        "Results": {"series": series},
+    }
+
+
+def fred_response(series_id, observation_start, observation_end, offset=0, limit=100000):
+    """
+    Body of a ``fred/series/observations`` response with one value per month
+
+    ``offset`` and ``limit`` page through the observations as FRED does;
+    ``count`` is always the total.
+    """
+    dates = pd.date_range(observation_start, observation_end, freq="MS")
+    values = _series_values(series_id, len(dates), level=100.0)
+    window = slice(offset, offset + limit)
+    return {
+        "realtime_start": observation_start,
+        "realtime_end": observation_end,
+        "observation_start": observation_start,
+        "observation_end": observation_end,
+        "units": "lin",
+        "count": len(dates),
+        "offset": offset,
+        "limit": limit,
+        "observations": [
+            {"realtime_start": observation_start, "realtime_end": observation_end,
+             "date": date, "value": f"{value:.2f}"}
+            for date, value in zip(dates.strftime("%Y-%m-%d")[window], values[window].tolist())
+        ],
+    }
+
+
+def award_records(count, start_date="2023-01-01", end_date="2024-12-31"):
+    """``count`` award result rows as the API lists them, largest obligation first"""
+    from iuoe_data import synthetic
+
+    df = synthetic.awards(contracts=count, start_date=start_date, end_date=end_date)
+    df = df.astype({column: str for column in df.select_dtypes("category").columns})
+    df["award_date"] = df["award_date"].dt.strftime("%Y-%m-%d")
+    records = df.to_dict("records")
+    for rank, record in enumerate(records):
+        record["internal_id"] = rank + 1
+        # The county only comes back inside the recipient's location
+        record["Recipient Location"] = {"state_code": "NJ", "country_name": "UNITED STATES",
+                                        "county_name": record.pop("recipient_county_name").upper()}
+    return records
+
+
+def spending_page(records, page, limit):
+    """Body of one ``search/spending_by_award`` page over ``records``"""
+    first = (page - 1) * limit
+    return {
+        "limit": limit,
+        "results": records[first:first + limit],
+        "page_metadata": {"page": page, "hasNext": first + limit < len(records)},
+        "messages": [],
+    }
+
+
+INSPECTION_TYPES = ["Planned", "Complaint", "Referral", "Accident", "Follow-up"]
+VIOLATION_TYPES = ["Serious", "Other-than-Serious", "Repeat", "Willful", "None"]
+
+
+def osha_inspection_records(count, start_date="2023-01-01", end_date="2024-12-31"):
+    """``count`` NJ construction site inspections, newest first"""
+    from iuoe_data import synthetic
+
+    rng = synthetic.generator("fixture:osha")
+    recipients = synthetic.awards(contracts=count, start_date=start_date, end_date=end_date)
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    dates = start + pd.to_timedelta(np.sort(rng.integers(0, (end - start).days + 1, size=count))[::-1], unit="D")
+    violations = rng.integers(0, len(VIOLATION_TYPES), size=count)
+    penalties = np.where(np.array(VIOLATION_TYPES)[violations] == "None", 0.0,
+                         np.round(rng.lognormal(mean=8.5, sigma=1.0, size=count), 2))
+    return [
+        {"activity_nr": str(1500000000 + i), "estab_name": str(name), "city": str(county),
+         "state": "NJ", "inspection_date": date, "inspection_type": INSPECTION_TYPES[kind],
+         "violation_type": VIOLATION_TYPES[violation], "penalty_amount": penalty}
+        for i, (name, county, date, kind, violation, penalty) in enumerate(zip(
+            recipients["recipient_name"], recipients["recipient_county_name"],
+            dates.strftime("%Y-%m-%d"), rng.integers(0, len(INSPECTION_TYPES), size=count).tolist(),
+            violations.tolist(), penalties.tolist()))
+    ]
+
+
+def osha_page(records, offset, limit):
+    """Body of one ``api/v1/inspections`` page; ``next`` is the following offset, or None"""
+    following = offset + limit
+    return {
+        "count": len(records),
+        "offset": offset,
+        "limit": limit,
+        "next": following if following < len(records) else None,
+        "results": records[offset:following],
+    }
+
+
+def dol_response(series_ids, start_year, end_year):
+    """Body of a DOL ``v1/timeseries`` response: numeric values, oldest first"""
+    start_year, end_year = int(start_year), int(end_year)
+    years = np.repeat(np.arange(start_year, end_year + 1), 12).tolist()
+    months = np.tile(np.arange(1, 13), end_year - start_year + 1).tolist()
+    series = []
+    for series_id in series_ids:
+        values = _series_values(series_id, len(years)).tolist()
+        series.append({
+            "series_id": series_id,
+            "title": f"Series {series_id}",
+            "data": [{"year": str(year), "period": f"M{month:02d}", "value": value}
+                     for year, month, value in zip(years, months, values)],
+        })
+    return {"series": series}
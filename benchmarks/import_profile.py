@@ -0,0 +1,178 @@
+"""
+Report what each script spends importing before it can draw anything.
+
+Run from the repository root:
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --top 15 iuoe_local_825_real_bls_dashboard.py
+
+Everything a Streamlit script imports at module level runs before its page
+config, styles and sidebar reach the browser. For each script this reads
+its top-level imports, executes them in a fresh interpreter under
+``python -X importtime`` and reports:
+
+* ``eager_ms``: what those imports cost, i.e. the wait before first paint;
+* ``deferred_ms``: what the modules it defers with ``iuoe_data.lazy`` would
+  add on top, paid later and only by pages that draw a chart;
+* the slowest imports, with their cumulative and own time.
+
+Modules that aren't installed are listed as missing rather than failing the
+report. Results are also written as JSON next to the benchmark results.
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.run import DASHBOARDS, REPO_ROOT
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "results", "import_profile.json")
+
+SCRIPTS = DASHBOARDS + ["openbb_integration_example.py", "iuoe_local_825_api.py"]
+
+# Written to stderr between interpreter startup and the profiled imports
+_MARKER = "iuoe-import-profile-start"
+
+# Imports one profiled run executes; reports the ones that aren't installed
+_RUNNER = """
+import json, sys
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+missing = []
+for statement in {statements!r}:
+    try:
+        exec(statement, {{}})
+    except ImportError as e:
+        if (e.name or statement) not in missing:
+            missing.append(e.name or statement)
+print(json.dumps(missing))
+"""
+
+
+def script_imports(path):
+    """
+    The top-level import statements of ``path`` and the modules it defers
+
+    Returns ``(statements, deferred)``: source lines such as ``import pandas
+    as pd``, and the names passed to ``lazy.module``.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    statements, deferred = [], []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append(ast.unparse(node))
+        for call in ast.walk(node):
+            if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == "module"
+                    and isinstance(call.func.value, ast.Name) and call.func.value.id == "lazy"
+                    and call.args and isinstance(call.args[0], ast.Constant)):
+                deferred.append(call.args[0].value)
+    return statements, deferred
+
+
+def parse_importtime(stderr):
+    """
+    ``-X importtime`` lines after the marker, as ``(module, depth, self_us, cumulative_us)``
+    """
+    rows = []
+    started = False
+    for line in stderr.splitlines():
+        if line == _MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:") or "imported package" in line:
+            continue
+        # "import time:   <self> | <cumulative> | <two spaces per level><module>"
+        self_part, cumulative_us, name = line.split("|", 2)
+        self_us = self_part.split(":", 1)[1]
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _run(statements):
+    """Execute ``statements`` in a fresh interpreter; returns (importtime rows, missing modules)"""
+    code = _RUNNER.format(marker=_MARKER, statements=statements)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=REPO_ROOT))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _total_ms(rows):
+    return sum(cumulative for _, depth, _, cumulative in rows if depth == 0) / 1000
+
+
+def profile(script, repeats=3, top=10):
+    """Import profile of one script, as a JSON-able dict"""
+    statements, deferred = script_imports(os.path.join(REPO_ROOT, script))
+    with_deferred = statements + [f"import {name}" for name in deferred]
+
+    eager_runs, all_runs = [], []
+    for _ in range(repeats):
+        rows, missing = _run(statements)
+        eager_runs.append(rows)
+        if deferred:
+            rows, missing = _run(with_deferred)
+        all_runs.append(rows)
+
+    eager_ms = statistics.median(_total_ms(rows) for rows in eager_runs)
+    total_ms = statistics.median(_total_ms(rows) for rows in all_runs)
+    # The slowest imports of the median eager run, wherever they are nested
+    rows = sorted(eager_runs, key=_total_ms)[len(eager_runs) // 2]
+    slowest = sorted(rows, key=lambda row: row[3], reverse=True)[:top]
+    return {
+        "script": script,
+        "eager_ms": round(eager_ms, 1),
+        "deferred_ms": round(max(total_ms - eager_ms, 0.0), 1),
+        "deferred": deferred,
+        "missing": missing,
+        "slowest": [{"module": name, "cumulative_ms": round(cumulative / 1000, 1), "self_ms": round(own / 1000, 1)}
+                    for name, _, own, cumulative in slowest],
+    }
+
+
+def _report(result):
+    print(f"{result['script']}: {result['eager_ms']:.1f} ms of imports at startup"
+          + (f", {result['deferred_ms']:.1f} ms deferred ({', '.join(result['deferred'])})"
+             if result["deferred"] else ""))
+    if result["missing"]:
+        print(f"  not installed: {', '.join(result['missing'])}")
+    for row in result["slowest"]:
+        print(f"  {row['module']:<50} {row['cumulative_ms']:10.1f} ms {row['self_ms']:10.1f} ms self")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS, help="scripts to profile (default: all of them)")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per script (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed (default: %(default)s)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results file (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for script in args.scripts:
+        try:
+            result = profile(script, args.repeats, args.top)
+        except (OSError, SyntaxError, RuntimeError) as e:
+            print(f"{script}: error  {type(e).__name__}: {e}")
+            continue
+        _report(result)
+        results.append(result)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(results)} profiles to {args.output}")
+    return 0 if len(results) == len(args.scripts) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+"""
+Local replay server for the upstream APIs the data clients and frontend call.
+
+Serves the BLS, FRED, USA Spending, OSHA and DOL endpoints on the same
+paths as the real services, so clients can be pointed at it through the
+URL overrides in ``iuoe_data.config``:
+
+    with ReplayServer(awards=1000, latency=0.2) as server:
+        os.environ.update(server.env())
+        ...  # import and call iuoe_data
+
+Each request is answered from, in order:
+
+1. a recorded response in ``recordings`` whose request matches (API keys
+   are ignored when matching and never written to disk);
+2. when ``record`` is set, the real upstream, whose response is then saved
+   to ``recordings`` for next time;
+3. a deterministic fixture from ``benchmarks.fixtures``.
+
+On top of that, ``latency`` (plus up to ``jitter``) seconds are added to
+every response, a seeded ``error_rate`` fraction of requests fail with
+``error_status``, and ``inject`` scripts exact failures (status codes,
+Retry-After, dropped connections) for the next requests to an endpoint.
+``counts`` tells how many requests each endpoint received, to check what
+the caches saved.
+
+Run standalone with ``python -m benchmarks.replay_server --help``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks import fixtures
+
+BLS_PATH = "/publicAPI/v2/timeseries/data/"
+FRED_PATH = "/fred/series/observations"
+USA_SPENDING_PATH = "/api/v2/search/spending_by_award/"
+OSHA_PATH = "/api/v1/inspections"
+DOL_PATH = "/v1/timeseries"
+
+# Endpoint name -> (path, real host), used for routing and recording
+ENDPOINTS = {
+    "bls": (BLS_PATH, "https://api.bls.gov"),
+    "fred": (FRED_PATH, "https://api.stlouisfed.org"),
+    "usaspending": (USA_SPENDING_PATH, "https://api.usaspending.gov"),
+    "osha": (OSHA_PATH, "https://data.osha.gov"),
+    "dol": (DOL_PATH, "https://api.dol.gov"),
+}
+
+# Credentials in query strings and bodies; left out of match keys and recordings
+SECRET_FIELDS = {"api_key", "registrationkey"}
+
+# Request headers passed through to the upstream when recording
+FORWARDED_HEADERS = ("Authorization", "Content-Type", "Accept")
+
+# A scripted failure for one request. ``status`` is the response code (with
+# ``body`` as its JSON body, if given) or None to drop the connection without
+# answering; ``retry_after`` sets the Retry-After header in seconds.
+Fault = namedtuple("Fault", ["status", "retry_after", "body"], defaults=(503, None, None))
+
+Response = namedtuple("Response", ["status", "body", "headers"], defaults=({},))
+
+
+def _json(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+def _first(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _public(fields):
+    """``fields`` without credentials"""
+    return {name: value for name, value in fields.items() if name not in SECRET_FIELDS}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this each response
+    # waits out the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.replay.verbose:
+            super().log_message(format, *args)
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        headers = {name: self.headers[name] for name in FORWARDED_HEADERS if name in self.headers}
+
+        response = self.server.replay.respond(method, url.path, parse_qs(url.query), body, headers)
+        if response is None:
+            self.close_connection = True
+            return
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response.body)))
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server for the BLS, FRED, USA Spending, OSHA and DOL endpoints
+
+    ``awards`` and ``inspections`` are how many records ``spending_by_award``
+    and ``inspections`` page through in total. ``latency`` is seconds added to
+    every response, or a dict of seconds per endpoint name. ``seed`` makes
+    jitter and random errors repeatable.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, awards=100, inspections=500, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, recordings=None, record=False, seed=0, verbose=False):
+        self.awards = awards
+        self.inspections = inspections
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.recordings = recordings
+        self.record = record
+        self.verbose = verbose
+        self.counts = Counter()
+
+        self._random = random.Random(seed)
+        self._faults = {name: deque() for name in ENDPOINTS}
+        self._responses = {}
+        self._records = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment overrides that point every iuoe_data client at this server"""
+        return {
+            "BLS_API_URL": self.url + BLS_PATH,
+            "FRED_API_URL": self.url + FRED_PATH,
+            "USA_SPENDING_API_URL": self.url + USA_SPENDING_PATH,
+            "OSHA_API_URL": self.url + OSHA_PATH,
+            "DOL_API_URL": self.url + DOL_PATH,
+        }
+
+    def inject(self, endpoint, *faults):
+        """Fail the next ``len(faults)`` requests to ``endpoint``, one Fault each, in order"""
+        with self._lock:
+            self._faults[endpoint].extend(faults)
+
+    def reset(self):
+        """Forget request counts and any faults not yet served"""
+        with self._lock:
+            self.counts.clear()
+            for queue in self._faults.values():
+                queue.clear()
+
+    @staticmethod
+    def endpoint_for(path):
+        """Endpoint name serving ``path``, or None"""
+        path = path.rstrip("/")
+        for name, (endpoint_path, _) in ENDPOINTS.items():
+            if path == endpoint_path.rstrip("/"):
+                return name
+        return None
+
+    def _delay(self, endpoint):
+        latency = self.latency.get(endpoint, 0.0) if isinstance(self.latency, dict) else self.latency
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        return latency + jitter
+
+    def _next_fault(self, endpoint):
+        with self._lock:
+            if self._faults[endpoint]:
+                return self._faults[endpoint].popleft()
+            if self.error_rate and self._random.random() < self.error_rate:
+                return Fault(self.error_status)
+        return None
+
+    def respond(self, method, path, query, body, headers=None):
+        """The Response for one request, or None to drop the connection"""
+        endpoint = self.endpoint_for(path)
+        if endpoint is None:
+            return Response(404, _json({"error": f"no endpoint at {path}"}))
+        with self._lock:
+            self.counts[endpoint] += 1
+
+        delay = self._delay(endpoint)
+        if delay:
+            time.sleep(delay)
+
+        fault = self._next_fault(endpoint)
+        if fault is not None:
+            if fault.status is None:
+                return None
+            extra = {"Retry-After": str(fault.retry_after)} if fault.retry_after is not None else {}
+            return Response(fault.status, _json(fault.body or {"error": f"injected {fault.status}"}), extra)
+
+        try:
+            key = self._request_key(endpoint, method, query, body)
+        except ValueError as e:
+            return Response(400, _json({"error": f"bad request body: {e}"}))
+
+        cached = self._responses.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._recorded(endpoint, key)
+        if response is None and self.record:
+            response = self._fetch_upstream(endpoint, method, path, query, body, headers or {}, key)
+        if response is None:
+            try:
+                response = Response(200, _json(self._fixture(endpoint, query, body)))
+            except (KeyError, ValueError, AttributeError) as e:
+                return Response(400, _json({"error": f"bad request: {e}"}))
+
+        with self._lock:
+            self._responses[key] = response
+        return response
+
+    @staticmethod
+    def _request_key(endpoint, method, query, body):
+        """Canonical, credential-free identity of a request"""
+        request = {
+            "endpoint": endpoint,
+            "method": method,
+            "query": _public(query),
+            "body": _public(json.loads(body)) if body else None,
+        }
+        return json.dumps(request, sort_keys=True)
+
+    def _fixture(self, endpoint, query, body):
+        if endpoint == "bls":
+            request = json.loads(body)
+            return fixtures.bls_response(request["seriesid"], request["startyear"], request["endyear"])
+        if endpoint == "fred":
+            return fixtures.fred_response(query["series_id"][0], query["observation_start"][0],
+                                          query["observation_end"][0], offset=int(_first(query, "offset", 0)),
+                                          limit=int(_first(query, "limit", 100000)))
+        if endpoint == "usaspending":
+            request = json.loads(body)
+            return fixtures.spending_page(self._records_for("usaspending"), int(request.get("page", 1)),
+                                          int(request.get("limit", 10)))
+        if endpoint == "osha":
+            return fixtures.osha_page(self._records_for("osha"), int(_first(query, "offset", 0)),
+                                      int(_first(query, "limit", 100)))
+        return fixtures.dol_response(_first(query, "series_id").split(","), _first(query, "start_year"),
+                                     _first(query, "end_year"))
+
+    def _records_for(self, endpoint):
+        """The full record list a paginated endpoint slices pages from, built on first use"""
+        with self._lock:
+            if endpoint not in self._records:
+                self._records[endpoint] = (fixtures.award_records(self.awards) if endpoint == "usaspending"
+                                           else fixtures.osha_inspection_records(self.inspections))
+            return self._records[endpoint]
+
+    def _recording_path(self, endpoint, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.recordings, endpoint, f"{digest}.json")
+
+    def _recorded(self, endpoint, key):
+        if not self.recordings:
+            return None
+        try:
+            with open(self._recording_path(endpoint, key)) as f:
+                recording = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return Response(recording["status"], _json(recording["response"]))
+
+    def _fetch_upstream(self, endpoint, method, path, query, body, headers, key):
+        """Forward a request to the real API and save what comes back; None if it can't be reached"""
+        import requests
+
+        url = ENDPOINTS[endpoint][1] + path
+        try:
+            upstream = requests.request(method, url, params=query, data=body or None, headers=headers,
+                                        timeout=60)
+            payload = upstream.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"⚠️ Could not record {endpoint} from {url}: {e}")
+            return None
+
+        if self.recordings and upstream.status_code == 200:
+            target = self._recording_path(endpoint, key)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w") as f:
+                json.dump({"request": json.loads(key), "status": upstream.status_code, "response": payload}, f)
+        return Response(upstream.status_code, _json(payload))
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic responses for the upstream APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--awards", type=int, default=1000, help="USA Spending awards to page through")
+    parser.add_argument("--inspections", type=int, default=500, help="OSHA inspections to page through")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="status code of failed requests")
+    parser.add_argument("--recordings", help="directory of recorded responses to serve first")
+    parser.add_argument("--record", action="store_true",
+                        help="fetch unrecorded requests from the real APIs and save them to --recordings")
+    parser.add_argument("--seed", type=int, default=0, help="seed for jitter and random errors")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+    if args.record and not args.recordings:
+        parser.error("--record needs --recordings")
+
+    server = ReplayServer(args.host, args.port, awards=args.awards, inspections=args.inspections,
+                          latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          error_status=args.error_status, recordings=args.recordings, record=args.record,
+                          seed=args.seed, verbose=args.verbose)
+    print(f"Replaying on {server.url}. Point the Python clients at it with:")
+    for name, value in server.env().items():
+        print(f"  export {name}={value}")
+    for name, (path, _) in ENDPOINTS.items():
+        print(f"  {name:<12} {server.url}{path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
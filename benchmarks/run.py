@@ -0,0 +1,398 @@
+"""
+Time every stage of the dashboard pipelines against a local replay server.
+
+Run from the repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scales small,medium --repeats 3
+    python -m benchmarks.run --baseline benchmarks/results/main.json
+
+Two groups of measurements are taken:
+
+* Pipeline stages at each data scale: fetching through the real clients
+  (HTTP, retries, caches and warehouse included), JSON decoding, BLS
+  parsing, the analytics transforms, loading and querying the award
+  store, downsampling long histories for a chart, and building and
+  serializing a Plotly figure the way ``st.plotly_chart`` does.
+* The fetchers against an upstream that is slow, or that fails each
+  request once before answering (the retry path), and ten identical
+  fetches at once (which should share one upstream round).
+* End-to-end runs of every page of the five Streamlit dashboards (through
+  ``streamlit.testing``, so no browser or server is needed) and of
+  ``real_data_integration.test_all_real_data_sources``.
+
+Stages whose dependencies aren't installed (Plotly, Streamlit) are recorded
+as skipped rather than failing the run. Results are written as JSON; with
+``--baseline`` the run exits non-zero if any stage got slower than the
+baseline by more than ``--tolerance``.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks import fixtures
+from benchmarks.replay_server import Fault, ReplayServer
+
+# Nothing from iuoe_data is imported at module level: it reads its endpoints
+# and directories from the environment on import, and main() sets those first.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "results", "latest.json")
+
+# Data sizes each pipeline stage is timed at
+SCALES = {
+    "small": {"bls_series": 4, "years": 5, "fred_series": 3, "awards": 100},
+    "medium": {"bls_series": 50, "years": 10, "fred_series": 10, "awards": 1000},
+    "large": {"bls_series": 500, "years": 20, "fred_series": 50, "awards": 10000},
+}
+
+END_YEAR = 2024
+
+DASHBOARDS = [
+    "iuoe_local_825_dashboard.py",
+    "iuoe_local_825_simple_dashboard.py",
+    "iuoe_local_825_super_dashboard.py",
+    "iuoe_local_825_real_bls_dashboard.py",
+    "iuoe_local_825_real_only_dashboard.py",
+]
+
+# Simultaneous identical fetches in the concurrent-sessions stage
+CONCURRENT_SESSIONS = 10
+
+# Slowdowns smaller than this many seconds are noise, whatever the ratio
+REGRESSION_FLOOR = 0.005
+
+
+class Skipped(Exception):
+    """A stage that can't run in this environment"""
+
+
+def measure(stage, run, repeats, setup=None, **labels):
+    """
+    Time ``run()`` ``repeats`` times after one untimed warm-up call
+
+    ``setup()`` runs untimed before every call. Returns a result record;
+    ``rows`` is ``len()`` of what ``run`` returned, when it has one.
+    """
+    record = dict(labels, stage=stage)
+    try:
+        if setup:
+            setup()
+        result = run()
+        times = []
+        for _ in range(repeats):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            result = run()
+            times.append(time.perf_counter() - started)
+    except Skipped as e:
+        record.update(status="skipped", note=str(e))
+    except Exception as e:
+        record.update(status="error", note=f"{type(e).__name__}: {e}")
+    else:
+        record.update(status="ok", repeats=repeats, median_s=statistics.median(times),
+                      min_s=min(times), max_s=max(times))
+        try:
+            record["rows"] = len(result)
+        except TypeError:
+            pass
+    _report(record)
+    return record
+
+
+def _report(record):
+    label = " ".join(str(record[key]) for key in ("stage", "scale", "dashboard", "page") if key in record)
+    if record["status"] == "ok":
+        print(f"  {label:<70} {record['median_s'] * 1000:10.1f} ms")
+    else:
+        print(f"  {label:<70} {record['status']:>10}  {record['note']}")
+
+
+def _plotly():
+    try:
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+    except ImportError:
+        raise Skipped("plotly is not installed")
+    return go, make_subplots
+
+
+def build_panels(long_df):
+    """The real BLS dashboard's four-panel chart, with every series spread over the panels"""
+    from iuoe_data import downsample
+
+    go, make_subplots = _plotly()
+    fig = make_subplots(rows=2, cols=2)
+    for i, (series_id, df) in enumerate(long_df.groupby("series_id", observed=True, sort=False)):
+        df = downsample.frame(df, points=downsample.PANEL_POINTS)
+        fig.add_trace(go.Scatter(x=df["date"], y=df["value"], mode="lines+markers", name=series_id),
+                      row=i // 2 % 2 + 1, col=i % 2 + 1)
+    fig.update_layout(height=600, showlegend=True, template="plotly_white")
+    return fig
+
+
+def pipeline_stages(server, scale, params, repeats):
+    """Time each pipeline stage at one scale"""
+    import pandas as pd
+    import requests
+
+    from iuoe_data import analytics, awards, bls, downsample, figures, fred, synthetic, usaspending
+
+    start_year = END_YEAR - params["years"] + 1
+    bls_ids = fixtures.bls_series_ids(params["bls_series"])
+    fred_ids = [f"NJCONS{i:03d}" for i in range(params["fred_series"])]
+    award_pages = params["awards"] // usaspending.MAX_PAGE_LIMIT
+
+    records = [
+        measure("bls.fetch", lambda: bls.fetch_series(bls_ids, start_year, END_YEAR, force_refresh=True),
+                repeats, scale=scale),
+        measure("fred.fetch", lambda: fred.fetch_observations(fred_ids, f"{start_year}-01-01",
+                                                              f"{END_YEAR}-12-31", force_refresh=True),
+                repeats, scale=scale),
+        measure("usaspending.fetch", lambda: pd.concat(
+                    [page.frame for page in usaspending.iter_nj_construction_award_pages(
+                        max_pages=award_pages)], ignore_index=True),
+                repeats, scale=scale),
+    ]
+
+    # One request's raw body, for the decode and parse stages on their own
+    batch_ids = bls_ids[:bls.BLS_MAX_SERIES_PER_REQUEST]
+    raw = requests.post(server.env()["BLS_API_URL"], json={
+        "seriesid": batch_ids, "startyear": str(start_year), "endyear": str(END_YEAR)}).content
+    payload = json.loads(raw)
+    records.append(measure("bls.decode", lambda: json.loads(raw), repeats, scale=scale))
+    records.append(measure("bls.parse", lambda: bls.split_series(
+        bls.parse_response(payload["Results"]["series"])), repeats, scale=scale))
+
+    long_df = bls.parse_response(fixtures.bls_response(bls_ids, start_year, END_YEAR)["Results"]["series"])
+
+    def transform():
+        wide = analytics.to_wide(long_df)
+        return [analytics.mom(wide), analytics.yoy(wide), analytics.rolling_mean(wide, 3),
+                analytics.zscore(wide), analytics.cagr(wide)]
+
+    records.append(measure("analytics.transform", transform, repeats, scale=scale))
+
+    # The spending page's queries: an agency and date filter pushed down to
+    # the award store, grouped by recipient
+    store = awards.AwardStore(":memory:")
+    award_df = synthetic.awards(contracts=params["awards"])
+    records.append(measure("awards.upsert", lambda: range(store.upsert(award_df)), repeats, scale=scale))
+    agency = award_df["awarding_agency_name"].iat[0]
+    records.append(measure("awards.summarize", lambda: store.summarize(
+        "recipient_name", limit=25, agency=agency, start_date=f"{END_YEAR}-01-01"), repeats, scale=scale))
+    # Unfiltered, the page's cards and pie are read from the rollups
+    records.append(measure("awards.rollup", lambda: [store.totals(), store.summarize("naics_description")],
+                           repeats, scale=scale))
+
+    # Daily history back to 1990, one trace per FRED series, cut to what a
+    # chart panel can draw; rows are the points left to send
+    history = synthetic.bls_series(pd.date_range("1990-01-01", f"{END_YEAR}-12-31"),
+                                   {series_id: (100.0, 0.01, 1.0) for series_id in fred_ids}, name="history")
+    records.append(measure("render.downsample", lambda: pd.concat(
+        [downsample.frame(df, points=downsample.PANEL_POINTS) for df in history.values()]), repeats, scale=scale))
+
+    records.append(measure("render.cache_key", lambda: figures.content_key(long_df), repeats, scale=scale))
+    records.append(measure("render.build", lambda: build_panels(long_df), repeats, scale=scale))
+
+    fig = None
+
+    def serialize():
+        nonlocal fig
+        if fig is None:
+            fig = build_panels(long_df)
+        # What st.plotly_chart does with a figure before sending it to the browser
+        return fig.to_json()
+
+    records.append(measure("render.serialize", serialize, repeats, scale=scale))
+    return records
+
+
+def resilience_stages(server, repeats):
+    """Time the clients against a slow upstream and one that fails before it answers"""
+    from iuoe_data import bls, fred
+
+    bls_ids = fixtures.bls_series_ids(200)
+    fred_ids = [f"NJCONS{i:03d}" for i in range(8)]
+
+    # 4 BLS batches and 8 FRED series at 100 ms each: shows how much the
+    # concurrent requests overlap
+    server.latency = 0.1
+    records = [
+        measure("bls.fetch_slow_upstream", lambda: bls.fetch_series(bls_ids, 2020, END_YEAR, force_refresh=True),
+                repeats),
+        measure("fred.fetch_slow_upstream", lambda: fred.fetch_observations(
+            fred_ids, "2020-01-01", f"{END_YEAR}-12-31", force_refresh=True), repeats),
+    ]
+
+    # Ten sessions asking for the same series at once should cost one
+    # upstream round; ``rows`` is the BLS queries that actually went out
+    def concurrent_fetch():
+        server.reset()
+        with ThreadPoolExecutor(max_workers=CONCURRENT_SESSIONS) as pool:
+            for future in [pool.submit(bls.fetch_series, bls_ids, 2020, END_YEAR, force_refresh=True)
+                           for _ in range(CONCURRENT_SESSIONS)]:
+                future.result()
+        return range(server.counts["bls"])
+
+    records.append(measure("bls.fetch_concurrent_sessions", concurrent_fetch, repeats))
+    server.latency = 0.0
+
+    # Every series answers 503 once first: the cost of one round of retries
+    records.append(measure("fred.fetch_retry", lambda: fred.fetch_observations(
+        fred_ids, "2020-01-01", f"{END_YEAR}-12-31", force_refresh=True), repeats,
+        setup=lambda: server.inject("fred", *[Fault(503)] * len(fred_ids))))
+    server.reset()
+    return records
+
+
+def dashboard_pages(script, repeats):
+    """Time a full script run of every page of one Streamlit dashboard"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return [measure("script.page", _raise(Skipped("streamlit is not installed")), repeats,
+                        dashboard=script)]
+
+    app = AppTest.from_file(os.path.join(REPO_ROOT, script), default_timeout=120)
+    app.run()
+    pages = app.sidebar.selectbox[0].options
+
+    def show(page):
+        app.sidebar.selectbox[0].select(page).run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+        return app.main.children
+
+    return [measure("script.page", lambda: show(page), repeats, dashboard=script, page=page) for page in pages]
+
+
+def integration_test(repeats):
+    """Time real_data_integration.test_all_real_data_sources with a cold cache each run"""
+    import real_data_integration
+    from iuoe_data import usaspending
+    from iuoe_data.cache import get_cache
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            real_data_integration.test_all_real_data_sources()
+
+    return measure("script.integration", run, repeats,
+                   setup=get_cache("usaspending", usaspending.SPENDING_CACHE_TTL).clear,
+                   dashboard="real_data_integration.py", page="test_all_real_data_sources")
+
+
+def _raise(error):
+    def run():
+        raise error
+    return run
+
+
+def compare(records, baseline_path, tolerance):
+    """Print and return the records more than ``tolerance`` slower than the baseline"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(record):
+        return tuple(record.get(name) for name in ("stage", "scale", "dashboard", "page"))
+
+    before = {key(record): record for record in baseline["results"] if record["status"] == "ok"}
+    regressions = []
+    for record in records:
+        old = before.get(key(record))
+        if record["status"] != "ok" or old is None:
+            continue
+        slower = record["median_s"] - old["median_s"]
+        if slower > REGRESSION_FLOOR and record["median_s"] > old["median_s"] * (1 + tolerance):
+            regressions.append(record)
+            print(f"REGRESSION {' '.join(str(part) for part in key(record) if part)}: "
+                  f"{old['median_s'] * 1000:.1f} ms -> {record['median_s'] * 1000:.1f} ms")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default=",".join(SCALES),
+                        help="comma-separated scales to run (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per stage (default: %(default)s)")
+    parser.add_argument("--skip-scripts", action="store_true", help="only time the pipeline stages")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results file (default: %(default)s)")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = set(scales) - set(SCALES)
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="iuoe-bench-")
+    server = ReplayServer(awards=max(SCALES[scale]["awards"] for scale in scales)).start()
+    os.environ.update(server.env())
+    os.environ["IUOE_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["IUOE_WAREHOUSE_DIR"] = os.path.join(workdir, "warehouse")
+    # Large scales plan more BLS queries than a real key is allowed in a day
+    os.environ["IUOE_BLS_DAILY_QUERY_LIMIT"] = os.environ["IUOE_BLS_QUERY_BURST"] = str(10 ** 9)
+
+    records = []
+    try:
+        for scale in scales:
+            print(f"Pipeline stages ({scale}):")
+            records += pipeline_stages(server, scale, SCALES[scale], args.repeats)
+        print("Slow and failing upstream:")
+        records += resilience_stages(server, args.repeats)
+        if not args.skip_scripts:
+            print("Dashboards:")
+            for script in DASHBOARDS:
+                records += dashboard_pages(script, args.repeats)
+            records.append(integration_test(args.repeats))
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "scales": {scale: SCALES[scale] for scale in scales},
+        },
+        "results": records,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(records)} results to {args.output}")
+
+    failed = [record for record in records if record["status"] == "error"]
+    regressions = compare(records, args.baseline, args.tolerance) if args.baseline else []
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
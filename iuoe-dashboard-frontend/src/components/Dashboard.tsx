@@ -9,8 +9,8 @@ import {
   Building2,
   Shield
 } from 'lucide-react';
-import { BLSService, USASpendingService, OSHAService, DOLService, FREDService } from '../services/api';
-import { DashboardMetrics, LoadingState } from '../types';
+import { OverviewService } from '../services/api';
+import { DashboardMetrics, DataSourceName, DataSourceStatus, LoadingState } from '../types';
 import MetricCard from './MetricCard';
 import DataStatusCard from './DataStatusCard';
 import Chart from './Chart';
@@ -18,7 +18,7 @@ import Chart from './Chart';
 const Dashboard = () => {
   const [metrics, setMetrics] = useState<DashboardMetrics | null>(null);
   const [loading, setLoading] = useState<LoadingState>({ isLoading: true, error: null });
-  const [dataStatus, setDataStatus] = useState({
+  const [dataStatus, setDataStatus] = useState<Record<DataSourceName, DataSourceStatus>>({
     bls: { available: false, error: null },
     spending: { available: false, error: null },
     osha: { available: false, error: null },
@@ -33,95 +33,15 @@ const Dashboard = () => {
   const fetchAllData = async () => {
     setLoading({ isLoading: true, error: null });
 
-    try {
-      // Fetch all data sources in parallel
-      const [blsData, spendingData, oshaData, dolData, fredData] = await Promise.allSettled([
-        BLSService.fetchNJConstructionData(),
-        USASpendingService.fetchNJConstructionContracts(),
-        OSHAService.fetchNJInspections(),
-        DOLService.fetchNJLaborData(),
-        FREDService.fetchNJEconomicData()
-      ]);
-
-      // Update data status
-      setDataStatus({
-        bls: {
-          available: blsData.status === 'fulfilled' && blsData.value.success,
-          error: blsData.status === 'rejected' ? blsData.reason : blsData.value.error
-        },
-        spending: {
-          available: spendingData.status === 'fulfilled' && spendingData.value.success,
-          error: spendingData.status === 'rejected' ? spendingData.reason : spendingData.value.error
-        },
-        osha: {
-          available: oshaData.status === 'fulfilled' && oshaData.value.success,
-          error: oshaData.status === 'rejected' ? oshaData.reason : oshaData.value.error
-        },
-        dol: {
-          available: dolData.status === 'fulfilled' && dolData.value.success,
-          error: dolData.status === 'rejected' ? dolData.reason : dolData.value.error
-        },
-        fred: {
-          available: fredData.status === 'fulfilled' && fredData.value.success,
-          error: fredData.status === 'rejected' ? fredData.reason : fredData.value.error
-        }
-      });
-
-      // Calculate metrics from available data
-      const calculatedMetrics = calculateMetrics(blsData, spendingData, oshaData, dolData, fredData);
-      setMetrics(calculatedMetrics);
-
+    // One request for every data source; the API computes the metrics
+    const overview = await OverviewService.fetchOverview();
+    if (overview.success && overview.data) {
+      setDataStatus(overview.data.status);
+      setMetrics(overview.data.metrics);
       setLoading({ isLoading: false, error: null });
-    } catch (error) {
-      setLoading({ isLoading: false, error: 'Failed to fetch dashboard data' });
-    }
-  };
-
-  const calculateMetrics = (blsData: any, spendingData: any, oshaData: any, dolData: any, fredData: any) => {
-    let totalEmployment = 0;
-    let employmentGrowth = 0;
-    let totalSpending = 0;
-    let contractCount = 0;
-    let averageWage = 0;
-    let unemploymentRate = 0;
-    let inflationRate = 0;
-
-    // Calculate from BLS data
-    if (blsData.status === 'fulfilled' && blsData.value.success) {
-      const constructionSeries = blsData.value.data.find((s: any) => s.seriesID === 'CES2023230001');
-      if (constructionSeries && constructionSeries.data.length > 0) {
-        const latest = parseFloat(constructionSeries.data[0].value);
-        const previous = constructionSeries.data.length > 1 ? parseFloat(constructionSeries.data[1].value) : latest;
-        totalEmployment = latest;
-        employmentGrowth = ((latest - previous) / previous) * 100;
-      }
-    }
-
-    // Calculate from USA Spending data
-    if (spendingData.status === 'fulfilled' && spendingData.value.success) {
-      totalSpending = spendingData.value.data.reduce((sum: number, contract: any) => sum + contract.total_obligation, 0);
-      contractCount = spendingData.value.data.length;
+    } else {
+      setLoading({ isLoading: false, error: overview.error || 'Failed to fetch dashboard data' });
     }
-
-    // Calculate from FRED data
-    if (fredData.status === 'fulfilled' && fredData.value.success) {
-      const cpiData = fredData.value.data.find((s: any) => s.series_id === 'CPIAUCSL');
-      if (cpiData && cpiData.observations && cpiData.observations.length > 1) {
-        const latest = parseFloat(cpiData.observations[0].value);
-        const previous = parseFloat(cpiData.observations[1].value);
-        inflationRate = ((latest - previous) / previous) * 100;
-      }
-    }
-
-    return {
-      totalEmployment,
-      employmentGrowth,
-      totalSpending,
-      contractCount,
-      averageWage,
-      unemploymentRate,
-      inflationRate
-    };
   };
 
   if (loading.isLoading) {
@@ -51,6 +51,31 @@ export interface DashboardMetrics {
   contractCount: number;
   averageWage: number;
   unemploymentRate: number;
+  inflationRate: number;
+}
+
+export interface FREDSeries {
+  series_id: string;
+  observations: FREDObservation[];
+}
+
+export interface FREDObservation {
+  date: string;
+  value: string;
+}
+
+export interface DataSourceStatus {
+  available: boolean;
+  error: string | null;
+}
+
+export type DataSourceName = 'bls' | 'spending' | 'osha' | 'dol' | 'fred';
+
+// Response of the API's /api/overview
+export interface DashboardOverview {
+  status: Record<DataSourceName, DataSourceStatus>;
+  metrics: DashboardMetrics;
+  datasets: Partial<Record<DataSourceName, { data: unknown; refreshed_at: string | null; stale_error: string | null }>>;
 }
 
 export interface APIResponse<T> {
@@ -12,6 +12,10 @@ export default defineConfig({
   },
   server: {
     port: 3000,
-    host: true
+    host: true,
+    // Data comes from iuoe_local_825_api.py (uvicorn iuoe_local_825_api:app --port 8000)
+    proxy: {
+      '/api': process.env.IUOE_API_URL || 'http://localhost:8000'
+    }
   }
 }) 
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Shared data-access helpers for the IUOE Local 825 dashboards.
+
+One client per upstream source, all going through a single pooled HTTP
+session and the same memory + disk cache, so a fix or speedup here lands in
+every dashboard at once.
+
+Importing the package imports none of its modules. The names below are
+resolved on first use, so a script that only needs ``synthetic`` or
+``styles`` doesn't pay for the HTTP stack (requests, urllib3) at startup.
+"""
+
+import importlib
+
+# Name -> module it is defined in
+_EXPORTS = {
+    "BLS_CACHE_TTL": "iuoe_data.cache",
+    "TTLCache": "iuoe_data.cache",
+    "get_cache": "iuoe_data.cache",
+    "DataSourceError": "iuoe_data.errors",
+    "get_session": "iuoe_data.http",
+    "CircuitOpenError": "iuoe_data.resilience",
+    "get_breaker": "iuoe_data.resilience",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,106 @@
+"""
+Vectorized time-series transforms shared by the dashboards.
+
+Every function accepts a Series (one series) or a wide DataFrame (one
+column per series, rows in date order) and works on all columns at once,
+so a county-by-industry panel with thousands of series costs one array
+operation rather than a Python loop per value. Use ``to_wide`` to turn the
+long ``date, series_id, value`` frames the clients return into that shape.
+
+Missing values stay missing: nothing is forward-filled, and a change
+against a zero or missing base is NaN rather than inf.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def to_wide(df, index="date", columns="series_id", values="value"):
+    """Pivot a long frame into one column per series, indexed and sorted by date"""
+    wide = df.pivot_table(index=index, columns=columns, values=values, aggfunc="last", observed=True)
+    wide.columns.name = None
+    return wide.sort_index()
+
+
+def _percent_change(values, periods):
+    base = values.shift(periods)
+    change = (values - base) / base.where(base != 0) * 100
+    return change
+
+
+def mom(values, periods=1):
+    """Percent change from ``periods`` rows earlier (month over month for monthly data)"""
+    return _percent_change(values, periods)
+
+
+def yoy(values, periods_per_year=12):
+    """Percent change from the same period a year earlier"""
+    return _percent_change(values, periods_per_year)
+
+
+def rolling_mean(values, window, min_periods=None):
+    """Trailing mean over ``window`` rows; NaNs inside the window are skipped"""
+    return values.rolling(window, min_periods=min_periods or 1).mean()
+
+
+def zscore(values, window=None, min_periods=2):
+    """
+    Standard score of each value
+
+    Against the whole series by default, or against a trailing ``window``
+    of rows. Flat stretches (zero standard deviation) give NaN.
+    """
+    if window is None:
+        mean, std = values.mean(), values.std()
+    else:
+        rolling = values.rolling(window, min_periods=min_periods)
+        mean, std = rolling.mean(), rolling.std()
+    if np.ndim(std) == 0:
+        std = std if std != 0 else np.nan
+    else:
+        std = std.where(std != 0)
+    return (values - mean) / std
+
+
+def cagr(values, periods_per_year=12):
+    """
+    Compound annual growth rate, in percent, from each series' first to last valid value
+
+    Returns a float for a Series and a Series (one value per column) for a
+    DataFrame. NaN when a series has fewer than two valid values or a
+    non-positive starting value.
+    """
+    frame = values.to_frame() if isinstance(values, pd.Series) else values
+    array = frame.to_numpy(dtype=float)
+    growth = np.full(array.shape[1], np.nan)
+
+    valid = ~np.isnan(array)
+    has_values = valid.any(axis=0)
+    if has_values.any():
+        rows = np.arange(len(array))[:, None]
+        first_row = np.where(valid, rows, len(array)).min(axis=0)
+        last_row = np.where(valid, rows, -1).max(axis=0)
+        columns = np.flatnonzero(has_values)
+        first = array[first_row[columns], columns]
+        last = array[last_row[columns], columns]
+        years = (last_row[columns] - first_row[columns]) / periods_per_year
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = (np.power(last / first, 1 / years) - 1) * 100
+        growth[columns] = np.where((years > 0) & (first > 0), rate, np.nan)
+
+    result = pd.Series(growth, index=frame.columns)
+    return float(result.iloc[0]) if isinstance(values, pd.Series) else result
+
+
+def latest_change(values, periods=1):
+    """
+    ``(latest, percent_change)`` for the last valid value of a Series
+
+    The change is against the value ``periods`` valid observations before
+    it, or NaN if there isn't one.
+    """
+    valid = values.dropna()
+    if valid.empty:
+        return np.nan, np.nan
+    return valid.iloc[-1], mom(valid, periods).iloc[-1]
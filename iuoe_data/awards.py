@@ -0,0 +1,476 @@
+"""
+Indexed SQLite store of every USA Spending award the client has fetched.
+
+Pages used to re-aggregate whole award DataFrames with pandas on every
+rerun, and nothing could filter by recipient, agency, NAICS code or date
+without loading everything first. Awards are stored here keyed on
+award_id, upserted or replaced by a complete load at once, and pages push
+their filters and group-bys down to SQL instead:
+
+    store = awards.get_store()
+    store.totals(agency="Department of Transportation", start_date="2024-01-01")
+    store.summarize("recipient_name", limit=10, naics_code=["2373"])
+
+Indexes cover recipient_name, awarding_agency_name, naics_code and
+award_date, so filtered queries over hundreds of thousands of awards read
+only the matching rows. Dates are stored as ISO ``YYYY-MM-DD`` text, which
+sorts and range-compares like the dates themselves.
+
+Each thread gets its own connection, and the database runs in WAL mode so
+sessions can read while a refresh writes.
+
+Unfiltered totals and summaries don't scan awards at all. The store keeps
+materialized rollups (award count and obligation per month, agency,
+recipient, NAICS code and description, county, and overall), updated in
+the same transaction as each upsert from the difference between the new
+rows and the ones they replace. Ingesting a page costs in proportion to the
+page, and the cards and charts read a few hundred rollup rows however many
+awards there are. Filtered calls still go to the indexes.
+"""
+
+import hashlib
+import itertools
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from iuoe_data import tracing
+from iuoe_data.warehouse import WAREHOUSE_DIR
+
+AWARD_STORE_PATH = os.environ.get("IUOE_AWARD_STORE", os.path.join(WAREHOUSE_DIR, "awards.sqlite"))
+
+# Page cache per connection, in KiB
+AWARD_STORE_CACHE_KB = 64 * 1024
+
+COLUMNS = ["award_id", "recipient_name", "total_obligation", "award_date", "naics_code",
+           "naics_description", "awarding_agency_name", "recipient_county_name"]
+
+# Filter keyword -> column; each takes one value or a list of them
+FILTERS = {
+    "recipient": "recipient_name",
+    "agency": "awarding_agency_name",
+    "naics_code": "naics_code",
+    "county": "recipient_county_name",
+}
+
+# What summarize() can group by
+GROUPINGS = {
+    "recipient_name": "recipient_name",
+    "awarding_agency_name": "awarding_agency_name",
+    "naics_code": "naics_code",
+    "naics_description": "naics_description",
+    "recipient_county_name": "recipient_county_name",
+    "month": "substr(award_date, 1, 7)",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS awards (
+    award_id TEXT PRIMARY KEY,
+    recipient_name TEXT,
+    total_obligation REAL,
+    award_date TEXT,
+    naics_code TEXT,
+    naics_description TEXT,
+    awarding_agency_name TEXT,
+    recipient_county_name TEXT
+);
+CREATE INDEX IF NOT EXISTS awards_recipient_name ON awards (recipient_name, award_date, total_obligation);
+CREATE INDEX IF NOT EXISTS awards_awarding_agency_name ON awards (awarding_agency_name, award_date, total_obligation);
+CREATE INDEX IF NOT EXISTS awards_naics_code ON awards (naics_code, award_date, total_obligation);
+CREATE INDEX IF NOT EXISTS awards_award_date ON awards (award_date, total_obligation);
+CREATE INDEX IF NOT EXISTS awards_total_obligation ON awards (total_obligation);
+CREATE TABLE IF NOT EXISTS award_rollups (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    awards INTEGER NOT NULL,
+    obligations INTEGER NOT NULL,
+    total_obligation REAL NOT NULL,
+    PRIMARY KEY (dimension, value)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS award_store_info (
+    name TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+# Rollup dimension holding the single row of overall totals
+_TOTAL = "total"
+
+# Rollup rows add these deltas to what is stored; NULL values are kept as ""
+_APPLY_ROLLUPS = """
+INSERT INTO award_rollups (dimension, value, awards, obligations, total_obligation) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (dimension, value) DO UPDATE SET
+    awards = awards + excluded.awards,
+    obligations = obligations + excluded.obligations,
+    total_obligation = total_obligation + excluded.total_obligation
+"""
+
+_stores = {}
+_stores_lock = threading.Lock()
+_memory_ids = itertools.count()
+
+
+def _where(start_date=None, end_date=None, min_obligation=None, **filters):
+    """SQL WHERE clause (or "") and its parameters for the filter keywords"""
+    clauses, params = [], []
+    for name, value in filters.items():
+        if name not in FILTERS:
+            raise TypeError(f"unknown award filter {name!r}")
+        if value is None:
+            continue
+        values = [value] if isinstance(value, str) else list(value)
+        if not values:
+            continue
+        clauses.append(f"{FILTERS[name]} IN ({', '.join('?' * len(values))})")
+        params += [str(value) for value in values]
+    if start_date is not None:
+        clauses.append("award_date >= ?")
+        params.append(pd.Timestamp(start_date).strftime("%Y-%m-%d"))
+    if end_date is not None:
+        clauses.append("award_date <= ?")
+        params.append(pd.Timestamp(end_date).strftime("%Y-%m-%d"))
+    if min_obligation is not None:
+        clauses.append("total_obligation >= ?")
+        params.append(float(min_obligation))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class AwardStore:
+    """
+    One award database; ``path=":memory:"`` for a private in-memory one
+    """
+
+    def __init__(self, path=AWARD_STORE_PATH):
+        if path == ":memory:":
+            # Named shared-cache database, so every thread's connection sees
+            # the same data; the first connection keeps it alive
+            self._uri = f"file:iuoe-awards-{next(_memory_ids)}?mode=memory&cache=shared"
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._uri = f"file:{os.path.abspath(path)}"
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._keep_alive = self._connection()
+        with self._write_lock, self._keep_alive:
+            self._keep_alive.executescript(_SCHEMA)
+            # Stores written before rollups existed
+            if self._keep_alive.execute("SELECT COUNT(*) FROM awards").fetchone()[0] != self.totals()["awards"]:
+                self._rebuild_rollups(self._keep_alive)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._uri, uri=True, timeout=30, check_same_thread=False)
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            # Room for the indexes of a few hundred thousand awards; the
+            # default 2 MB makes bulk upserts thrash
+            connection.execute(f"PRAGMA cache_size=-{AWARD_STORE_CACHE_KB}")
+            self._local.connection = connection
+        return connection
+
+    def _frame(self, sql, params=()):
+        with tracing.span("awards.query", sql=sql.split(" FROM ")[0][:80]) as span:
+            df = pd.read_sql_query(sql, self._connection(), params=params)
+            span.set(rows=len(df))
+        if "award_date" in df.columns:
+            df["award_date"] = pd.to_datetime(df["award_date"], errors="coerce")
+        return df
+
+    @tracing.traced("awards.upsert")
+    def upsert(self, df):
+        """
+        Insert or replace the rows of an award DataFrame, keyed on award_id
+
+        Missing columns are stored as NULL and rows without an award_id are
+        skipped. Returns the number of rows written.
+        """
+        rows, records = _records(df)
+        if not records:
+            return 0
+        with self._write_lock, self._connection() as connection:
+            # Taken before reading the rows being replaced, so another
+            # process can't change them before the rollups are adjusted
+            connection.execute("BEGIN IMMEDIATE")
+            self._upsert(connection, rows, records)
+            _set_load_checksum(connection, None)
+        return len(records)
+
+    @tracing.traced("awards.retain")
+    def retain(self, award_ids):
+        """
+        Delete every award whose award_id isn't in ``award_ids``
+
+        Returns the number of awards deleted.
+        """
+        with self._write_lock, self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            removed = self._retain(connection, (str(award_id) for award_id in award_ids))
+            if removed:
+                _set_load_checksum(connection, None)
+            return removed
+
+    @tracing.traced("awards.replace")
+    def replace(self, df):
+        """
+        Make the store hold exactly the awards of ``df``, as upsert stores them
+
+        For loading a complete result set: upserting it and deleting every
+        other award happen in one transaction, so readers see the previous
+        awards or the new ones, never a mix. Records ``checksum(df)`` as the
+        store's load_checksum. Returns the number of rows written.
+        """
+        rows, records = _records(df)
+        with self._write_lock, self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if records:
+                self._upsert(connection, rows, records)
+            self._retain(connection, (record[0] for record in records))
+            _set_load_checksum(connection, _digest(records))
+        return len(records)
+
+    def load_checksum(self):
+        """
+        ``checksum()`` of the frame the store was last replaced with
+
+        None if it never was, or has been upserted to or trimmed since, so a
+        match means the store holds exactly the awards of a given frame.
+        """
+        row = self._connection().execute(
+            "SELECT value FROM award_store_info WHERE name = 'load_checksum'").fetchone()
+        return row[0] if row else None
+
+    def _upsert(self, connection, rows, records):
+        _stage_ids(connection, (record[0] for record in records))
+        replaced = pd.read_sql_query(
+            f"SELECT {', '.join(COLUMNS)} FROM awards JOIN staged_ids USING (award_id)", connection)
+        connection.executemany(
+            f"INSERT OR REPLACE INTO awards ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            records)
+        deltas = [_rollup_deltas(rows, 1)]
+        if not replaced.empty:
+            deltas.append(_rollup_deltas(replaced, -1))
+        self._apply_rollups(connection, pd.concat(deltas, ignore_index=True))
+
+    def _retain(self, connection, award_ids):
+        _stage_ids(connection, award_ids)
+        stale = " FROM awards WHERE award_id NOT IN (SELECT award_id FROM staged_ids)"
+        removed = pd.read_sql_query(f"SELECT {', '.join(COLUMNS)}{stale}", connection)
+        if not removed.empty:
+            connection.execute(f"DELETE{stale}")
+            self._apply_rollups(connection, _rollup_deltas(removed, -1))
+        return len(removed)
+
+    def _apply_rollups(self, connection, deltas):
+        deltas = deltas.groupby(["dimension", "value"], as_index=False, sort=False).sum()
+        # Awards replaced by identical ones change nothing
+        deltas = deltas[(deltas["awards"] != 0) | (deltas["obligations"] != 0) | (deltas["total_obligation"] != 0)]
+        if deltas.empty:
+            return
+        connection.executemany(_APPLY_ROLLUPS, (
+            (dimension, value, int(awards), int(obligations), float(total))
+            for dimension, value, awards, obligations, total in deltas.itertuples(index=False, name=None)))
+        connection.execute("DELETE FROM award_rollups WHERE awards <= 0")
+
+    def _rebuild_rollups(self, connection):
+        connection.execute("DELETE FROM award_rollups")
+        for dimension, expression in [(_TOTAL, "''"), *GROUPINGS.items()]:
+            connection.execute(
+                f"INSERT INTO award_rollups SELECT ?, COALESCE({expression}, ''), COUNT(*), COUNT(total_obligation), "
+                f"COALESCE(SUM(total_obligation), 0) FROM awards GROUP BY 2", (dimension,))
+
+    def rebuild_rollups(self):
+        """Recompute every rollup from the awards table"""
+        with self._write_lock, self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._rebuild_rollups(connection)
+
+    def count(self, **filters):
+        """Number of awards matching the filters"""
+        where, params = _where(**filters)
+        if not where:
+            return self.totals()["awards"]
+        return self._connection().execute(f"SELECT COUNT(*) FROM awards{where}", params).fetchone()[0]
+
+    def query(self, order_by="total_obligation", descending=True, limit=None, **filters):
+        """
+        Awards matching the filters as a DataFrame with COLUMNS
+
+        Filters: ``start_date``/``end_date`` (inclusive), ``min_obligation``,
+        and ``recipient``, ``agency``, ``naics_code`` or ``county`` (see
+        FILTERS), each one value or a list.
+        """
+        if order_by not in COLUMNS:
+            raise ValueError(f"cannot order awards by {order_by!r}")
+        where, params = _where(**filters)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM awards{where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self._frame(sql, params)
+
+    def totals(self, **filters):
+        """
+        ``{"awards", "total_obligation", "average_obligation"}`` over the matching awards
+
+        Without filters, read from the rollups.
+        """
+        where, params = _where(**filters)
+        if not where:
+            row = self._connection().execute(
+                "SELECT awards, total_obligation, COALESCE(total_obligation / NULLIF(obligations, 0), 0) "
+                "FROM award_rollups WHERE dimension = ?", (_TOTAL,)).fetchone()
+            awards, total, average = row or (0, 0.0, 0.0)
+            return {"awards": awards, "total_obligation": total, "average_obligation": average}
+        awards, total, average = self._connection().execute(
+            f"SELECT COUNT(*), COALESCE(SUM(total_obligation), 0), COALESCE(AVG(total_obligation), 0) "
+            f"FROM awards{where}", params).fetchone()
+        return {"awards": awards, "total_obligation": total, "average_obligation": average}
+
+    def summarize(self, by, limit=None, **filters):
+        """
+        Awards, total and average obligation per value of ``by`` (see GROUPINGS)
+
+        Sorted by total obligation, largest first, except ``"month"``, which
+        is sorted by month. Without filters, read from the rollups.
+        """
+        if by not in GROUPINGS:
+            raise ValueError(f"cannot group awards by {by!r}")
+        where, params = _where(**filters)
+        order = "1" if by == "month" else "total_obligation DESC"
+        if where:
+            sql = (f"SELECT {GROUPINGS[by]} AS {by}, COUNT(*) AS awards, SUM(total_obligation) AS total_obligation, "
+                   f"AVG(total_obligation) AS average_obligation FROM awards{where} GROUP BY 1 ORDER BY {order}")
+        else:
+            # Same shape as the query above, including SQL's NULL sum for
+            # groups without a single obligation
+            sql = (f"SELECT NULLIF(value, '') AS {by}, awards, "
+                   f"CASE WHEN obligations THEN total_obligation END AS total_obligation, "
+                   f"total_obligation / NULLIF(obligations, 0) AS average_obligation "
+                   f"FROM award_rollups WHERE dimension = ? ORDER BY {order}")
+            params = [by]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self._frame(sql, params)
+
+    def date_range(self, **filters):
+        """Earliest and latest award_date matching the filters, as Timestamps, or (None, None)"""
+        where, params = _where(**filters)
+        first, last = self._connection().execute(
+            f"SELECT MIN(award_date), MAX(award_date) FROM awards{where}", params).fetchone()
+        return (pd.Timestamp(first) if first else None), (pd.Timestamp(last) if last else None)
+
+    def distinct(self, column, **filters):
+        """Sorted distinct non-null values of a FILTERS column, for filter widgets"""
+        if column not in FILTERS.values():
+            raise ValueError(f"no distinct values for {column!r}")
+        where, params = _where(**filters)
+        if not where:
+            rows = self._connection().execute(
+                "SELECT value FROM award_rollups WHERE dimension = ? AND value != '' ORDER BY 1", (column,))
+            return [row[0] for row in rows]
+        where = f"{where} AND {column} IS NOT NULL" if where else f" WHERE {column} IS NOT NULL"
+        rows = self._connection().execute(f"SELECT DISTINCT {column} FROM awards{where} ORDER BY 1", params)
+        return [row[0] for row in rows]
+
+
+def _records(df):
+    """
+    ``(rows, records)`` to store for an award DataFrame
+
+    ``rows`` is the frame with COLUMNS as stored (ISO date text, one row per
+    award_id, the last winning as it would in SQL); ``records`` the same
+    rows as tuples with None for nulls, in award_id order.
+    """
+    if df is None or df.empty or "award_id" not in df.columns:
+        return None, []
+    rows = df.reindex(columns=COLUMNS)
+    rows = rows[rows["award_id"].notna()].drop_duplicates("award_id", keep="last")
+    rows = rows.assign(
+        award_date=pd.to_datetime(rows["award_date"], errors="coerce").dt.strftime("%Y-%m-%d"),
+        total_obligation=pd.to_numeric(rows["total_obligation"], errors="coerce"),
+    )
+    # Python values with None for nulls; TEXT columns turn codes into strings
+    rows = rows.astype(object).where(rows.notna(), None)
+    # In key order, so the primary key index is appended to rather than
+    # split all over
+    return rows, sorted(rows.itertuples(index=False, name=None))
+
+
+def checksum(df):
+    """Digest of the awards an AwardStore would hold for ``df``, independent of row order and dtypes"""
+    return _digest(_records(df)[1])
+
+
+def _digest(records):
+    return hashlib.sha1(repr(records).encode("utf-8")).hexdigest()
+
+
+def _set_load_checksum(connection, value):
+    if value is None:
+        connection.execute("DELETE FROM award_store_info WHERE name = 'load_checksum'")
+    else:
+        connection.execute("INSERT OR REPLACE INTO award_store_info VALUES ('load_checksum', ?)", (value,))
+
+
+def _stage_ids(connection, award_ids):
+    """Fill the connection's staged_ids temp table with ``award_ids``"""
+    connection.execute("CREATE TEMP TABLE IF NOT EXISTS staged_ids (award_id TEXT PRIMARY KEY)")
+    connection.execute("DELETE FROM staged_ids")
+    connection.executemany("INSERT OR IGNORE INTO staged_ids VALUES (?)", ((award_id,) for award_id in award_ids))
+
+
+def _rollup_deltas(rows, sign):
+    """
+    What each of ``rows`` (as stored: ISO date text) adds to each rollup, times ``sign``
+
+    One row per award and dimension, with columns dimension, value, awards,
+    obligations and total_obligation; _apply_rollups sums them per rollup row.
+    """
+    obligation = pd.to_numeric(rows["total_obligation"], errors="coerce")
+    dimensions = [_TOTAL, *GROUPINGS]
+    values = []
+    for dimension in dimensions:
+        if dimension == _TOTAL:
+            value = pd.Series("", index=rows.index)
+        elif dimension == "month":
+            value = rows["award_date"].astype(object).str[:7]
+        else:
+            value = rows[dimension].astype(object)
+        values.append(value.where(value.notna(), "").astype(str))
+    return pd.DataFrame({
+        "dimension": np.repeat(dimensions, len(rows)),
+        "value": np.concatenate([value.to_numpy(dtype=object) for value in values]),
+        "awards": sign,
+        "obligations": np.tile(obligation.notna().to_numpy(dtype=int) * sign, len(dimensions)),
+        "total_obligation": np.tile(obligation.fillna(0).to_numpy(dtype=float) * sign, len(dimensions)),
+    })
+
+
+def get_store(path=AWARD_STORE_PATH):
+    """Process-wide AwardStore for ``path``"""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = AwardStore(path)
+        return store
+
+
+def from_frame(df):
+    """
+    A private in-memory AwardStore holding ``df``
+
+    Rows without an award_id (mock data, say) are numbered so they are kept.
+    """
+    store = AwardStore(":memory:")
+    if df is not None and not df.empty:
+        if "award_id" not in df.columns or df["award_id"].isna().any():
+            df = df.assign(award_id=[f"ROW-{i}" for i in range(len(df))])
+        store.upsert(df)
+    return store
@@ -0,0 +1,355 @@
+"""
+Bureau of Labor Statistics (BLS) v2 timeseries client.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from iuoe_data import quota, singleflight, tracing, warehouse
+from iuoe_data.cache import BLS_CACHE_TTL, get_cache
+from iuoe_data.config import BLS_API_KEY, BLS_API_URL, BLS_DAILY_QUERY_LIMIT, BLS_QUERY_BURST
+from iuoe_data.errors import DataSourceError
+from iuoe_data.http import post_json
+
+# BLS revises the last month or two of state estimates with every release,
+# so an incremental sync always re-requests this many trailing months.
+BLS_REVISION_MONTHS = 3
+
+# Limits of a registered v2 key: series and years per query (queries per
+# day are BLS_DAILY_QUERY_LIMIT, enforced by the key's quota budget)
+BLS_MAX_SERIES_PER_REQUEST = 50
+BLS_MAX_YEARS_PER_REQUEST = 20
+
+# Most BLS queries in flight at once
+BLS_MAX_CONCURRENCY = 4
+
+
+def _period_month(code):
+    """Map a BLS period code to (month, is_annual); month is 0 if unknown"""
+    kind, number = code[:1], code[1:]
+    if not number.isdigit():
+        return 0, False
+    number = int(number)
+    if (kind, number) in (('M', 13), ('Q', 5), ('S', 3)) or kind == 'A':
+        return 1, True
+    if kind == 'M' and 1 <= number <= 12:
+        return number, False
+    if kind == 'Q' and 1 <= number <= 4:
+        return (number - 1) * 3 + 1, False
+    if kind == 'S' and 1 <= number <= 2:
+        return (number - 1) * 6 + 1, False
+    return 0, False
+
+
+@tracing.traced("bls.parse")
+def parse_response(series_list, include_annual=False):
+    """
+    Convert every entry of ``Results.series`` into one long DataFrame in a single pass
+
+    Observations from all series are flattened into columns once, then
+    handled as whole arrays: period codes are mapped to months through a
+    lookup over the handful of distinct codes, dates are built with
+    datetime64 arithmetic, values become float64 (BLS's ``"-"`` placeholders
+    become NaN), and series_id and period are categorical.
+
+    Monthly (M01-M12), quarterly (Q01-Q04) and semiannual (S01-S02) periods
+    are dated at the first month of the period. Annual averages (M13, Q05,
+    S03, A01) are dated January and only kept when ``include_annual`` is set.
+    Rows are sorted by series (in response order), then date.
+    """
+    series_ids = [series['seriesID'] for series in series_list]
+    titles = np.array([series.get('seriesTitle', series['seriesID']) for series in series_list], dtype=object)
+    lengths = np.array([len(series['data']) for series in series_list], dtype=np.int64)
+    items = [item for series in series_list for item in series['data']]
+
+    series_codes = np.repeat(np.arange(len(series_list)), lengths)
+    years = np.array([item['year'] for item in items], dtype=np.int64)
+    period_codes, periods = pd.factorize(np.array([item['period'] for item in items], dtype=object))
+    raw_values = [item['value'] for item in items]
+    try:
+        values = np.array(raw_values, dtype=np.float64)
+    except ValueError:
+        values = pd.to_numeric(pd.Series(raw_values, dtype=object), errors='coerce').to_numpy(np.float64)
+
+    lookup = np.array([_period_month(code) for code in periods], dtype=np.int64).reshape(-1, 2)
+    months = lookup[period_codes, 0] if len(items) else np.empty(0, dtype=np.int64)
+    annual = lookup[period_codes, 1].astype(bool) if len(items) else np.empty(0, dtype=bool)
+
+    keep = months > 0
+    if not include_annual:
+        keep &= ~annual
+
+    series_codes, years, months, values, period_codes = (
+        series_codes[keep], years[keep], months[keep], values[keep], period_codes[keep])
+    dates = ((years - 1970) * 12 + (months - 1)).astype('datetime64[M]').astype('datetime64[ns]')
+
+    # BLS lists newest first; everything downstream expects oldest first
+    order = np.lexsort((dates, series_codes))
+    series_codes = series_codes[order]
+
+    return pd.DataFrame({
+        'date': dates[order],
+        'value': values[order],
+        'series_id': pd.Categorical.from_codes(series_codes, categories=series_ids),
+        'series_title': titles[series_codes],
+        'period': pd.Categorical.from_codes(period_codes[order], categories=list(periods)),
+    })
+
+
+def split_series(df):
+    """Split a parse_response frame into ``{series_id: DataFrame}``, dropping empty series"""
+    codes = df['series_id'].cat.codes.to_numpy()
+    bounds = np.searchsorted(codes, np.arange(len(df['series_id'].cat.categories) + 1))
+    results = {}
+    for code, series_id in enumerate(df['series_id'].cat.categories):
+        start, end = bounds[code], bounds[code + 1]
+        if end > start:
+            results[series_id] = df.iloc[start:end].reset_index(drop=True)
+    return results
+
+
+def parse_series(series, include_annual=False):
+    """Convert one entry of ``Results.series`` into a DataFrame sorted by date"""
+    return parse_response([series], include_annual=include_annual)
+
+
+def _request_series(series_ids, start_year, end_year, api_key):
+    """POST one BLS request, append what comes back to the warehouse and return it"""
+    payload = {
+        "seriesid": list(series_ids),
+        "startyear": str(start_year),
+        "endyear": str(end_year),
+        "registrationkey": api_key
+    }
+    data = post_json("BLS", BLS_API_URL, payload)
+
+    if data.get('status') != 'REQUEST_SUCCEEDED':
+        message = data.get('message') or 'Unknown error'
+        raise DataSourceError("BLS", message if isinstance(message, str) else "; ".join(message))
+
+    results = split_series(parse_response(data.get('Results', {}).get('series', [])))
+    for series_id, df in results.items():
+        warehouse.append("bls", series_id, df, key=("date",))
+    return results
+
+
+def plan_batches(series_ids, start_year, end_year):
+    """
+    Split a request into the fewest queries the BLS API will accept
+
+    Returns a list of ``(series_ids, start_year, end_year)`` tuples, each with
+    at most BLS_MAX_SERIES_PER_REQUEST series and BLS_MAX_YEARS_PER_REQUEST
+    years. Duplicate series IDs are requested once.
+    """
+    series_ids = list(dict.fromkeys(series_ids))
+    start_year, end_year = int(start_year), int(end_year)
+    if not series_ids or start_year > end_year:
+        return []
+
+    # Even-sized chunks, so a plan for 51 series is 26 + 25 rather than 50 + 1
+    series_chunks = math.ceil(len(series_ids) / BLS_MAX_SERIES_PER_REQUEST)
+    chunk_size = math.ceil(len(series_ids) / series_chunks)
+    id_chunks = [tuple(series_ids[i:i + chunk_size]) for i in range(0, len(series_ids), chunk_size)]
+
+    year_spans = [(year, min(year + BLS_MAX_YEARS_PER_REQUEST - 1, end_year))
+                  for year in range(start_year, end_year + 1, BLS_MAX_YEARS_PER_REQUEST)]
+
+    return [(ids, first, last) for ids in id_chunks for first, last in year_spans]
+
+
+def get_budget(api_key=BLS_API_KEY):
+    """The process-wide quota budget of a BLS key"""
+    return quota.get_budget("BLS", api_key, BLS_DAILY_QUERY_LIMIT, BLS_QUERY_BURST)
+
+
+def _request_batches(batches, api_key, max_workers=BLS_MAX_CONCURRENCY):
+    """
+    Run planned batches concurrently and merge them into ``{series_id: DataFrame}``
+
+    Frames for the same series from different year spans are concatenated
+    in date order. The whole plan is charged to the key's quota budget before
+    anything is sent. Raises QuotaExceededError if the budget can't cover
+    it, or the first DataSourceError if any batch fails.
+    """
+    if not batches:
+        return {}
+    get_budget(api_key).acquire(len(batches))
+
+    pieces = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+        futures = [pool.submit(tracing.in_context(_request_series), ids, first, last, api_key) for ids, first, last in batches]
+        # Collect in plan order so the output doesn't depend on timing
+        for future in futures:
+            for series_id, df in future.result().items():
+                pieces.setdefault(series_id, []).append(df)
+
+    results = {}
+    for series_id, frames in pieces.items():
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        results[series_id] = df.sort_values('date', kind='stable').reset_index(drop=True)
+    return results
+
+
+def _mark_complete_from(series_ids, start):
+    """Remember that the series just fetched from ``start`` hold all BLS has from then on"""
+    for series_id in series_ids:
+        try:
+            warehouse.mark_complete_from("bls", series_id, start)
+        except OSError as e:
+            print(f"⚠️ Could not record BLS series {series_id}'s history: {e}")
+
+
+def _stale_results(cache, cache_key, series_ids, start, end):
+    """The last results cached or stored for a request, however old, or None"""
+    if quota.current_priority() == quota.BACKGROUND:
+        # The scheduler keeps serving its last snapshot and retries; handing
+        # it stale data would publish that as a fresh refresh
+        return None
+    stale = cache.get(cache_key, max_age=float("inf"))
+    if stale is None:
+        stale = warehouse.read_fresh_series("bls", series_ids, start, end, max_age=float("inf"))
+    if stale:
+        tracing.annotate(cache="stale (quota)")
+    return stale or None
+
+
+@tracing.traced("bls.fetch")
+@singleflight.coalesced("bls.fetch")
+def fetch_series(series_ids, start_year, end_year, api_key=BLS_API_KEY, force_refresh=False):
+    """
+    Fetch BLS series and return ``{series_id: DataFrame}``
+
+    Results are cached per (series IDs, year range) for BLS_CACHE_TTL seconds.
+    On a cold cache, series written to the warehouse within the TTL are read
+    from there instead of the API; fresh responses are appended to it.
+    Any number of series and years can be asked for: the request is split by
+    plan_batches() and the batches run concurrently. Series that come back
+    without monthly observations are left out. When the key's quota budget
+    can't cover the plan, the last cached or stored results are returned
+    however old. Raises DataSourceError if BLS rejects a request, or
+    QuotaExceededError if the budget is spent and nothing is cached.
+    ``force_refresh`` skips the cache and the warehouse and asks BLS unless
+    the budget is spent.
+    """
+    cache = get_cache("bls", BLS_CACHE_TTL)
+    cache_key = cache.key(sorted(series_ids), str(start_year), str(end_year))
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        stored = warehouse.read_fresh_series("bls", series_ids, f"{start_year}-01-01", f"{end_year}-12-31",
+                                             BLS_CACHE_TTL)
+        if stored:
+            tracing.annotate(cache="warehouse")
+            cache.set(cache_key, stored)
+            return stored
+
+    try:
+        results = _request_batches(plan_batches(series_ids, start_year, end_year), api_key)
+    except quota.QuotaExceededError:
+        stale = _stale_results(cache, cache_key, series_ids, f"{start_year}-01-01", f"{end_year}-12-31")
+        if stale is None:
+            raise
+        return stale
+    _mark_complete_from(series_ids, f"{start_year}-01-01")
+    if results:
+        cache.set(cache_key, results)
+    return results
+
+
+@tracing.traced("bls.sync")
+@singleflight.coalesced("bls.sync")
+def sync_series(series_ids, start_year, end_year, api_key=BLS_API_KEY, revision_months=BLS_REVISION_MONTHS,
+                force_refresh=False):
+    """
+    Incrementally update BLS series in the warehouse and return ``{series_id: DataFrame}``
+
+    For each series only the years from its latest stored period (less
+    ``revision_months``, to pick up BLS revisions) through ``end_year`` are
+    requested; series with no stored history reaching back to ``start_year``
+    get the full range, once: a series whose data begins later is
+    remembered as complete from ``start_year``. Series needing the same range share batches planned
+    by plan_batches(), and all batches run concurrently.
+    New and revised observations replace stored ones, and the returned frames
+    cover ``start_year``..``end_year`` from the merged history.
+
+    Without pyarrow there is no stored history, so this is fetch_series.
+    ``force_refresh`` skips the cache and syncs every series, even ones
+    written within the TTL, which is what a scheduled refresh after a
+    release wants.
+
+    When the key's quota budget can't cover the sync, the stored history is
+    returned as it is. Raises DataSourceError if BLS rejects a request, or
+    QuotaExceededError if the budget is spent and nothing is stored.
+    """
+    if not warehouse.available():
+        return fetch_series(series_ids, start_year, end_year, api_key=api_key, force_refresh=force_refresh)
+
+    cache = get_cache("bls", BLS_CACHE_TTL)
+    cache_key = cache.key("sync", sorted(series_ids), str(start_year), str(end_year))
+    window_start = pd.Timestamp(int(start_year), 1, 1)
+    window_end = pd.Timestamp(int(end_year), 12, 31)
+
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        stored = warehouse.read_fresh_series("bls", series_ids, window_start, window_end, BLS_CACHE_TTL)
+        if stored:
+            tracing.annotate(cache="warehouse")
+            cache.set(cache_key, stored)
+            return stored
+
+    # Group series by the first year they still need
+    requests_by_year = {}
+    for series_id in series_ids:
+        history = warehouse.read("bls", series_id, key=("date",))
+        if not warehouse.covers("bls", series_id, history, window_start):
+            from_year = int(start_year)
+        elif not force_refresh and time.time() - warehouse.last_updated("bls", series_id) < BLS_CACHE_TTL:
+            continue
+        else:
+            resume_from = history['date'].max() - pd.DateOffset(months=revision_months)
+            from_year = max(int(start_year), resume_from.year)
+        if from_year <= int(end_year):
+            requests_by_year.setdefault(from_year, []).append(series_id)
+
+    batches = [batch for from_year, ids in sorted(requests_by_year.items())
+               for batch in plan_batches(ids, from_year, end_year)]
+    try:
+        _request_batches(batches, api_key)
+    except quota.QuotaExceededError:
+        stale = _stale_results(cache, cache_key, series_ids, window_start, window_end)
+        if stale is None:
+            raise
+        return stale
+    _mark_complete_from(requests_by_year.get(int(start_year), []), window_start)
+
+    results = {}
+    for series_id in series_ids:
+        history = warehouse.read("bls", series_id, key=("date",))
+        if history is None:
+            continue
+        window = history[(history['date'] >= window_start) & (history['date'] <= window_end)]
+        if not window.empty:
+            results[series_id] = window.reset_index(drop=True)
+
+    if results:
+        cache.set(cache_key, results)
+    return results
+
+
+def load_stored_series(series_ids, start_year, end_year):
+    """
+    ``{series_id: DataFrame}`` for the window from the warehouse alone, however old
+
+    Returns None unless every series is stored back to ``start_year``.
+    """
+    return warehouse.read_fresh_series("bls", series_ids, f"{start_year}-01-01", f"{end_year}-12-31",
+                                       max_age=float("inf"))
@@ -0,0 +1,131 @@
+"""
+Two-level TTL cache (memory + disk) for parsed API results.
+
+Streamlit re-executes each dashboard script on every rerun, so anything
+defined in the script itself is thrown away between page switches. Caches
+live here instead, in an imported module, and are also written to disk so
+a restarted dashboard (or a second dashboard process) starts warm.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from iuoe_data import tracing
+
+CACHE_DIR = os.environ.get(
+    "IUOE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
+
+# BLS publishes the state employment (SAE) and LAUS series once a month, so
+# a result that is a day old is at most one release behind.
+BLS_CACHE_TTL = int(os.environ.get("IUOE_BLS_CACHE_TTL", 24 * 60 * 60))
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class TTLCache:
+    """
+    Memory + disk cache whose entries expire ``ttl`` seconds after being stored
+    """
+
+    def __init__(self, namespace, ttl, cache_dir=CACHE_DIR):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.directory = os.path.join(cache_dir, namespace)
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def key(self, *parts):
+        """Build a stable cache key from request parameters"""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key, default=None, max_age=None):
+        """
+        Return the cached value for ``key``, or ``default`` if missing or expired
+
+        ``max_age`` overrides the TTL for this read, e.g. ``float("inf")`` for
+        the last value stored however old.
+        """
+        now = time.time()
+        max_age = self.ttl if max_age is None else max_age
+
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None and now - entry[0] < max_age:
+            tracing.annotate(cache="hit")
+            return entry[1]
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            stored_at, value = entry
+        except OSError:
+            tracing.annotate(cache="miss")
+            return default
+        except Exception:
+            # Truncated, or pickled by a pandas (or other library) version
+            # that can no longer load it: drop it and fetch afresh
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            tracing.annotate(cache="miss")
+            return default
+
+        if now - stored_at >= max_age:
+            tracing.annotate(cache="miss")
+            return default
+
+        with self._lock:
+            self._memory[key] = entry
+        tracing.annotate(cache="hit (disk)")
+        return value
+
+    def set(self, key, value):
+        """Store ``value`` in memory and atomically on disk"""
+        entry = (time.time(), value)
+        with self._lock:
+            self._memory[key] = entry
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            # A read-only or full disk only costs us persistence, not correctness
+            print(f"⚠️ Could not persist {self.namespace} cache entry: {e}")
+
+    def clear(self):
+        """Drop every entry from memory and disk"""
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def get_cache(namespace, ttl):
+    """
+    Return the process-wide cache for ``namespace``, creating it on first use
+    """
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = TTLCache(namespace, ttl)
+            _caches[namespace] = cache
+        return cache
@@ -0,0 +1,45 @@
+"""
+Endpoints and API keys shared by every data source client.
+
+Each value can be overridden from the environment so the same code can
+point at a different key or a local stand-in server.
+"""
+
+import os
+
+BLS_API_URL = os.environ.get("BLS_API_URL", "https://api.bls.gov/publicAPI/v2/timeseries/data/")
+FRED_API_URL = os.environ.get("FRED_API_URL", "https://api.stlouisfed.org/fred/series/observations")
+USA_SPENDING_API_URL = os.environ.get(
+    "USA_SPENDING_API_URL", "https://api.usaspending.gov/api/v2/search/spending_by_award/"
+)
+OSHA_API_URL = os.environ.get("OSHA_API_URL", "https://data.osha.gov/api/v1/inspections")
+DOL_API_URL = os.environ.get("DOL_API_URL", "https://api.dol.gov/v1/timeseries")
+
+BLS_API_KEY = os.environ.get("BLS_API_KEY", "79129dd32b5a4e1296cff5eec19d598c")
+FRED_API_KEY = os.environ.get("FRED_API_KEY", "0108976b66b9b710f375d61296c78dcd")
+DOL_API_KEY = os.environ.get("DOL_API_KEY", "2KZ-OoBMvNjt8ZLKRBTh1tOqfCjnx5x3mruYKvIwnSY")
+# OSHA issues short-lived bearer tokens; there is no usable default
+OSHA_API_KEY = os.environ.get("OSHA_API_KEY", "")
+
+# Queries a BLS v2 registration key may make per day, and how many of them
+# may be spent in one burst before the rest are spread over the day
+BLS_DAILY_QUERY_LIMIT = int(os.environ.get("IUOE_BLS_DAILY_QUERY_LIMIT", 500))
+BLS_QUERY_BURST = int(os.environ.get("IUOE_BLS_QUERY_BURST", 50))
+
+# Seconds to wait on any single upstream request
+REQUEST_TIMEOUT = int(os.environ.get("IUOE_REQUEST_TIMEOUT", 30))
+
+# Retries for 429 and 5xx responses and connection errors, with exponential
+# backoff (0.5s, 1s, 2s, ...) or the server's Retry-After
+HTTP_MAX_RETRIES = int(os.environ.get("IUOE_HTTP_MAX_RETRIES", 3))
+
+# Longest a server's Retry-After may hold up one retry, in seconds; a page
+# render would rather fall back to stale data than wait out a long one
+HTTP_MAX_RETRY_AFTER = float(os.environ.get("IUOE_HTTP_MAX_RETRY_AFTER", 10))
+
+# Connections kept open to any one API host
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("IUOE_HTTP_MAX_CONNECTIONS_PER_HOST", 8))
+
+# JSON-lines file every finished tracing span is appended to; unset to only
+# keep spans in memory for the page that recorded them
+TRACE_LOG = os.environ.get("IUOE_TRACE_LOG")
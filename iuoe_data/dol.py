@@ -0,0 +1,70 @@
+"""
+Department of Labor (DOL) ``v1/timeseries`` client.
+"""
+
+import numpy as np
+import pandas as pd
+
+from iuoe_data import singleflight, tracing
+from iuoe_data.cache import get_cache
+from iuoe_data.config import DOL_API_KEY, DOL_API_URL
+from iuoe_data.http import get_json
+
+# DOL republishes the BLS monthly series, so it changes no faster than they do
+DOL_CACHE_TTL = 24 * 60 * 60
+
+
+@tracing.traced("dol.parse")
+def parse_series(series):
+    """
+    Convert one entry of the response's ``series`` into a DataFrame sorted by date
+
+    Columns are date, value, series_id and title. Only monthly periods
+    (M01-M12) are kept.
+    """
+    data = pd.DataFrame(series.get('data', []), columns=['year', 'period', 'value'])
+    period = data['period'].astype(str)
+    monthly = period.str.fullmatch(r"M(0[1-9]|1[0-2])")
+    data, period = data[monthly], period[monthly]
+
+    years = data['year'].astype(np.int64).to_numpy()
+    months = period.str[1:].astype(np.int64).to_numpy()
+    dates = ((years - 1970) * 12 + (months - 1)).astype('datetime64[M]').astype('datetime64[ns]')
+    df = pd.DataFrame({
+        'date': dates,
+        'value': pd.to_numeric(data['value'], errors='coerce').to_numpy(),
+        'series_id': series.get('series_id'),
+        'title': series.get('title', series.get('series_id')),
+    })
+    return df.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+@tracing.traced("dol.fetch")
+@singleflight.coalesced("dol.fetch")
+def fetch_timeseries(series_ids, start_year, end_year, api_key=DOL_API_KEY, force_refresh=False):
+    """
+    Fetch DOL time series and return ``{series_id: DataFrame}``
+
+    All series go in one request. Cached for DOL_CACHE_TTL seconds;
+    ``force_refresh`` skips the cache. Raises DataSourceError on HTTP or
+    network failure.
+    """
+    cache = get_cache("dol", DOL_CACHE_TTL)
+    cache_key = cache.key(sorted(series_ids), str(start_year), str(end_year))
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    params = {"series_id": ",".join(series_ids), "start_year": str(start_year), "end_year": str(end_year)}
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+    data = get_json("DOL", DOL_API_URL, params=params, headers=headers)
+
+    results = {}
+    for series in data.get('series', []):
+        df = parse_series(series)
+        if not df.empty:
+            results[series['series_id']] = df
+    if results:
+        cache.set(cache_key, results)
+    return results
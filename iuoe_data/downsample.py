@@ -0,0 +1,114 @@
+"""
+Downsampling of long time series to what a chart can actually draw.
+
+A line chart can't show more distinct points than it is pixels wide, but
+every point sent still costs JSON, transfer and browser rendering. With
+decades of monthly history or daily series, that adds up to tens of
+thousands of points per page. Before a trace is built, ``frame`` cuts its
+rows down to about one per horizontal pixel:
+
+    data = downsample.frame(df, points=downsample.PANEL_POINTS)
+    fig.add_trace(go.Scatter(x=data["date"], y=data["value"], ...))
+
+Two methods are available:
+
+* ``"lttb"`` (Largest-Triangle-Three-Buckets, the default) keeps, in each
+  bucket of rows, the point forming the largest triangle with the point
+  kept before it and the average of the next bucket, which preserves the
+  shape of the line, peaks and troughs included;
+* ``"minmax"`` keeps each bucket's lowest and highest point, so no extreme
+  is ever lost, at twice the points per bucket.
+
+The first and last rows are always kept. Series no longer than the budget
+are returned untouched.
+"""
+
+import numpy as np
+import pandas as pd
+
+from iuoe_data import tracing
+
+# Points kept per trace: about the plot width in pixels of a full-width
+# chart, and of one column or subplot panel
+CHART_POINTS = 800
+PANEL_POINTS = 400
+
+METHODS = ("lttb", "minmax")
+
+
+def _numeric(values):
+    """Values as floats; datetimes as nanoseconds since the first one"""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.astype("int64")
+        values = values - values.iloc[0]
+    return values.to_numpy(dtype=float)
+
+
+def lttb(x, y, points):
+    """Positions of the ``points`` rows LTTB keeps, in order"""
+    x, y = _numeric(x), _numeric(y)
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    # Rows 1..n-2 split into points-2 buckets; bucket i is edges[i]:edges[i+1]
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    # Prefix sums give each bucket's average in O(1)
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+
+    kept = np.empty(points, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket, or the last row after the final bucket
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x = (x_sums[next_end] - x_sums[next_start]) / (next_end - next_start)
+        next_y = (y_sums[next_end] - y_sums[next_start]) / (next_end - next_start)
+        # Twice the triangle's area; the constant factor doesn't change the winner
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+    return kept
+
+
+def minmax(y, points):
+    """Positions of each bucket's lowest and highest row, about ``points`` in all, in order"""
+    y = _numeric(y)
+    n = len(y)
+    if points >= n or points < 4:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, (points - 2) // 2 + 1).astype(int)
+    kept = [0]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        kept += sorted({start + int(np.argmin(bucket)), start + int(np.argmax(bucket))})
+    kept.append(n - 1)
+    return np.asarray(kept, dtype=np.intp)
+
+
+def frame(df, x="date", y="value", points=CHART_POINTS, method="lttb"):
+    """
+    The rows of ``df`` to plot for a trace at most ``points`` pixels wide
+
+    ``df`` must be in ``x`` order. Frames no longer than ``points`` come
+    back as they are; longer ones lose their rows with a missing ``x`` or
+    ``y`` (so a gap is drawn straight across) before being downsampled.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown downsampling method {method!r}")
+    if df is None or len(df) <= points:
+        return df
+    with tracing.span("chart.downsample", method=method, rows=len(df)) as span:
+        df = df[df[x].notna() & df[y].notna()]
+        if method == "lttb":
+            positions = lttb(df[x], df[y], points)
+        else:
+            positions = minmax(df[y], points)
+        df = df.iloc[positions]
+        span.set(points=len(df))
+    return df
@@ -0,0 +1,14 @@
+"""
+Exceptions raised by the data source clients.
+"""
+
+
+class DataSourceError(Exception):
+    """
+    An upstream API returned an error or a response we could not use
+    """
+
+    def __init__(self, source, message, status_code=None):
+        super().__init__(f"{source}: {message}")
+        self.source = source
+        self.status_code = status_code
@@ -0,0 +1,81 @@
+"""
+Cache of built Plotly figures, keyed by the content of their inputs.
+
+Every Streamlit rerun re-executes the page branch, and building a figure
+(plotly express in particular) validates every trace and layout property
+each time, even when the data hasn't changed. ``cached_figure`` hashes the
+input frames and parameters and hands back the figure built the last time
+those exact inputs were seen.
+
+Figures are shared between sessions, so callers must not modify a figure
+they get back; put every update in the build function instead.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from iuoe_data import tracing
+
+# Figures kept in memory, least recently used dropped first
+FIGURE_CACHE_SIZE = 128
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def _hash_part(digest, part):
+    if isinstance(part, pd.DataFrame):
+        digest.update(b"frame")
+        digest.update(json.dumps([[str(c), str(t)] for c, t in part.dtypes.items()]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+    elif isinstance(part, pd.Series):
+        digest.update(b"series")
+        digest.update(f"{part.name}:{part.dtype}".encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+
+
+def content_key(*parts):
+    """Stable hash of DataFrames, Series and JSON-able parameters"""
+    digest = hashlib.sha1()
+    for part in parts:
+        _hash_part(digest, part)
+    return digest.hexdigest()
+
+
+def cached_figure(build, *frames, **params):
+    """
+    Return ``build(*frames, **params)``, reusing the previous figure for identical inputs
+
+    The key is the build function's qualified name plus a content hash of
+    ``frames`` (DataFrames, Series or None) and ``params``.
+    """
+    with tracing.span("chart.build", chart=build.__qualname__) as span:
+        key = (build.__module__, build.__qualname__,
+               content_key(*frames, sorted(params.items())))
+        with _figures_lock:
+            figure = _figures.get(key)
+            if figure is not None:
+                _figures.move_to_end(key)
+                span.set(cache="hit")
+                return figure
+
+        span.set(cache="miss")
+        figure = build(*frames, **params)
+
+        with _figures_lock:
+            _figures[key] = figure
+            while len(_figures) > FIGURE_CACHE_SIZE:
+                _figures.popitem(last=False)
+        return figure
+
+
+def clear():
+    """Drop every cached figure"""
+    with _figures_lock:
+        _figures.clear()
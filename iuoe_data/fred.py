@@ -0,0 +1,104 @@
+"""
+Federal Reserve Economic Data (FRED) observations client.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from iuoe_data import singleflight, tracing, warehouse
+from iuoe_data.cache import get_cache
+from iuoe_data.config import FRED_API_KEY, FRED_API_URL
+from iuoe_data.errors import DataSourceError
+from iuoe_data.http import get_json
+
+# FRED revises and publishes daily
+FRED_CACHE_TTL = 6 * 60 * 60
+
+# Most requests in flight to api.stlouisfed.org at once. FRED allows 120
+# requests a minute per key, so a handful in parallel is well within limits.
+FRED_MAX_CONCURRENCY = 4
+
+
+def _fetch_one(series_id, observation_start, observation_end, api_key):
+    params = {
+        "series_id": series_id,
+        "api_key": api_key,
+        "file_type": "json",
+        "observation_start": observation_start,
+        "observation_end": observation_end
+    }
+    data = get_json("FRED", FRED_API_URL, params=params)
+
+    obs = pd.DataFrame(data.get('observations', []), columns=['date', 'value'])
+    obs = obs[obs['value'] != '.']
+    return pd.DataFrame({
+        'date': pd.to_datetime(obs['date']),
+        'series_id': series_id,
+        'value': obs['value'].astype(float)
+    })
+
+
+@tracing.traced("fred.fetch")
+@singleflight.coalesced("fred.fetch")
+def fetch_observations(series_ids, observation_start, observation_end, api_key=FRED_API_KEY,
+                       max_workers=FRED_MAX_CONCURRENCY, force_refresh=False):
+    """
+    Fetch FRED observations as one long DataFrame (date, series_id, value)
+
+    All series are requested concurrently, at most ``max_workers`` at a time,
+    so latency tracks the slowest series rather than the sum of all of them.
+    Missing observations (FRED's ``"."``) are dropped. A series that fails is
+    skipped; DataSourceError is raised only if every series fails. Series
+    written to the warehouse within the TTL are read from there instead,
+    unless ``force_refresh`` is set.
+    """
+    cache = get_cache("fred", FRED_CACHE_TTL)
+    cache_key = cache.key(sorted(series_ids), observation_start, observation_end)
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        df = load_stored_observations(series_ids, observation_start, observation_end, max_age=FRED_CACHE_TTL)
+        if df is not None:
+            tracing.annotate(cache="warehouse")
+            cache.set(cache_key, df)
+            return df
+
+    frames = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(series_ids)))) as pool:
+        futures = [pool.submit(tracing.in_context(_fetch_one), series_id, observation_start, observation_end, api_key)
+                   for series_id in series_ids]
+        # Collect in request order so the output doesn't depend on timing
+        for future in futures:
+            try:
+                frame = future.result()
+            except DataSourceError as e:
+                errors.append(e)
+                continue
+            frames.append(frame)
+            if not frame.empty:
+                warehouse.append("fred", frame['series_id'].iat[0], frame, key=("date",))
+
+    if errors and not frames:
+        raise errors[0]
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['date', 'series_id', 'value'])
+    if not df.empty:
+        cache.set(cache_key, df)
+    return df
+
+
+def load_stored_observations(series_ids, observation_start, observation_end, max_age=float("inf")):
+    """
+    Stored observations for the window as one long DataFrame, or None
+
+    Only returns data if every series was written within ``max_age``
+    seconds (by default, however old) and reaches back to the start.
+    """
+    stored = warehouse.read_fresh_series("fred", series_ids, observation_start, observation_end, max_age)
+    if not stored:
+        return None
+    return pd.concat([stored[series_id] for series_id in series_ids], ignore_index=True)
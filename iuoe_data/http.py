@@ -0,0 +1,147 @@
+"""
+The single HTTP session every data source client goes through.
+
+Connections are kept alive and pooled per host, responses are requested
+gzip/deflate-compressed, and 429 and 5xx responses are retried with
+exponential backoff (0.5s, 1s, 2s, ...), honouring Retry-After up to
+HTTP_MAX_RETRY_AFTER seconds. Identical requests made while
+one is already in flight wait for it and share its decoded response (see
+``singleflight``), whichever client or page made them.
+"""
+
+import threading
+from functools import partial
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from iuoe_data import singleflight, tracing
+from iuoe_data.config import HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_MAX_RETRIES, HTTP_MAX_RETRY_AFTER, REQUEST_TIMEOUT
+from iuoe_data.errors import DataSourceError
+from iuoe_data.resilience import get_breaker
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    """
+    urllib3's Retry with a capped Retry-After and no immediate first retry
+
+    urllib3 2.x retries the first time without waiting and sleeps out any
+    Retry-After, however long; the first retry here waits
+    ``backoff_factor`` and a Retry-After counts for at most
+    HTTP_MAX_RETRY_AFTER seconds.
+    """
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return max(backoff, self.backoff_factor) if self.history else backoff
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_MAX_RETRY_AFTER)
+
+
+def get_session():
+    """
+    Return the process-wide ``requests.Session``, creating it on first use
+
+    At most HTTP_MAX_CONNECTIONS_PER_HOST connections are open to any one
+    host; further requests wait for a free connection rather than opening
+    more.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+            retry = _Retry(
+                total=HTTP_MAX_RETRIES,
+                backoff_factor=0.5,
+                backoff_max=30,
+                status_forcelist=(429, 500, 502, 503, 504),
+                # BLS and USA Spending queries are POSTs but have no side effects
+                allowed_methods=None,
+                respect_retry_after_header=True,
+                # Hand the last response back so _check can report its status
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+                                  pool_block=True, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _check(source, response):
+    if response.status_code != 200:
+        raise DataSourceError(source, f"HTTP {response.status_code} - {response.text[:200]}",
+                              status_code=response.status_code)
+    try:
+        return response.json()
+    except ValueError:
+        raise DataSourceError(source, "response was not valid JSON", status_code=response.status_code)
+
+
+def _wire_bytes(response):
+    """Bytes of ``response``'s body as transferred, before any decompression"""
+    # urllib3 counts what it read off the socket; Content-Length is the
+    # fallback for responses it didn't read (or mocks without a raw stream)
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        length = response.headers.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+
+
+def _send(source, method, url, timeout, **kwargs):
+    """
+    Send one request through ``source``'s circuit breaker and decode the JSON
+
+    Retries happen inside the session, so the breaker sees one outcome per
+    call: network errors and 5xx responses that survive every retry count as
+    failures. Once the circuit opens, requests fail immediately with
+    CircuitOpenError.
+    """
+    # The query string is left out of the span: it can carry the API key
+    parts = urlsplit(url)
+    with tracing.span("http", source=source, method=method, url=f"{parts.netloc}{parts.path}") as span:
+        breaker = get_breaker(source)
+        breaker.before_request()
+        try:
+            response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            breaker.record_failure()
+            raise DataSourceError(source, str(e))
+
+        retries = getattr(response.raw, "retries", None)
+        span.set(status=response.status_code, bytes=_wire_bytes(response),
+                 body_bytes=len(response.content),
+                 retries=len(retries.history) if retries is not None else 0)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return _check(source, response)
+
+
+def _coalesced_send(source, method, url, timeout, body, headers):
+    # Headers are part of the key: a different API key is a different request
+    call_key = singleflight.key("http", source, method, url, body, headers)
+    body_arg = {"json": body} if method == "POST" else {"params": body}
+    return singleflight.do(call_key, partial(_send, source, method, url, timeout, headers=headers, **body_arg))
+
+
+def post_json(source, url, payload, headers=None, timeout=REQUEST_TIMEOUT):
+    """POST ``payload`` as JSON and return the decoded JSON response"""
+    return _coalesced_send(source, "POST", url, timeout, payload, headers)
+
+
+def get_json(source, url, params=None, headers=None, timeout=REQUEST_TIMEOUT):
+    """GET ``url`` and return the decoded JSON response"""
+    return _coalesced_send(source, "GET", url, timeout, params, headers)
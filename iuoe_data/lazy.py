@@ -0,0 +1,62 @@
+"""
+Modules imported on first use instead of at script start.
+
+A dashboard shows its page config, styles and sidebar before it draws a
+single chart, but ``import plotly.express`` at the top of the script makes
+the first paint wait on plotly, its validators and everything they pull
+in. ``module`` returns a stand-in that only executes the real import when
+one of its attributes is first read:
+
+    px = lazy.module("plotly.express")   # cheap
+    ...
+    fig = px.bar(df, ...)                 # plotly loads here, once
+
+Streamlit runs every session's script on its own thread, so two sessions
+can touch a stand-in at the same moment; the first access imports under a
+lock and the other waits for it instead of seeing a half-run module. Once
+loaded, the module lives in ``sys.modules`` like any other, so later
+Streamlit reruns and other sessions pay nothing.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+
+class _Deferred(types.ModuleType):
+    """Stand-in for a module that imports it on the first attribute it doesn't have"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attribute):
+        # Only reached for attributes not copied over yet
+        with self._lazy_lock:
+            if not self.__dict__.get("_lazy_loaded"):
+                real = importlib.import_module(self.__name__)
+                # Later lookups find everything directly, without the lock
+                self.__dict__.update(real.__dict__)
+                self._lazy_loaded = True
+        try:
+            return self.__dict__[attribute]
+        except KeyError:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {attribute!r}") from None
+
+
+def module(name):
+    """
+    ``name`` as a module that is executed when first used
+
+    A missing module still raises ModuleNotFoundError here, as a plain
+    import would; only running it is deferred. Parent packages of a dotted
+    name are imported right away.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _Deferred(name)
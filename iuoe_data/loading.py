@@ -0,0 +1,73 @@
+"""
+Concurrent per-page dataset loading.
+
+Each dashboard page declares the datasets it needs. ``start`` launches all
+of them on a shared thread pool before anything is drawn, so the page
+waits for the slowest source rather than the sum of all of them, and
+``PageData.as_completed`` lets each card or chart be filled in as soon as
+its own dataset arrives.
+
+Loaders run off the Streamlit script thread and must not call ``st.*``;
+they return data (or raise) and the page renders it.
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from iuoe_data import tracing
+
+# Datasets loading at once across every session in the process
+LOADER_MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=LOADER_MAX_WORKERS, thread_name_prefix="iuoe-load")
+        return _executor
+
+
+class PageData:
+    """
+    The in-flight datasets of one page render, by name
+    """
+
+    def __init__(self, futures):
+        self._futures = futures
+
+    def __contains__(self, name):
+        return name in self._futures
+
+    def get(self, name):
+        """Wait for ``name`` and return its value, re-raising the loader's exception"""
+        return self._futures[name].result()
+
+    def as_completed(self):
+        """Yield dataset names in the order they finish loading"""
+        pending = {future: name for name, future in self._futures.items()}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            # Ties resolve in declaration order
+            for future in sorted(done, key=list(self._futures.values()).index):
+                yield pending.pop(future)
+
+
+def start(loaders, names):
+    """
+    Launch ``loaders[name]()`` for every name in ``names`` and return a PageData
+
+    ``loaders`` maps dataset names to zero-argument callables. Each runs in
+    a ``load`` span on the caller's trace.
+    """
+    executor = _get_executor()
+    return PageData({name: executor.submit(tracing.in_context(_load), name, loaders[name])
+                     for name in dict.fromkeys(names)})
+
+
+def _load(name, loader):
+    with tracing.span("load", dataset=name):
+        return loader()
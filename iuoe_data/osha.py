@@ -0,0 +1,64 @@
+"""
+OSHA enforcement inspections client for NJ worksites.
+"""
+
+import pandas as pd
+
+from iuoe_data import singleflight, tracing
+from iuoe_data.cache import get_cache
+from iuoe_data.config import OSHA_API_KEY, OSHA_API_URL
+from iuoe_data.http import get_json
+
+# Inspections are loaded into the enforcement database daily
+OSHA_CACHE_TTL = 12 * 60 * 60
+
+# Inspections asked for per request
+OSHA_PAGE_SIZE = 100
+
+INSPECTION_FIELDS = ["activity_nr", "estab_name", "city", "state", "inspection_date",
+                     "inspection_type", "violation_type", "penalty_amount"]
+
+
+@tracing.traced("osha.parse")
+def parse_inspections(results):
+    """Turn a list of inspection records into a typed DataFrame"""
+    df = pd.DataFrame(results, columns=INSPECTION_FIELDS if not results else None)
+    if 'penalty_amount' in df.columns:
+        df['penalty_amount'] = pd.to_numeric(df['penalty_amount'], errors='coerce')
+    if 'inspection_date' in df.columns:
+        df['inspection_date'] = pd.to_datetime(df['inspection_date'], errors='coerce')
+    return df
+
+
+@tracing.traced("osha.fetch")
+@singleflight.coalesced("osha.fetch")
+def fetch_nj_inspections(limit=OSHA_PAGE_SIZE, api_key=OSHA_API_KEY, force_refresh=False):
+    """
+    Fetch the ``limit`` most recent NJ inspections
+
+    Pages through the API OSHA_PAGE_SIZE records at a time, following
+    ``next`` until ``limit`` is reached or the results run out. Cached for
+    OSHA_CACHE_TTL seconds; ``force_refresh`` skips the cache. Raises
+    DataSourceError on HTTP or network failure.
+    """
+    cache = get_cache("osha", OSHA_CACHE_TTL)
+    cache_key = cache.key("NJ", limit)
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+    results = []
+    offset = 0
+    while offset is not None and len(results) < limit:
+        params = {"state": "NJ", "limit": min(OSHA_PAGE_SIZE, limit - len(results)), "offset": offset}
+        data = get_json("OSHA", OSHA_API_URL, params=params, headers=headers)
+        page = data.get('results', [])
+        results.extend(page)
+        offset = data.get('next') if page else None
+
+    df = parse_inspections(results)
+    if not df.empty:
+        cache.set(cache_key, df)
+    return df
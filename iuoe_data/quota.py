@@ -0,0 +1,170 @@
+"""
+Per-key request budgets for APIs with a daily query cap.
+
+Every process and every Streamlit session spending one API key draws from
+one QuotaBudget, which enforces two limits:
+
+* a token bucket holding up to ``burst`` queries and refilling at
+  ``daily_limit`` per day, so a crowd of simultaneous reruns can spend a
+  burst but not the whole day's allowance. A plan larger than a burst is
+  let through on a full enough bucket and leaves it in debt, which later
+  requests wait out as it refills;
+* a daily counter kept on disk (under CACHE_DIR, locked across processes
+  where the platform allows), so restarts and a second dashboard process
+  don't start from zero.
+
+Requests have a priority. Background refreshes (run by the scheduler) may
+use the whole budget; interactive requests from page renders leave the
+last INTERACTIVE_RESERVE of both limits to them, so the data every visitor
+shares keeps being refreshed. A query over budget raises
+QuotaExceededError before anything is sent, and the clients answer from
+their caches instead, however old.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from iuoe_data.cache import CACHE_DIR
+from iuoe_data.errors import DataSourceError
+
+try:
+    import fcntl
+except ImportError:  # Windows: the counter is still shared by threads, just not processes
+    fcntl = None
+
+BACKGROUND = "background"
+INTERACTIVE = "interactive"
+
+# Share of the daily limit and of the burst that interactive requests leave
+# for background refreshes
+INTERACTIVE_RESERVE = 0.2
+
+_priority = contextvars.ContextVar("iuoe_quota_priority", default=INTERACTIVE)
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+class QuotaExceededError(DataSourceError):
+    """Raised instead of sending queries the budget can't cover"""
+
+
+@contextmanager
+def prioritized(priority):
+    """Run the enclosed block's requests at ``priority`` (BACKGROUND or INTERACTIVE)"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+class QuotaBudget:
+    """
+    Token bucket plus persistent daily counter for one API key
+    """
+
+    def __init__(self, source, key_id, daily_limit, burst, directory=os.path.join(CACHE_DIR, "quota")):
+        self.source = source
+        self.daily_limit = daily_limit
+        self.burst = burst
+        self.rate = daily_limit / (24 * 60 * 60)
+        self.path = os.path.join(directory, f"{source.lower()}-{key_id}.json")
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    @contextmanager
+    def _counter(self):
+        """Yield today's persisted count and a function to store a new one, locked across processes"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                today = time.strftime("%Y-%m-%d")
+                try:
+                    with open(self.path) as f:
+                        state = json.load(f)
+                except (OSError, ValueError):
+                    state = {}
+                used = state.get("used", 0) if state.get("day") == today else 0
+
+                def store(count):
+                    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+                    with os.fdopen(fd, "w") as f:
+                        json.dump({"day": today, "used": count}, f)
+                    os.replace(tmp_path, self.path)
+
+                yield used, store
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def acquire(self, count, priority=None):
+        """
+        Spend ``count`` queries, or raise QuotaExceededError without spending any
+
+        The bucket only has to cover as much of ``count`` as one burst at
+        this priority can; the rest is charged as debt, so a plan of more
+        queries than ``burst`` is possible but holds back what follows it.
+        ``priority`` defaults to the one set with ``prioritized``.
+        """
+        priority = priority or current_priority()
+        reserve = 0.0 if priority == BACKGROUND else INTERACTIVE_RESERVE
+        with self._lock:
+            self._refill()
+            upfront = min(count, self.burst * (1 - reserve))
+            if self._tokens - upfront < reserve * self.burst:
+                raise QuotaExceededError(
+                    self.source, f"{count} queries would exceed the {priority} rate limit "
+                                 f"({self._tokens:.0f} of {self.burst} available)")
+            try:
+                with self._counter() as (used, store):
+                    if used + count > self.daily_limit * (1 - reserve):
+                        raise QuotaExceededError(
+                            self.source, f"{count} queries would exceed the {priority} share of the daily "
+                                         f"limit of {self.daily_limit} ({used} used today)")
+                    store(used + count)
+            except OSError as e:
+                # Without a writable counter the bucket alone still bounds the rate
+                print(f"⚠️ Could not persist {self.source} query count: {e}")
+            self._tokens -= count
+
+    def used_today(self):
+        """Queries spent today by every process sharing this key"""
+        try:
+            with self._lock, self._counter() as (used, _):
+                return used
+        except OSError:
+            return 0
+
+
+def get_budget(source, api_key, daily_limit, burst):
+    """
+    Process-wide QuotaBudget for ``api_key`` at ``source``
+
+    Budgets are keyed by a hash of the key, which is also all that reaches
+    the disk.
+    """
+    key_id = hashlib.sha1((api_key or "").encode("utf-8")).hexdigest()[:12]
+    with _budgets_lock:
+        budget = _budgets.get((source, key_id))
+        if budget is None:
+            budget = _budgets[(source, key_id)] = QuotaBudget(source, key_id, daily_limit, burst)
+        return budget
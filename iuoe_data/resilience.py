@@ -0,0 +1,89 @@
+"""
+Per-source circuit breakers.
+
+After a few consecutive failures against one upstream, further requests to
+it fail immediately for a cool-down period instead of each waiting out
+REQUEST_TIMEOUT. Once the cool-down passes, a single trial request is let
+through; if it succeeds the source is closed again, otherwise the
+cool-down restarts.
+"""
+
+import threading
+import time
+
+from iuoe_data.errors import DataSourceError
+
+# Consecutive failures that open a source's circuit
+BREAKER_FAILURE_THRESHOLD = 3
+
+# Seconds an open circuit waits before letting a trial request through
+BREAKER_RESET_TIMEOUT = 5 * 60
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(DataSourceError):
+    """Raised instead of making a request while a source's circuit is open"""
+
+    def __init__(self, source, retry_in):
+        super().__init__(source, f"circuit open after repeated failures, retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one upstream source
+    """
+
+    def __init__(self, source, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """``"closed"``, ``"open"`` or ``"half-open"``"""
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.time() - self.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            waited = time.time() - self.opened_at
+            if waited >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(self.source, max(0.0, self.reset_timeout - waited))
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+            self._trial_in_flight = False
+
+
+def get_breaker(source):
+    """Process-wide CircuitBreaker for ``source``"""
+    with _breakers_lock:
+        breaker = _breakers.get(source)
+        if breaker is None:
+            breaker = _breakers[source] = CircuitBreaker(source)
+        return breaker
@@ -0,0 +1,297 @@
+"""
+Background refresh scheduler that keeps every source warm off the page path.
+
+Each job refreshes one dataset on its own cadence and swaps the result in
+as an immutable ``Snapshot``. A daemon thread keeps time and hands due
+jobs to a small pool of workers, so jobs that come due together (every
+job, on a cold start) refresh side by side and a slow source doesn't hold
+up the others. Dashboards read the
+latest snapshot instead of calling the clients directly, so a rerun only
+ever touches prepared data. The first refresh of a job runs as soon as it
+is registered; until it finishes, a job's ``seed`` (typically a read of
+the local warehouse) is served instead.
+
+Streamlit imports this module once per server process, so the scheduler
+and its threads are shared by every session and every rerun.
+"""
+
+import calendar
+import contextvars
+import threading
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from iuoe_data import quota, tracing
+from iuoe_data.config import REQUEST_TIMEOUT
+from iuoe_data.errors import DataSourceError
+from iuoe_data.resilience import BREAKER_RESET_TIMEOUT
+
+# Wait this long before retrying a job whose refresh raised. Matching the
+# breaker cool-down means the retry is the breaker's trial request.
+RETRY_DELAY = BREAKER_RESET_TIMEOUT
+
+# Jobs refreshed at the same time
+REFRESH_MAX_WORKERS = 8
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class Snapshot(namedtuple("Snapshot", ["value", "refreshed_at"])):
+    """
+    A dataset as of ``refreshed_at`` (Unix time)
+
+    ``refreshed_at`` is None for seeded data that hasn't been refreshed in
+    this process yet.
+    """
+    __slots__ = ()
+
+    @property
+    def age(self):
+        """Seconds since the last successful refresh, or None if never refreshed"""
+        return None if self.refreshed_at is None else time.time() - self.refreshed_at
+
+    def describe_age(self):
+        """Human-readable age, e.g. ``"3 hours ago"``"""
+        age = self.age
+        if age is None:
+            return "from local storage, not yet refreshed"
+        for unit, seconds in (("day", 86400), ("hour", 3600), ("minute", 60)):
+            if age >= seconds:
+                count = int(age // seconds)
+                return f"{count} {unit}{'s' if count != 1 else ''} ago"
+        return "just now"
+
+
+def daily(hour=6, minute=0):
+    """Schedule that runs once a day at ``hour``:``minute`` local time"""
+    def next_run(now):
+        run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return run if run > now else run + timedelta(days=1)
+    return next_run
+
+
+def _nth_weekday(year, month, weekday, n):
+    first = datetime(year, month, 1)
+    offset = (weekday - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def bls_release_schedule(now, hour=10, minute=30):
+    """
+    Next BLS release time after ``now``
+
+    Approximates the calendar with the two releases the dashboards use: the
+    national Employment Situation (first Friday of the month) and State
+    Employment and Unemployment, which carries the SM and LAUS state series
+    (third Friday). Both come out at 8:30 ET; the default run time leaves
+    room for the API to pick them up.
+    """
+    year, month = now.year, now.month
+    while True:
+        for n in (1, 3):
+            run = _nth_weekday(year, month, calendar.FRIDAY, n).replace(hour=hour, minute=minute)
+            if run > now:
+                return run
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class _Job:
+    def __init__(self, name, refresh, schedule, seed):
+        self.name = name
+        self.refresh = refresh
+        self.schedule = schedule
+        self.seed = seed
+        self.due = time.time()
+        self.runs = 0
+        self.last_error = None
+        self.last_trace = None
+        self.running = False
+        self.first_run_done = threading.Event()
+
+
+class RefreshScheduler:
+    """
+    Runs registered refresh jobs on a pool of REFRESH_MAX_WORKERS threads
+
+    ``refresh`` is called with ``force_refresh=False`` on the first run (so
+    warm caches are reused after a restart) and ``force_refresh=True`` on
+    every scheduled run after that, at quota.BACKGROUND priority so it may
+    spend the request budget page renders leave alone. A job that raises
+    keeps serving its previous snapshot and is retried after RETRY_DELAY,
+    or at its next scheduled run if that comes sooner. A job is never
+    refreshed twice at once.
+    """
+
+    def __init__(self, max_workers=REFRESH_MAX_WORKERS):
+        self._jobs = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="iuoe-refresh-job")
+
+    def add_job(self, name, refresh, schedule, seed=None):
+        """
+        Register a job and schedule its first refresh right away
+
+        ``schedule`` maps a datetime to the next datetime to run at (see
+        daily() and bls_release_schedule()). ``seed`` is an optional callable
+        returning data to serve before the first refresh finishes, or None.
+        Registering a name that already exists does nothing, so it is safe to
+        call on every rerun.
+        """
+        with self._lock:
+            if name in self._jobs:
+                return
+            job = self._jobs[name] = _Job(name, refresh, schedule, seed)
+
+        if seed is not None:
+            try:
+                value = seed()
+            except Exception:
+                traceback.print_exc()
+                value = None
+            if value is not None:
+                self._publish(name, value, refreshed_at=None)
+
+        self.start()
+        self._wake.set()
+        return job
+
+    def start(self):
+        """Start the scheduler thread if it isn't running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="iuoe-refresh", daemon=True)
+            self._thread.start()
+
+    def snapshot(self, name):
+        """Latest ``Snapshot`` for a job, or None if nothing is available yet"""
+        with self._lock:
+            return self._snapshots.get(name)
+
+    def wait_for(self, name, timeout=None):
+        """
+        Latest snapshot, waiting up to ``timeout`` seconds for the first refresh if needed
+
+        Only blocks the very first time a dataset is requested with nothing
+        stored locally. Returns None if the first refresh failed or timed out.
+        """
+        current = self.snapshot(name)
+        if current is not None:
+            return current
+        with self._lock:
+            job = self._jobs.get(name)
+        if job is not None:
+            job.first_run_done.wait(timeout)
+        return self.snapshot(name)
+
+    def last_error(self, name):
+        """Exception raised by a job's most recent refresh, or None"""
+        with self._lock:
+            job = self._jobs.get(name)
+        return job.last_error if job is not None else None
+
+    def last_trace(self, name):
+        """``tracing.Trace`` of a job's most recent refresh, or None"""
+        with self._lock:
+            job = self._jobs.get(name)
+        return job.last_trace if job is not None else None
+
+    def refresh_now(self, name):
+        """Move a job's next refresh up to now"""
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                return
+            job.due = time.time()
+        self._wake.set()
+
+    def _publish(self, name, value, refreshed_at):
+        snapshot = Snapshot(value, refreshed_at)
+        with self._lock:
+            # Readers hold on to whole Snapshot objects, so replacing the
+            # dict entry swaps the dataset atomically
+            self._snapshots[name] = snapshot
+
+    def _run_job(self, job):
+        job.last_trace = tracing.start_trace(f"refresh {job.name}")
+        try:
+            with tracing.span("refresh", job=job.name, run=job.runs), quota.prioritized(quota.BACKGROUND):
+                value = job.refresh(force_refresh=job.runs > 0)
+        except Exception as e:
+            job.last_error = e
+            retry = time.time() + RETRY_DELAY
+            job.due = min(retry, job.schedule(datetime.now()).timestamp())
+        else:
+            job.last_error = None
+            self._publish(job.name, value, refreshed_at=time.time())
+            job.due = job.schedule(datetime.now()).timestamp()
+        finally:
+            job.runs += 1
+            job.first_run_done.set()
+
+    def _work(self, job):
+        try:
+            # A fresh context per run, so no trace or priority carries over
+            # between the jobs a worker thread runs
+            contextvars.Context().run(self._run_job, job)
+        finally:
+            with self._lock:
+                job.running = False
+            # Its next due time is now known
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                due = [job for job in self._jobs.values() if job.due <= now and not job.running]
+                for job in due:
+                    job.running = True
+            for job in due:
+                self._workers.submit(self._work, job)
+
+            with self._lock:
+                next_due = min((job.due for job in self._jobs.values() if not job.running), default=None)
+            delay = None if next_due is None else max(0.0, next_due - time.time())
+            self._wake.wait(delay)
+
+
+def get_scheduler():
+    """Process-wide RefreshScheduler shared by every Streamlit session"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler()
+        return _scheduler
+
+
+def get_snapshot(name, refresh, schedule, seed=None, timeout=REQUEST_TIMEOUT):
+    """
+    Register ``name`` with the shared scheduler if needed and return its latest ``Snapshot``
+
+    Stale-while-revalidate: whatever was last fetched successfully is
+    returned straight away, however old, while refreshes (and retries after
+    failures) happen in the background; check last_error() to tell whether
+    the data is current. Waits up to ``timeout`` seconds only when there is
+    neither a seed nor a finished refresh yet. Raises the job's last error,
+    or DataSourceError on timeout, when there is still nothing to serve.
+    """
+    scheduler = get_scheduler()
+    with tracing.span("snapshot", job=name) as span:
+        scheduler.add_job(name, refresh, schedule, seed=seed)
+        snapshot = scheduler.wait_for(name, timeout)
+        if snapshot is None:
+            error = scheduler.last_error(name)
+            if error is not None:
+                raise error
+            raise DataSourceError(name, f"no data after waiting {timeout}s for the first refresh")
+        span.set(age_s=None if snapshot.age is None else round(snapshot.age))
+        return snapshot
@@ -0,0 +1,87 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+When several sessions render the same page at once they ask for the same
+data at the same moment, before any of them has filled the cache. Run
+through ``do`` (or a function decorated with ``coalesced``), only the first
+caller for a key does the work; callers arriving while it is in flight
+wait for it and get the same result, or the same exception. Nothing is
+kept once the call finishes; caching stays the cache's job.
+
+Results are shared, not copied, so callers must treat them as read-only,
+as they already must with cached values.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+
+from iuoe_data import quota, tracing
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+
+
+def key(*parts):
+    """Stable key for call arguments (lists, dicts, dates, ...)"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def do(call_key, func):
+    """
+    Return ``func()``, or the result of the identical call already in flight
+
+    The span of a caller that waited on another is marked ``coalesced``.
+    """
+    with _calls_lock:
+        call = _calls.get(call_key)
+        leader = call is None
+        if leader:
+            call = _calls[call_key] = _Call()
+
+    if not leader:
+        call.done.wait()
+        tracing.annotate(coalesced=True)
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = func()
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            del _calls[call_key]
+        call.done.set()
+
+
+def coalesced(name):
+    """
+    Decorator running concurrent calls with equal arguments once
+
+    Calls are keyed by ``name``, the arguments and the quota priority, so a
+    background refresh never gets the stale fallback an interactive call
+    was handed.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call_key = key(name, quota.current_priority(), args, kwargs)
+            return do(call_key, functools.partial(func, *args, **kwargs))
+        return wrapper
+    return decorate
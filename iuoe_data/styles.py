@@ -0,0 +1,32 @@
+"""
+The dashboards' CSS, kept in ``iuoe_data/assets`` rather than in each script.
+
+``stylesheet`` reads and minifies a stylesheet once per process and hands
+back the ready-made ``<style>`` block, so a rerun only re-sends a string
+instead of rebuilding a multi-kilobyte literal:
+
+    st.markdown(styles.stylesheet("super"), unsafe_allow_html=True)
+"""
+
+import functools
+import re
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE_AROUND_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def minify(css):
+    """``css`` without comments and with whitespace collapsed"""
+    css = _COMMENT.sub("", css)
+    css = _WHITESPACE.sub(" ", css)
+    return _SPACE_AROUND_PUNCTUATION.sub(r"\1", css).replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet(name):
+    """``assets/<name>.css``, minified, as a ``<style>`` block for ``st.markdown``"""
+    return f"<style>{minify((ASSETS_DIR / f'{name}.css').read_text(encoding='utf-8'))}</style>"
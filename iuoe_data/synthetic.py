@@ -0,0 +1,171 @@
+"""
+Seeded, vectorized synthetic data shaped like the real NJ sources.
+
+Used for the dashboards' offline fallbacks, demos and benchmarks. Every
+generator draws its random numbers as whole arrays, never per element, and
+takes a ``seed``: the same arguments always give the same data. Each
+dataset gets its own random stream derived from its name, so adding a
+column or dataset doesn't shift the numbers in another.
+
+Scale is configurable: ``employment_panel(counties=100, industries=100,
+years=10)`` produces 1.2 million rows in about a tenth of a second.
+"""
+
+import zlib
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 825
+
+NJ_COUNTIES = [
+    "Atlantic", "Bergen", "Burlington", "Camden", "Cape May", "Cumberland", "Essex",
+    "Gloucester", "Hudson", "Hunterdon", "Mercer", "Middlesex", "Monmouth", "Morris",
+    "Ocean", "Passaic", "Salem", "Somerset", "Sussex", "Union", "Warren",
+]
+
+# NAICS 23 (construction) industry groups
+CONSTRUCTION_INDUSTRIES = [
+    ("2361", "Residential Building Construction"),
+    ("2362", "Nonresidential Building Construction"),
+    ("2371", "Utility System Construction"),
+    ("2372", "Land Subdivision"),
+    ("2373", "Highway, Street, and Bridge Construction"),
+    ("2379", "Other Heavy and Civil Engineering Construction"),
+    ("2381", "Foundation, Structure, and Building Exterior Contractors"),
+    ("2382", "Building Equipment Contractors"),
+    ("2383", "Building Finishing Contractors"),
+    ("2389", "Other Specialty Trade Contractors"),
+]
+
+AWARDING_AGENCIES = [
+    "Department of Transportation", "Department of Defense", "Department of Veterans Affairs",
+    "General Services Administration", "Department of Homeland Security",
+    "Department of the Interior", "Environmental Protection Agency",
+]
+
+_RECIPIENT_KINDS = ["Construction", "Excavation", "Paving", "Contracting", "Builders",
+                    "Infrastructure", "Site Works", "Engineering"]
+
+
+def generator(name, seed=DEFAULT_SEED):
+    """``numpy.random.Generator`` for the dataset ``name``, independent of every other name"""
+    return np.random.default_rng([seed, zlib.crc32(name.encode("utf-8"))])
+
+
+def _labels(base, count, fallback):
+    """``base`` extended with ``fallback`` numbered names up to ``count`` entries"""
+    if count <= len(base):
+        return list(base[:count])
+    return list(base) + [f"{fallback} {i}" for i in range(len(base) + 1, count + 1)]
+
+
+def trend_frame(dates, name, seed=DEFAULT_SEED, **columns):
+    """
+    A ``date`` column plus one noisy linear trend per keyword
+
+    Each keyword is ``column=(start, slope, noise)``: the value at step
+    ``i`` is ``start + slope * i`` plus normal noise with std ``noise``.
+    Each column's noise comes from its own stream, so adding, removing or
+    reordering a keyword leaves the other columns unchanged.
+    """
+    dates = pd.DatetimeIndex(dates)
+    specs = np.asarray(list(columns.values()), dtype=float).reshape(-1, 3)
+    steps = np.arange(len(dates))[:, None]
+    noise = np.column_stack([generator(f"{name}.{column}", seed).standard_normal(len(dates))
+                             for column in columns]) if columns else np.empty((len(dates), 0))
+    values = specs[:, 0] + specs[:, 1] * steps + noise * specs[:, 2]
+
+    df = pd.DataFrame(values, columns=list(columns))
+    df.insert(0, "date", dates)
+    return df
+
+
+def bls_series(dates, series, name="bls", seed=DEFAULT_SEED):
+    """
+    ``{series_id: DataFrame(date, value, series_id)}``, the shape the BLS client returns
+
+    ``series`` maps each series ID to ``(start, slope, noise)`` as in trend_frame.
+    """
+    wide = trend_frame(dates, name, seed=seed, **series)
+    return {
+        series_id: pd.DataFrame({"date": wide["date"], "value": wide[series_id], "series_id": series_id})
+        for series_id in series
+    }
+
+
+def employment_panel(counties=len(NJ_COUNTIES), industries=len(CONSTRUCTION_INDUSTRIES), years=5,
+                     end_year=2024, seed=DEFAULT_SEED):
+    """
+    Monthly county-by-industry construction employment as one long frame
+
+    Columns are date, county, naics_code, industry, series_id and value; one
+    row per county, industry and month. Each series has its own level and
+    trend, shared seasonality (summer peak) and noise. ``series_id``,
+    ``county`` and the industry columns are categorical.
+    """
+    rng = generator("employment_panel", seed)
+    county_names = _labels(NJ_COUNTIES, counties, "County")
+    industry_list = (CONSTRUCTION_INDUSTRIES[:industries] if industries <= len(CONSTRUCTION_INDUSTRIES)
+                     else CONSTRUCTION_INDUSTRIES + [(f"23-{i:03d}", f"Construction Industry {i}")
+                                                     for i in range(len(CONSTRUCTION_INDUSTRIES) + 1, industries + 1)])
+    dates = pd.date_range(f"{end_year - years + 1}-01-01", f"{end_year}-12-01", freq="MS")
+
+    n_series = counties * industries
+    months = len(dates)
+    level = rng.lognormal(mean=7.0, sigma=0.8, size=n_series)
+    growth = rng.normal(0.002, 0.003, size=n_series)
+    season = 1 + 0.06 * np.sin((np.arange(months) % 12 - 3) / 12 * 2 * np.pi)
+    noise = rng.normal(0, 0.02, size=(n_series, months))
+    values = level[:, None] * (1 + growth[:, None]) ** np.arange(months) * season * (1 + noise)
+
+    series_codes = np.repeat(np.arange(n_series), months)
+    county_codes = series_codes // industries
+    industry_codes = series_codes % industries
+    series_ids = [f"SMU34{c:03d}{code}0001" for c in range(counties) for code, _ in industry_list]
+
+    return pd.DataFrame({
+        "date": np.tile(dates.values, n_series),
+        "county": pd.Categorical.from_codes(county_codes, county_names),
+        "naics_code": pd.Categorical.from_codes(industry_codes, [code for code, _ in industry_list]),
+        "industry": pd.Categorical.from_codes(industry_codes, [title for _, title in industry_list]),
+        "series_id": pd.Categorical.from_codes(series_codes, series_ids),
+        "value": np.round(values.ravel()),
+    })
+
+
+def awards(contracts=100, start_date="2023-01-01", end_date="2024-12-31", counties=len(NJ_COUNTIES),
+           seed=DEFAULT_SEED):
+    """
+    Construction contract awards shaped like the USA Spending client's output
+
+    Obligations are log-normal (a few very large contracts, many small
+    ones). Includes ``recipient_county_name`` so county rollups have
+    something to group on. Rows are sorted by obligation, largest first.
+    """
+    rng = generator("awards", seed)
+    county_names = _labels(NJ_COUNTIES, counties, "County")
+    recipients = [f"{county} {kind}" for county in county_names for kind in _RECIPIENT_KINDS]
+
+    recipient_codes = rng.integers(0, len(recipients), size=contracts)
+    industry_codes = rng.integers(0, len(CONSTRUCTION_INDUSTRIES), size=contracts)
+    agency_codes = rng.integers(0, len(AWARDING_AGENCIES), size=contracts)
+    obligations = np.round(rng.lognormal(mean=13.5, sigma=1.3, size=contracts), 2)
+
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    days = rng.integers(0, (end - start).days + 1, size=contracts)
+    award_dates = start + pd.to_timedelta(days, unit="D")
+
+    df = pd.DataFrame({
+        "award_id": np.char.add("SYN-", np.char.zfill(np.arange(contracts).astype(str), 8)),
+        "recipient_name": pd.Categorical.from_codes(recipient_codes, recipients),
+        "total_obligation": obligations,
+        "award_date": award_dates,
+        "naics_code": pd.Categorical.from_codes(industry_codes, [code for code, _ in CONSTRUCTION_INDUSTRIES]),
+        "naics_description": pd.Categorical.from_codes(industry_codes,
+                                                       [title for _, title in CONSTRUCTION_INDUSTRIES]),
+        "awarding_agency_name": pd.Categorical.from_codes(agency_codes, AWARDING_AGENCIES),
+        "recipient_county_name": pd.Categorical.from_codes(recipient_codes // len(_RECIPIENT_KINDS),
+                                                           county_names),
+    })
+    return df.sort_values("total_obligation", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from iuoe_data import awards
+
+
+def _awards(ids, seed):
+    rng = np.random.default_rng(seed)
+    n = len(ids)
+    obligation = rng.uniform(1e4, 1e7, n).round(2)
+    obligation[::7] = np.nan
+    county = rng.choice(["Bergen", "Essex", None], n)
+    return pd.DataFrame({
+        "award_id": [f"A-{i}" for i in ids],
+        "recipient_name": rng.choice(["Acme Paving", "Shore Builders", "Delta Site Works"], n),
+        "total_obligation": obligation,
+        "award_date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D"),
+        "naics_code": rng.choice(["2373", "2362", "2381"], n),
+        "naics_description": rng.choice(["Highway", "Nonresidential", "Foundation"], n),
+        "awarding_agency_name": rng.choice(["Department of Transportation", "Department of Defense"], n),
+        "recipient_county_name": county,
+    })
+
+
+def _assert_rollups_match_awards(store):
+    """Rollup-backed (unfiltered) answers equal the same queries run over the awards table"""
+    connection = store._connection()
+    awards_count, total, average = connection.execute(
+        "SELECT COUNT(*), COALESCE(SUM(total_obligation), 0), COALESCE(AVG(total_obligation), 0) FROM awards"
+    ).fetchone()
+    totals = store.totals()
+    assert totals["awards"] == awards_count
+    assert totals["total_obligation"] == pytest.approx(total)
+    assert totals["average_obligation"] == pytest.approx(average)
+
+    for by, expression in awards.GROUPINGS.items():
+        expected = pd.read_sql_query(
+            f"SELECT {expression} AS {by}, COUNT(*) AS awards, SUM(total_obligation) AS total_obligation "
+            f"FROM awards GROUP BY 1", connection)
+        actual = store.summarize(by)[[by, "awards", "total_obligation"]]
+        expected, actual = (frame.sort_values(by, na_position="first").reset_index(drop=True)
+                            for frame in (expected, actual))
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_rollups_follow_overlapping_upserts():
+    store = awards.AwardStore(":memory:")
+    assert store.upsert(_awards(range(0, 300), seed=1)) == 300
+    _assert_rollups_match_awards(store)
+    # Half new awards, half replacing stored ones with different values
+    store.upsert(_awards(range(150, 450), seed=2))
+    _assert_rollups_match_awards(store)
+    # Replacing awards by identical copies changes nothing
+    store.upsert(store.query(limit=50))
+    _assert_rollups_match_awards(store)
+    assert store.count() == 450
+
+
+def test_retain_drops_the_rest():
+    store = awards.AwardStore(":memory:")
+    store.upsert(_awards(range(100), seed=3))
+    assert store.retain([f"A-{i}" for i in range(40)] + ["A-missing"]) == 60
+    assert store.count() == 40
+    _assert_rollups_match_awards(store)
+    assert store.retain([f"A-{i}" for i in range(40)]) == 0
+
+
+def test_rebuild_matches_incremental():
+    store = awards.AwardStore(":memory:")
+    store.upsert(_awards(range(200), seed=4))
+    store.upsert(_awards(range(100, 250), seed=5))
+    incremental = store.summarize("recipient_name")
+    store.rebuild_rollups()
+    pd.testing.assert_frame_equal(store.summarize("recipient_name"), incremental)
+
+
+def test_upsert_replaces_by_award_id():
+    store = awards.AwardStore(":memory:")
+    store.upsert(_awards(range(100), seed=1))
+    newer = _awards(range(50, 150), seed=2)
+    store.upsert(newer)
+    assert store.count() == 150
+    stored = store.query(order_by="award_id", descending=False).set_index("award_id")
+    expected = newer.set_index("award_id")["recipient_name"]
+    assert (stored.loc[expected.index, "recipient_name"] == expected).all()
+
+
+def test_filters_go_to_the_awards_table():
+    store = awards.AwardStore(":memory:")
+    df = _awards(range(200), seed=6)
+    store.upsert(df)
+    dot = df[df["awarding_agency_name"] == "Department of Transportation"]
+    assert store.count(agency="Department of Transportation") == len(dot)
+    assert store.totals(agency="Department of Transportation")["total_obligation"] == pytest.approx(
+        dot["total_obligation"].sum())
+    assert store.count(start_date="2024-01-01") == (df["award_date"] >= "2024-01-01").sum()
+    with pytest.raises(TypeError):
+        store.count(state="NJ")
+
+
+def test_from_frame_numbers_rows_without_ids():
+    store = awards.from_frame(_awards(range(5), seed=7).drop(columns="award_id"))
+    assert store.count() == 5
+
+
+def test_replace_holds_exactly_the_new_awards():
+    store = awards.AwardStore(":memory:")
+    store.upsert(_awards(range(100), seed=8))
+    assert store.replace(_awards(range(50, 120), seed=9)) == 70
+    assert store.count() == 70
+    assert set(store.query()["award_id"]) == {f"A-{i}" for i in range(50, 120)}
+    _assert_rollups_match_awards(store)
+    assert store.replace(_awards([], seed=10)) == 0
+    assert store.count() == 0
+    assert store.totals()["total_obligation"] == 0
+
+
+def test_load_checksum_identifies_the_loaded_frame():
+    store = awards.AwardStore(":memory:")
+    df = _awards(range(100), seed=11)
+    assert store.load_checksum() is None
+    store.replace(df)
+    assert store.load_checksum() == awards.checksum(df)
+    # Row order and dtypes don't matter; contents do
+    shuffled = df.sample(frac=1, random_state=0).astype({"recipient_name": "category"})
+    assert awards.checksum(shuffled) == awards.checksum(df)
+    assert awards.checksum(df.head(99)) != awards.checksum(df)
+    changed = df.copy()
+    changed.loc[1, "total_obligation"] += 1
+    assert awards.checksum(changed) != awards.checksum(df)
+    # Same count, different awards
+    store.upsert(_awards([0], seed=12))
+    assert store.count() == 100
+    assert store.load_checksum() is None
@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks import fixtures
+from iuoe_data import bls, cache, quota, warehouse
+
+LATE_SERIES = "SM34000002300000099"
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """BLS responses from the replay fixtures, with the cache, warehouse and quota under tmp_path"""
+    monkeypatch.setattr(warehouse, "WAREHOUSE_DIR", str(tmp_path / "warehouse"))
+    monkeypatch.setattr(bls, "get_cache",
+                        lambda namespace, ttl: cache.TTLCache(namespace, ttl, cache_dir=str(tmp_path / "cache")))
+    budget = quota.QuotaBudget("BLS", "test", 500, 100, directory=str(tmp_path / "quota"))
+    monkeypatch.setattr(bls, "get_budget", lambda api_key=None: budget)
+    requests = []
+
+    def post_json(source, url, payload):
+        requests.append((tuple(payload["seriesid"]), int(payload["startyear"]), int(payload["endyear"])))
+        # LATE_SERIES has no data before 2022
+        response = fixtures.bls_response(payload["seriesid"], payload["startyear"], payload["endyear"])
+        for series in response["Results"]["series"]:
+            if series["seriesID"] == LATE_SERIES:
+                series["data"] = [item for item in series["data"] if int(item["year"]) >= 2022]
+        return response
+
+    monkeypatch.setattr(bls, "post_json", post_json)
+    return requests
+
+
+def test_late_starting_series_is_backfilled_once(api):
+    ids = ["SM34000002300000001", LATE_SERIES]
+    first = bls.sync_series(ids, 2020, 2024, force_refresh=True)
+    assert api == [(tuple(ids), 2020, 2024)]
+    assert first[LATE_SERIES]["date"].min().year == 2022
+
+    api.clear()
+    again = bls.sync_series(ids, 2020, 2024, force_refresh=True)
+    # Only the revision window, for both series
+    assert api == [(tuple(ids), 2024, 2024)]
+    assert again[LATE_SERIES]["date"].min().year == 2022
+
+    stored = bls.load_stored_series(ids, 2020, 2024)
+    assert stored is not None
+    assert stored[LATE_SERIES]["date"].max() == again[LATE_SERIES]["date"].max()
+
+
+def test_earlier_start_backfills_again(api):
+    bls.sync_series([LATE_SERIES], 2021, 2024, force_refresh=True)
+    api.clear()
+    bls.sync_series([LATE_SERIES], 2018, 2024, force_refresh=True)
+    assert api == [((LATE_SERIES,), 2018, 2024)]
+
+
+def test_fetch_and_sync_cover_the_same_window(api):
+    fetched = bls.fetch_series(["SM34000002300000001"], 2020, 2024, force_refresh=True)
+    synced = bls.sync_series(["SM34000002300000001"], 2020, 2024)
+    stored = bls.load_stored_series(["SM34000002300000001"], 2020, 2024)
+    assert fetched["SM34000002300000001"]["date"].max() == synced["SM34000002300000001"]["date"].max()
+    assert stored["SM34000002300000001"]["date"].max() == synced["SM34000002300000001"]["date"].max()
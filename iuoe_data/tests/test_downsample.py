@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from iuoe_data import downsample
+
+
+def _reference_lttb(x, y, points):
+    """LTTB one point at a time, over the same buckets as downsample.lttb"""
+    n = len(x)
+    edges = [int(edge) for edge in np.linspace(1, n - 1, points - 1)]
+    kept = [0]
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        next_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        a = kept[-1]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - next_x) * (y[j] - y[a]) - (x[a] - x[j]) * (next_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+    kept.append(n - 1)
+    return kept
+
+
+@pytest.mark.parametrize("n, points", [(1000, 100), (997, 37), (50, 3), (10, 9)])
+def test_lttb_matches_reference(n, points):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=float)
+    y = rng.standard_normal(n).cumsum()
+    assert downsample.lttb(x, y, points).tolist() == _reference_lttb(x.tolist(), y.tolist(), points)
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.zeros(1000)
+    y[500] = 100.0
+    kept = downsample.lttb(np.arange(1000), y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 500 in kept
+    assert (np.diff(kept) > 0).all()
+
+
+def test_minmax_keeps_every_extreme():
+    rng = np.random.default_rng(1)
+    y = rng.standard_normal(1000)
+    kept = downsample.minmax(y, 100)
+    assert len(kept) <= 100
+    assert kept[0] == 0 and kept[-1] == 999
+    assert y.argmin() in kept and y.argmax() in kept
+    assert (np.diff(kept) > 0).all()
+
+
+def test_frame_short_series_untouched():
+    df = pd.DataFrame({"date": pd.date_range("2020-01-01", periods=10, freq="D"), "value": range(10)})
+    assert downsample.frame(df, points=10) is df
+
+
+def test_frame_drops_missing_and_downsamples_by_date():
+    df = pd.DataFrame({"date": pd.date_range("2000-01-01", periods=5000, freq="D"),
+                       "value": np.sin(np.arange(5000) / 50)})
+    df.loc[10, "value"] = np.nan
+    for method in downsample.METHODS:
+        result = downsample.frame(df, points=200, method=method)
+        assert len(result) <= 200
+        assert result["value"].notna().all()
+        assert result["date"].is_monotonic_increasing
+        assert result["date"].iloc[0] == df["date"].iloc[0]
+        assert result["date"].iloc[-1] == df["date"].iloc[-1]
+
+
+def test_frame_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        downsample.frame(pd.DataFrame({"date": [], "value": []}), method="average")
@@ -0,0 +1,76 @@
+import pytest
+
+from iuoe_data import quota
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quota.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _budget(tmp_path, daily_limit=1000, burst=10):
+    return quota.QuotaBudget("TEST", "key", daily_limit, burst, directory=str(tmp_path))
+
+
+def test_bucket_limits_a_burst(tmp_path, clock):
+    budget = _budget(tmp_path)
+    budget.acquire(10, priority=quota.BACKGROUND)
+    with pytest.raises(quota.QuotaExceededError):
+        budget.acquire(1, priority=quota.BACKGROUND)
+    assert budget.used_today() == 10
+
+
+def test_bucket_refills_at_the_daily_rate(tmp_path, clock):
+    budget = _budget(tmp_path, daily_limit=24 * 60 * 60)  # one query a second
+    budget.acquire(10, priority=quota.BACKGROUND)
+    clock[0] += 3
+    budget.acquire(3, priority=quota.BACKGROUND)
+    with pytest.raises(quota.QuotaExceededError):
+        budget.acquire(1, priority=quota.BACKGROUND)
+
+
+def test_interactive_leaves_the_reserve(tmp_path, clock):
+    budget = _budget(tmp_path)
+    budget.acquire(8, priority=quota.INTERACTIVE)
+    with pytest.raises(quota.QuotaExceededError):
+        budget.acquire(1, priority=quota.INTERACTIVE)
+    budget.acquire(2, priority=quota.BACKGROUND)
+
+
+def test_priority_comes_from_context(tmp_path, clock):
+    budget = _budget(tmp_path)
+    with quota.prioritized(quota.BACKGROUND):
+        budget.acquire(10)
+    assert quota.current_priority() == quota.INTERACTIVE
+
+
+def test_plan_larger_than_a_burst_goes_into_debt(tmp_path, clock):
+    budget = _budget(tmp_path, daily_limit=24 * 60 * 60)
+    budget.acquire(25, priority=quota.BACKGROUND)
+    assert budget.used_today() == 25
+    # 15 queries of debt must be repaid before the next one
+    clock[0] += 15
+    with pytest.raises(quota.QuotaExceededError):
+        budget.acquire(1, priority=quota.BACKGROUND)
+    clock[0] += 1
+    budget.acquire(1, priority=quota.BACKGROUND)
+
+
+def test_daily_limit_is_shared_on_disk(tmp_path, clock):
+    first = _budget(tmp_path, daily_limit=15)
+    second = _budget(tmp_path, daily_limit=15)
+    first.acquire(10, priority=quota.BACKGROUND)
+    with pytest.raises(quota.QuotaExceededError):
+        second.acquire(6, priority=quota.BACKGROUND)
+    second.acquire(5, priority=quota.BACKGROUND)
+    assert first.used_today() == 15
+
+
+def test_refused_request_spends_nothing(tmp_path, clock):
+    budget = _budget(tmp_path, daily_limit=5)
+    with pytest.raises(quota.QuotaExceededError):
+        budget.acquire(6, priority=quota.BACKGROUND)
+    assert budget.used_today() == 0
+    budget.acquire(5, priority=quota.BACKGROUND)
@@ -0,0 +1,76 @@
+import pytest
+
+from iuoe_data import resilience
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "time", lambda: now[0])
+    return now
+
+
+def _tripped(threshold=3, reset_timeout=60):
+    breaker = resilience.CircuitBreaker("TEST", failure_threshold=threshold, reset_timeout=reset_timeout)
+    for _ in range(threshold):
+        breaker.before_request()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = resilience.CircuitBreaker("TEST", failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(resilience.CircuitOpenError) as raised:
+        breaker.before_request()
+    assert raised.value.retry_in == 60
+    assert raised.value.source == "TEST"
+
+
+def test_success_resets_the_count(clock):
+    breaker = resilience.CircuitBreaker("TEST", failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = _tripped()
+    clock[0] += 60
+    assert breaker.state == "half-open"
+    breaker.before_request()
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_request()
+
+
+def test_successful_trial_closes(clock):
+    breaker = _tripped()
+    clock[0] += 60
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_request()
+
+
+def test_failed_trial_reopens_for_a_full_timeout(clock):
+    breaker = _tripped()
+    clock[0] += 60
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock[0] += 59
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_request()
+    clock[0] += 1
+    breaker.before_request()
+
+
+def test_breakers_are_shared_per_source():
+    assert resilience.get_breaker("TEST-A") is resilience.get_breaker("TEST-A")
+    assert resilience.get_breaker("TEST-A") is not resilience.get_breaker("TEST-B")
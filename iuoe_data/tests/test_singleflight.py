@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from iuoe_data import quota, singleflight
+
+
+def test_concurrent_identical_calls_run_once():
+    calls = []
+    release = threading.Event()
+    results = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    def caller():
+        results.append(singleflight.do("test-once", work))
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every caller reach do() before the leader finishes
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+
+def test_waiters_get_the_leaders_exception():
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def work():
+        started.set()
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    def caller():
+        try:
+            singleflight.do("test-error", work)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(timeout=10)
+
+    assert len(errors) == 4
+    assert all(error is errors[0] for error in errors)
+
+
+def test_nothing_is_kept_after_the_call():
+    calls = []
+    singleflight.do("test-sequential", lambda: calls.append(1))
+    singleflight.do("test-sequential", lambda: calls.append(1))
+    assert len(calls) == 2
+    with pytest.raises(KeyError):
+        singleflight.do("test-sequential", lambda: {}["missing"])
+    assert singleflight.do("test-sequential", lambda: "fresh") == "fresh"
+
+
+def test_coalesced_keys_on_arguments_and_priority():
+    calls = []
+    release = threading.Event()
+
+    @singleflight.coalesced("test-decorated")
+    def fetch(series, start=None):
+        calls.append((series, start, quota.current_priority()))
+        release.wait(5)
+        return series
+
+    def background():
+        with quota.prioritized(quota.BACKGROUND):
+            fetch("A", start=2020)
+
+    threads = [threading.Thread(target=fetch, args=("A",), kwargs={"start": 2020}) for _ in range(3)]
+    threads += [threading.Thread(target=fetch, args=("B",), kwargs={"start": 2020}),
+                threading.Thread(target=background)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sorted(calls) == [("A", 2020, quota.BACKGROUND), ("A", 2020, quota.INTERACTIVE),
+                             ("B", 2020, quota.INTERACTIVE)]
+    assert singleflight.key("x", [1, 2]) == singleflight.key("x", [1, 2])
+    assert singleflight.key("x", [1, 2]) != singleflight.key("x", [2, 1])
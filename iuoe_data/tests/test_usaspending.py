@@ -0,0 +1,102 @@
+import pytest
+
+from iuoe_data import awards, cache, usaspending, warehouse
+from iuoe_data.errors import DataSourceError
+
+
+def _page(results, has_next):
+    """A spending_by_award response body, as the API sends it"""
+    return {"limit": 100, "results": results, "page_metadata": {"page": 1, "hasNext": has_next}, "messages": []}
+
+
+def _result(award_id, county, obligation=1_000_000.0):
+    return {
+        "internal_id": 1,
+        "generated_internal_id": f"CONT_AWD_{award_id}",
+        "award_id": award_id,
+        "recipient_name": "SHORE BUILDERS LLC",
+        "total_obligation": obligation,
+        "award_date": "2024-03-15",
+        "naics_code": "237310",
+        "naics_description": "HIGHWAY, STREET, AND BRIDGE CONSTRUCTION",
+        "awarding_agency_name": "Department of Transportation",
+        "Recipient Location": {"location_country_code": "USA", "country_name": "UNITED STATES",
+                               "state_code": "NJ", "state_name": "NEW JERSEY", "city_name": "TOMS RIVER",
+                               "county_code": "029", "county_name": county, "zip5": "08753"},
+    }
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Pages served to the client in place of the API, with the cache, warehouse and store under tmp_path"""
+    monkeypatch.setattr(warehouse, "WAREHOUSE_DIR", str(tmp_path / "warehouse"))
+    monkeypatch.setattr(awards, "AWARD_STORE_PATH", str(tmp_path / "awards.sqlite"))
+    monkeypatch.setattr(usaspending, "get_cache",
+                        lambda namespace, ttl: cache.TTLCache(namespace, ttl, cache_dir=str(tmp_path / "cache")))
+    pages = {}
+    requests = []
+
+    def fetch_page(start_date, end_date, page, limit):
+        requests.append(usaspending._award_payload(start_date, end_date, page, limit))
+        response = pages[page]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(usaspending, "_fetch_page", fetch_page)
+    return pages, requests
+
+
+def test_county_comes_from_recipient_location(api):
+    pages, requests = api
+    pages[1] = _page([_result("A-1", "OCEAN"), _result("A-2", "CAPE MAY"), _result("A-3", None)], has_next=False)
+
+    df = usaspending.fetch_all_nj_construction_awards("2024-01-01", "2024-12-31")
+
+    assert usaspending.RECIPIENT_LOCATION_FIELD in requests[0]["fields"]
+    assert df["recipient_county_name"].tolist() == ["Ocean", "Cape May", None]
+    assert usaspending.RECIPIENT_LOCATION_FIELD not in df.columns
+
+    counties = usaspending.award_store("2024-01-01", "2024-12-31").summarize("recipient_county_name")
+    assert counties.dropna().set_index("recipient_county_name")["awards"].to_dict() == {"Ocean": 1, "Cape May": 1}
+
+
+def test_empty_page_has_every_column():
+    assert list(usaspending.parse_awards([]).columns) == usaspending.AWARD_FIELDS
+
+
+def _store_ids():
+    return set(usaspending.award_store("2024-01-01", "2024-12-31").query()["award_id"])
+
+
+def test_store_only_takes_complete_loads(api):
+    pages, _ = api
+    pages[1] = _page([_result("A-1", "OCEAN"), _result("A-2", "ESSEX")], has_next=True)
+    pages[2] = _page([_result("A-3", "ESSEX")], has_next=False)
+    usaspending.fetch_all_nj_construction_awards("2024-01-01", "2024-12-31")
+    assert _store_ids() == {"A-1", "A-2", "A-3"}
+
+    # Capped before the last page
+    pages[1] = _page([_result("A-4", "BERGEN")], has_next=True)
+    usaspending.fetch_all_nj_construction_awards("2024-01-01", "2024-12-31", max_pages=1)
+    assert _store_ids() == {"A-1", "A-2", "A-3"}
+
+    # Failed partway through
+    pages[2] = DataSourceError("USA Spending", "HTTP 503", status_code=503)
+    with pytest.raises(DataSourceError):
+        usaspending.fetch_all_nj_construction_awards("2024-01-01", "2024-12-31", force_refresh=True)
+    assert _store_ids() == {"A-1", "A-2", "A-3"}
+
+    # A complete load replaces the store, dropping awards no longer listed
+    pages[2] = _page([_result("A-2", "ESSEX")], has_next=False)
+    usaspending.fetch_all_nj_construction_awards("2024-01-01", "2024-12-31", force_refresh=True)
+    assert _store_ids() == {"A-4", "A-2"}
+    assert usaspending.award_store("2024-01-01", "2024-12-31").count(county="Bergen") == 1
+
+
+def test_store_is_not_filled_from_the_warehouse(api):
+    pages, _ = api
+    pages[1] = _page([_result("A-1", "OCEAN")], has_next=True)
+    usaspending.fetch_all_nj_construction_awards("2024-01-01", "2024-12-31", max_pages=1)
+    assert usaspending.load_stored_top_awards("2024-01-01", "2024-12-31", limit=None) is not None
+    assert usaspending.award_store("2024-01-01", "2024-12-31").count() == 0
@@ -0,0 +1,206 @@
+"""
+Lightweight spans for finding where a page render spends its time.
+
+Wrap a unit of work in ``span(name, **attributes)``. Spans opened inside
+another become its children, and every span that finishes while a Trace is
+active (see ``start_trace``) is collected on it, so a dashboard can show
+the spans of its own rerun. Attributes say why a span took as long as it
+did: bytes transferred, cache hit or miss, upstream status, the error.
+
+Finished spans are also appended to the JSON-lines file named by
+IUOE_TRACE_LOG, if set, one object per line, to find the slow source
+across many sessions.
+
+The active trace and span live in contextvars, which threads don't inherit
+by themselves: wrap work handed to another thread in ``in_context`` (as
+``loading`` and the clients' thread pools do) so its spans land on the
+caller's trace. With no active trace and no log, spans cost next to
+nothing.
+"""
+
+import contextvars
+import functools
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+from iuoe_data.config import TRACE_LOG
+
+_current_trace = contextvars.ContextVar("iuoe_trace", default=None)
+_current_span = contextvars.ContextVar("iuoe_span", default=None)
+_log_lock = threading.Lock()
+
+
+def _new_id():
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """
+    One timed unit of work
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "depth", "started", "duration", "attributes")
+
+    def __init__(self, name, trace_id, parent, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.started = time.time()
+        self.duration = None
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        """Add or overwrite attributes"""
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.started,
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            **self.attributes,
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded when nothing would ever read the span"""
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """
+    The spans of one page render or background refresh
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.trace_id = _new_id()
+        self.started = time.time()
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self):
+        """Finished spans in start order"""
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.started)
+
+    @property
+    def elapsed(self):
+        """Seconds since the trace started"""
+        return time.time() - self.started
+
+    def to_frame(self):
+        """
+        One row per span, in start order, names prefixed with a dot per nesting level
+
+        Columns are span, ms, then every attribute any span set.
+        """
+        rows = [{"span": "· " * span.depth + span.name, "ms": round(span.duration * 1000, 1), **span.attributes}
+                for span in self.spans]
+        return pd.DataFrame(rows, columns=None if rows else ["span", "ms"])
+
+    def to_jsonl(self):
+        """Every span as JSON lines, with the trace name on each"""
+        return "".join(json.dumps({"trace": self.name, **span.to_dict()}, default=str) + "\n"
+                       for span in self.spans)
+
+
+def start_trace(name):
+    """Start collecting the spans of the current context (thread or task) into a new Trace"""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def current_trace():
+    """The active Trace, or None"""
+    return _current_trace.get()
+
+
+def annotate(**attributes):
+    """Set attributes on the innermost open span, if any"""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
+
+
+def _write(trace, span):
+    line = json.dumps({"trace": trace.name if trace is not None else None, **span.to_dict()}, default=str)
+    try:
+        with _log_lock, open(TRACE_LOG, "a") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write span to {TRACE_LOG}: {e}")
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time the enclosed block as a span called ``name``
+
+    Yields the Span so attributes can be added as they become known. An
+    exception is recorded as the ``error`` attribute and re-raised.
+    """
+    trace = _current_trace.get()
+    if trace is None and not TRACE_LOG:
+        yield _NULL_SPAN
+        return
+
+    parent = _current_span.get()
+    if trace is not None:
+        trace_id = trace.trace_id
+    else:
+        trace_id = parent.trace_id if parent is not None else _new_id()
+    current = Span(name, trace_id, parent, attributes)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        if trace is not None:
+            trace.add(current)
+        if TRACE_LOG:
+            _write(trace, current)
+
+
+def traced(name):
+    """Decorator running every call of the function inside ``span(name)``"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def in_context(func):
+    """``func`` bound to a copy of the current context, to run on another thread"""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
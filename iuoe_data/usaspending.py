@@ -0,0 +1,231 @@
+"""
+USA Spending ``spending_by_award`` client for NJ construction contracts.
+"""
+
+import os
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from iuoe_data import awards, singleflight, tracing, warehouse
+from iuoe_data.cache import get_cache
+from iuoe_data.config import USA_SPENDING_API_URL
+from iuoe_data.http import post_json
+
+# USA Spending loads new award data once a day
+SPENDING_CACHE_TTL = 12 * 60 * 60
+
+# Largest page size spending_by_award accepts
+MAX_PAGE_LIMIT = 100
+
+# Warehouse partition every fetched NJ construction award is appended to
+WAREHOUSE_SERIES = "nj_construction_awards"
+
+# Columns of a parsed award page
+AWARD_FIELDS = ["award_id", "recipient_name", "total_obligation", "award_date",
+                "naics_code", "naics_description", "awarding_agency_name", "recipient_county_name"]
+
+# The API has no county field of its own; it comes back inside the
+# recipient's location object, which parse_awards flattens
+RECIPIENT_LOCATION_FIELD = "Recipient Location"
+REQUEST_FIELDS = [field for field in AWARD_FIELDS if field != "recipient_county_name"] + [RECIPIENT_LOCATION_FIELD]
+
+
+def nj_construction_filters(start_date, end_date):
+    """Contract awards (types A-D) to NJ recipients under NAICS 23"""
+    return {
+        "award_type_codes": ["A", "B", "C", "D"],
+        "naics_codes": ["23"],  # Construction
+        "recipient_locations": [{"country": "USA", "state": "NJ"}],
+        "time_period": [{"start_date": start_date, "end_date": end_date}]
+    }
+
+
+# One parsed page of awards. ``next_page`` is the cursor to resume from, or
+# None once the last page has been read.
+AwardPage = namedtuple("AwardPage", ["page", "next_page", "frame"])
+
+
+@tracing.traced("usaspending.parse")
+def parse_awards(results):
+    """Turn a page of ``results`` into a typed DataFrame; an empty page still has AWARD_FIELDS columns"""
+    df = pd.DataFrame(results) if results else pd.DataFrame(columns=AWARD_FIELDS)
+    if RECIPIENT_LOCATION_FIELD in df.columns:
+        # County names come upper-case ("CAPE MAY"); title case matches the
+        # rest of the package's NJ county names
+        df['recipient_county_name'] = df.pop(RECIPIENT_LOCATION_FIELD).str.get('county_name').str.title()
+    if 'total_obligation' in df.columns:
+        df['total_obligation'] = pd.to_numeric(df['total_obligation'], errors='coerce')
+    if 'award_date' in df.columns:
+        df['award_date'] = pd.to_datetime(df['award_date'], errors='coerce')
+    return df
+
+
+def _award_payload(start_date, end_date, page, limit):
+    return {
+        "filters": nj_construction_filters(start_date, end_date),
+        "fields": REQUEST_FIELDS,
+        "page": page,
+        "limit": limit,
+        "sort": "total_obligation",
+        "order": "desc"
+    }
+
+
+def award_store_path(start_date, end_date):
+    """Award store file for one award window, next to AWARD_STORE_PATH"""
+    root, extension = os.path.splitext(awards.AWARD_STORE_PATH)
+    return f"{root}-{start_date}_{end_date}{extension}"
+
+
+def _load_award_store(start_date, end_date, df):
+    try:
+        awards.get_store(award_store_path(start_date, end_date)).replace(df)
+    except (sqlite3.Error, OSError) as e:
+        # Like the cache, a broken store only costs us the indexed queries
+        print(f"⚠️ Could not store USA Spending awards: {e}")
+
+
+def award_store(start_date="2023-01-01", end_date="2024-12-31"):
+    """
+    The indexed store of the awards in one window (see ``iuoe_data.awards``)
+
+    Holds what the last complete fetch_all_nj_construction_awards load of
+    the window returned, so its totals and rollups describe that load and
+    nothing else; it is empty until one has finished. Raises sqlite3.Error
+    or OSError if the store can't be opened.
+    """
+    return awards.get_store(award_store_path(start_date, end_date))
+
+
+def _fetch_page(start_date, end_date, page, limit):
+    return post_json("USA Spending", USA_SPENDING_API_URL,
+                     _award_payload(start_date, end_date, page, limit))
+
+
+@tracing.traced("usaspending.fetch")
+@singleflight.coalesced("usaspending.fetch")
+def fetch_nj_construction_awards(start_date="2023-01-01", end_date="2024-12-31", limit=100, force_refresh=False):
+    """
+    Fetch the largest NJ construction contract awards, sorted by obligation
+
+    Returns an empty DataFrame when the API has no matching awards.
+    ``force_refresh`` skips the cache. Raises DataSourceError on HTTP or
+    network failure.
+    """
+    cache = get_cache("usaspending", SPENDING_CACHE_TTL)
+    cache_key = cache.key(start_date, end_date, limit)
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    data = _fetch_page(start_date, end_date, 1, limit)
+
+    df = parse_awards(data.get('results', []))
+    if not df.empty:
+        cache.set(cache_key, df)
+        warehouse.append("usaspending", WAREHOUSE_SERIES, df, key=("award_id",))
+    return df
+
+
+def iter_nj_construction_award_pages(start_date="2023-01-01", end_date="2024-12-31",
+                                     start_page=1, limit=MAX_PAGE_LIMIT, max_pages=None):
+    """
+    Stream every NJ construction award page by page as ``AwardPage`` tuples
+
+    Follows ``page_metadata.hasNext`` and requests the next page while the
+    current one is being parsed, so only about two raw JSON pages are held in
+    memory at once. To resume an interrupted load, pass the last
+    ``AwardPage.next_page`` you saw as ``start_page``.
+    Raises DataSourceError if a page request fails.
+    """
+    limit = min(limit, MAX_PAGE_LIMIT)
+    pages_read = 0
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        page = start_page
+        pending = pool.submit(tracing.in_context(_fetch_page), start_date, end_date, page, limit)
+
+        while pending is not None:
+            data = pending.result()
+            pages_read += 1
+
+            has_next = bool(data.get('page_metadata', {}).get('hasNext'))
+            read_more = has_next and (max_pages is None or pages_read < max_pages)
+
+            # Start the next request before parsing this page
+            pending = pool.submit(tracing.in_context(_fetch_page), start_date, end_date, page + 1, limit) if read_more else None
+
+            frame = parse_awards(data.get('results', []))
+            del data
+            yield AwardPage(page, page + 1 if has_next else None, frame)
+            page += 1
+
+
+@singleflight.coalesced("usaspending.fetch_all")
+def fetch_all_nj_construction_awards(start_date="2023-01-01", end_date="2024-12-31", max_pages=None,
+                                     force_refresh=False):
+    """
+    Load every NJ construction award in the window into one DataFrame
+
+    Pages through the whole result set, largest awards first. An award
+    that shifts pages while the load runs is kept once. Cached like
+    fetch_nj_construction_awards; ``force_refresh`` skips the cache. Raises
+    DataSourceError on failure.
+
+    Pages go to the warehouse as they arrive, but the window's award store
+    (see award_store) is only replaced once the last page has been read: a
+    load cut short by ``max_pages`` or an error leaves it as it was.
+    """
+    cache = get_cache("usaspending", SPENDING_CACHE_TTL)
+    cache_key = cache.key("all", start_date, end_date, max_pages)
+    if not force_refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    frames = []
+    complete = False
+    for award_page in iter_nj_construction_award_pages(start_date, end_date, max_pages=max_pages):
+        complete = award_page.next_page is None
+        if not award_page.frame.empty:
+            frames.append(award_page.frame)
+            warehouse.append("usaspending", WAREHOUSE_SERIES, award_page.frame, key=("award_id",))
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=AWARD_FIELDS)
+    if not df.empty:
+        df = df.drop_duplicates("award_id", keep="last").reset_index(drop=True)
+        cache.set(cache_key, df)
+    if complete:
+        _load_award_store(start_date, end_date, df)
+    return df
+
+
+def load_stored_nj_construction_awards():
+    """
+    Every NJ construction award ever fetched, read from the warehouse
+
+    Rows are de-duplicated on award_id, keeping the latest fetch. Returns an
+    empty DataFrame when nothing has been stored (or pyarrow is missing).
+    """
+    df = warehouse.read("usaspending", WAREHOUSE_SERIES, key=("award_id",))
+    return df if df is not None else pd.DataFrame(columns=AWARD_FIELDS)
+
+
+def load_stored_top_awards(start_date="2023-01-01", end_date="2024-12-31", limit=100):
+    """
+    The ``limit`` largest stored awards dated within the window, or None if there are none
+
+    Serves the same shape as fetch_nj_construction_awards from the warehouse,
+    or, with ``limit=None``, as fetch_all_nj_construction_awards.
+    """
+    df = load_stored_nj_construction_awards()
+    if df.empty:
+        return None
+    in_window = (df['award_date'] >= pd.Timestamp(start_date)) & (df['award_date'] <= pd.Timestamp(end_date))
+    df = df[in_window].sort_values('total_obligation', ascending=False)
+    if limit is not None:
+        df = df.head(limit)
+    return df.reset_index(drop=True) if not df.empty else None
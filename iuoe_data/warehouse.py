@@ -0,0 +1,282 @@
+"""
+Local columnar warehouse for every series the clients fetch.
+
+Data is stored as uncompressed Arrow IPC files, partitioned by source and
+series:
+
+    .warehouse/<source>/<series>/part-<YYYYMM>-<timestamp>.arrow
+
+Writes are append-only: each fetch adds a new part file named after the
+month it was written in, and readers merge the parts, keeping the most
+recently written row for each key. Once a partition has more than
+COMPACT_MAX_PARTS parts, the append that crossed the limit compacts it
+back into one, so read cost stays flat however often a series is
+refreshed. Reads memory-map the files and skip parsing altogether:
+``read_table`` returns views onto them (categorical columns of a
+multi-part partition excepted, which have to be re-encoded), and ``read``
+makes one pandas copy of that.
+
+Next to its parts, a partition can keep a small JSON metadata file (see
+write_meta), e.g. the date from which it is known to hold all upstream has.
+
+pyarrow is optional. Without it every write is skipped and every read
+returns nothing, and the clients fall back to the network as before.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+WAREHOUSE_DIR = os.environ.get(
+    "IUOE_WAREHOUSE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".warehouse")
+)
+
+# Parts a partition may reach before the next append compacts it
+COMPACT_MAX_PARTS = 16
+
+_unsafe_chars = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def available():
+    """True when pyarrow is installed and the warehouse is usable"""
+    return pa is not None
+
+
+def _partition_dir(source, series):
+    return os.path.join(WAREHOUSE_DIR, _unsafe_chars.sub("_", source), _unsafe_chars.sub("_", series))
+
+
+def _part_files(source, series):
+    directory = _partition_dir(source, series)
+    if not os.path.isdir(directory):
+        return []
+    # Part names sort in write order
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.startswith("part-") and name.endswith(".arrow")]
+
+
+def _write(path, df):
+    """Write ``df`` to ``path`` atomically"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def append(source, series, df, key=None):
+    """
+    Append ``df`` to the ``source``/``series`` partition as a new part file
+
+    ``key`` is what readers de-duplicate the partition on (see read()); it
+    is applied when this append triggers a compaction.
+    """
+    if pa is None or df is None or df.empty:
+        return None
+
+    directory = _partition_dir(source, series)
+    os.makedirs(directory, exist_ok=True)
+    now = time.time()
+    name = f"part-{time.strftime('%Y%m', time.localtime(now))}-{int(now * 1e6)}.arrow"
+    path = os.path.join(directory, name)
+    _write(path, df)
+
+    if len(_part_files(source, series)) > COMPACT_MAX_PARTS:
+        try:
+            compact(source, series, key=key)
+        except OSError as e:
+            # The parts are all still there; the next append tries again
+            print(f"⚠️ Could not compact warehouse partition {source}/{series}: {e}")
+    return path
+
+
+def read_table(source, series):
+    """
+    Return every part of a partition as one memory-mapped ``pyarrow.Table``
+
+    Columns are views onto the files, one chunk per part, except that with
+    several parts categorical columns are decoded and re-encoded (copied)
+    so their dictionaries agree. Returns None if the partition is empty or
+    pyarrow is missing.
+    """
+    if pa is None:
+        return None
+
+    for attempt in range(3):
+        try:
+            return _read_parts(_part_files(source, series))
+        except FileNotFoundError:
+            # A compaction removed parts after they were listed; the data is
+            # in the compacted part now
+            if attempt == 2:
+                raise
+
+
+def _read_parts(paths):
+    tables = []
+    for path in paths:
+        with pa.memory_map(path, "r") as source_file:
+            tables.append(pa.ipc.open_file(source_file).read_all())
+    if len(tables) < 2:
+        return tables[0] if tables else None
+
+    categorical = set()
+    for table_index, table in enumerate(tables):
+        # Dictionary index widths depend on the number of categories, so
+        # parts written from categorical columns can't be concatenated with
+        # each other (or with older plain-string parts) until decoded.
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                categorical.add(field.name)
+                table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+        tables[table_index] = table
+
+    table = pa.concat_tables(tables, promote_options="default")
+    for name in categorical:
+        i = table.schema.get_field_index(name)
+        table = table.set_column(i, name, table.column(i).dictionary_encode())
+    return table
+
+
+def read(source, series, key=None):
+    """
+    Read a partition as a DataFrame, or None if there is nothing stored
+
+    When ``key`` columns are given, only the most recently written row for
+    each key is kept, so re-fetched or revised observations replace old ones.
+    """
+    table = read_table(source, series)
+    if table is None:
+        return None
+
+    # Each column's Arrow buffers are released once converted, so the file
+    # and the frame aren't both held in full
+    df = table.to_pandas(self_destruct=True)
+    del table
+    if key:
+        df = df.drop_duplicates(subset=list(key), keep="last")
+    if "date" in df.columns:
+        df = df.sort_values("date")
+    return df.reset_index(drop=True)
+
+
+def last_updated(source, series):
+    """Unix time of the newest write to a partition, or None"""
+    parts = _part_files(source, series)
+    if not parts:
+        return None
+    return os.path.getmtime(parts[-1])
+
+
+def read_meta(source, series):
+    """A partition's metadata dict, or {} if none has been written"""
+    try:
+        with open(os.path.join(_partition_dir(source, series), "meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_meta(source, series, **values):
+    """Merge ``values`` into a partition's metadata, atomically"""
+    if pa is None:
+        return
+    directory = _partition_dir(source, series)
+    os.makedirs(directory, exist_ok=True)
+    meta = {**read_meta(source, series), **values}
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+
+def mark_complete_from(source, series, start):
+    """
+    Record that upstream has nothing for a partition from ``start`` on that isn't stored
+
+    For series whose history begins after the start of the range last asked
+    for, so their missing early years aren't taken for a gap to fetch again.
+    """
+    start = pd.Timestamp(start)
+    known = read_meta(source, series).get("complete_from")
+    if known is None or start < pd.Timestamp(known):
+        write_meta(source, series, complete_from=start.strftime("%Y-%m-%d"))
+
+
+def covers(source, series, df, start):
+    """
+    True if ``df``, a partition's rows, holds everything upstream has from ``start`` on
+
+    Either its history reaches back to ``start``, or an earlier fetch found
+    nothing before it (see mark_complete_from).
+    """
+    if df is None or df.empty:
+        return False
+    if df['date'].min() <= start:
+        return True
+    known = read_meta(source, series).get("complete_from")
+    return known is not None and pd.Timestamp(known) <= start
+
+
+def read_fresh_series(source, series_ids, start, end, max_age):
+    """
+    Return ``{series_id: DataFrame}`` for ``[start, end]`` from the warehouse
+
+    Only succeeds if every series was written within ``max_age`` seconds and
+    covers ``start`` (see covers()); otherwise returns None so the caller
+    goes to the network.
+    """
+    if pa is None:
+        return None
+
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    now = time.time()
+    results = {}
+
+    for series_id in series_ids:
+        updated = last_updated(source, series_id)
+        if updated is None or now - updated > max_age:
+            return None
+
+        df = read(source, series_id, key=("date",))
+        if not covers(source, series_id, df, start):
+            return None
+
+        results[series_id] = df[(df['date'] >= start) & (df['date'] <= end)].reset_index(drop=True)
+
+    return results
+
+
+def compact(source, series, key=None):
+    """
+    Rewrite a partition as a single part file
+
+    The merged rows replace the newest part, in place, so the result sorts
+    exactly where the data it holds was written: before any part appended
+    while the merge ran, whose rows still win on read.
+    """
+    parts = _part_files(source, series)
+    if len(parts) < 2:
+        return
+    df = _read_parts(parts).to_pandas(self_destruct=True)
+    if key:
+        df = df.drop_duplicates(subset=list(key), keep="last")
+    _write(parts[-1], df)
+    for path in parts[:-1]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # removed by a concurrent compaction
+            pass
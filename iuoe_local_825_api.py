@@ -0,0 +1,301 @@
+"""
+JSON API behind the React frontend (iuoe-dashboard-frontend).
+
+The browser used to call BLS, USA Spending, OSHA, DOL and FRED itself, with
+the API keys shipped in the bundle: every visitor waited on all five
+upstreams and spent quota of their own. This server fetches each dataset
+once, through the same scheduler and clients as
+iuoe_local_825_real_bls_dashboard.py, and every visitor shares the result.
+
+Each dataset is encoded to JSON, and gzipped, once per refresh rather than
+once per request, and served with an ETag so a browser that already has it
+gets a 304. ``/api/overview`` bundles all five datasets and the headline
+metrics into the single request the overview page needs.
+
+Run with:
+
+    pip install fastapi uvicorn
+    uvicorn iuoe_local_825_api:app --port 8000
+
+The Vite dev server proxies ``/api`` here (see vite.config.ts).
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import traceback
+from collections import namedtuple
+from datetime import datetime
+from functools import partial
+
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request, Response
+
+from iuoe_data import bls, dol, fred, loading, osha, scheduler, usaspending
+from iuoe_data.errors import DataSourceError
+
+# Same series as iuoe_local_825_real_bls_dashboard.py
+NJ_CONSTRUCTION_EMPLOYMENT = "SM34000002300000001"
+NJ_CONSTRUCTION_WAGES = "SM34000002300000002"
+NJ_UNEMPLOYMENT_RATE = "LAUCN340000000000003"
+NJ_LABOR_FORCE = "LAUCN340000000000006"
+BLS_SERIES = [NJ_CONSTRUCTION_EMPLOYMENT, NJ_CONSTRUCTION_WAGES, NJ_UNEMPLOYMENT_RATE, NJ_LABOR_FORCE]
+
+FRED_SERIES = ["CPIAUCSL", "PPIACO", "FEDFUNDS", "GDP"]
+DOL_SERIES = ["CES2023230001"]
+
+START_YEAR, END_YEAR = "2020", "2024"
+
+# Seconds a browser may reuse a response before revalidating it with its ETag
+CLIENT_MAX_AGE = 5 * 60
+
+# Responses smaller than this aren't worth gzipping
+GZIP_MIN_BYTES = 1024
+
+# How each dataset is kept fresh: (refresh, schedule, seed)
+DATASET_JOBS = {
+    "bls": (partial(bls.sync_series, BLS_SERIES, START_YEAR, END_YEAR), scheduler.bls_release_schedule,
+            partial(bls.load_stored_series, BLS_SERIES, START_YEAR, END_YEAR)),
+    "spending": (usaspending.fetch_nj_construction_awards, scheduler.daily(),
+                 usaspending.load_stored_top_awards),
+    "osha": (osha.fetch_nj_inspections, scheduler.daily(), None),
+    "dol": (partial(dol.fetch_timeseries, DOL_SERIES, START_YEAR, END_YEAR), scheduler.bls_release_schedule, None),
+    "fred": (partial(fred.fetch_observations, FRED_SERIES, f"{START_YEAR}-01-01", f"{END_YEAR}-12-31"),
+             scheduler.daily(), partial(fred.load_stored_observations, FRED_SERIES, f"{START_YEAR}-01-01",
+                                        f"{END_YEAR}-12-31")),
+}
+
+app = FastAPI(title="IUOE Local 825 data API")
+
+
+# Conversion to the shapes src/types/index.ts declares. Series are listed
+# newest observation first, as the upstream APIs do.
+
+def _records(df):
+    """DataFrame rows as JSON-able dicts; NaN becomes null and dates ISO strings"""
+    return json.loads(df.to_json(orient="records", date_format="iso", date_unit="s"))
+
+
+def bls_payload(results):
+    series = []
+    for series_id, df in results.items():
+        df = df.sort_values('date', ascending=False)
+        title = df['series_title'].iat[0] if 'series_title' in df.columns and not df.empty else series_id
+        series.append({
+            "seriesID": series_id,
+            "seriesTitle": str(title),
+            "data": [{"year": str(date.year), "period": f"M{date.month:02d}", "value": f"{value:.10g}",
+                      "date": date.strftime("%Y-%m-%d")}
+                     for date, value in zip(df['date'], df['value']) if pd.notna(value)],
+        })
+    return series
+
+
+def spending_payload(df):
+    if df is None or df.empty:
+        return []
+    df = df.assign(award_date=df['award_date'].dt.strftime("%Y-%m-%d"))
+    return _records(df[[column for column in usaspending.AWARD_FIELDS if column in df.columns]])
+
+
+def osha_payload(df):
+    if df is None or df.empty:
+        return []
+    df = df.sort_values('inspection_date', ascending=False)
+    return _records(df.assign(inspection_date=df['inspection_date'].dt.strftime("%Y-%m-%d")))
+
+
+def dol_payload(results):
+    series = []
+    for series_id, df in results.items():
+        df = df.sort_values('date', ascending=False)
+        series.append({
+            "series_id": series_id,
+            "title": str(df['title'].iat[0]) if not df.empty else series_id,
+            "data": [{"year": str(date.year), "period": f"M{date.month:02d}", "value": value,
+                      "date": date.strftime("%Y-%m-%d")}
+                     for date, value in zip(df['date'], df['value'].astype(object).where(df['value'].notna()))],
+        })
+    return series
+
+
+def fred_payload(df):
+    series = []
+    for series_id, observations in df.groupby('series_id', sort=False):
+        observations = observations.sort_values('date', ascending=False)
+        series.append({
+            "series_id": series_id,
+            "observations": [{"date": date.strftime("%Y-%m-%d"), "value": f"{value:.10g}"}
+                             for date, value in zip(observations['date'], observations['value'])],
+        })
+    return series
+
+
+PAYLOADS = {
+    "bls": bls_payload,
+    "spending": spending_payload,
+    "osha": osha_payload,
+    "dol": dol_payload,
+    "fred": fred_payload,
+}
+
+
+def _percent_change(latest, previous):
+    return (latest - previous) / previous * 100 if previous else 0.0
+
+
+def overview_metrics(datasets):
+    """Dashboard headline numbers from whichever payloads loaded"""
+    metrics = {"totalEmployment": 0, "employmentGrowth": 0, "totalSpending": 0, "contractCount": 0,
+               "averageWage": 0, "unemploymentRate": 0, "inflationRate": 0}
+
+    latest = {}
+    for series in datasets.get("bls") or []:
+        values = [float(point["value"]) for point in series["data"][:2]]
+        if values:
+            latest[series["seriesID"]] = (values[0], values[1] if len(values) > 1 else values[0])
+    if NJ_CONSTRUCTION_EMPLOYMENT in latest:
+        current, previous = latest[NJ_CONSTRUCTION_EMPLOYMENT]
+        metrics.update(totalEmployment=current, employmentGrowth=_percent_change(current, previous))
+    if NJ_CONSTRUCTION_WAGES in latest:
+        metrics["averageWage"] = latest[NJ_CONSTRUCTION_WAGES][0]
+    if NJ_UNEMPLOYMENT_RATE in latest:
+        metrics["unemploymentRate"] = latest[NJ_UNEMPLOYMENT_RATE][0]
+
+    contracts = datasets.get("spending") or []
+    metrics.update(totalSpending=sum(contract["total_obligation"] or 0 for contract in contracts),
+                   contractCount=len(contracts))
+
+    for series in datasets.get("fred") or []:
+        if series["series_id"] == "CPIAUCSL" and len(series["observations"]) > 1:
+            current, previous = (float(point["value"]) for point in series["observations"][:2])
+            metrics["inflationRate"] = _percent_change(current, previous)
+    return metrics
+
+
+# Encoded responses, rebuilt only when the snapshots behind them change
+
+Encoded = namedtuple("Encoded", ["sources", "etag", "body", "gzipped"])
+
+_encoded = {}
+_encoded_lock = threading.Lock()
+
+
+def _encode(payload):
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    return etag, body, gzipped
+
+
+def _cached_encoding(name, sources, build):
+    """
+    Encoded response for ``name``, reusing the last one while ``sources`` are the same objects
+
+    ``sources`` are the Snapshots (and last refresh errors) the response was
+    built from; the scheduler publishes a new Snapshot object on every
+    refresh, and a new error object on every failure.
+    """
+    with _encoded_lock:
+        encoded = _encoded.get(name)
+    if encoded is not None and len(encoded.sources) == len(sources) and all(
+            old is new for old, new in zip(encoded.sources, sources)):
+        return encoded
+
+    encoded = Encoded(tuple(sources), *_encode(build()))
+    with _encoded_lock:
+        _encoded[name] = encoded
+    return encoded
+
+
+def load_snapshot(name):
+    """Latest Snapshot of a dataset, registering its refresh job on first use"""
+    refresh, schedule, seed = DATASET_JOBS[name]
+    return scheduler.get_snapshot(f"api:{name}", refresh, schedule, seed=seed)
+
+
+def _last_error(name):
+    return scheduler.get_scheduler().last_error(f"api:{name}")
+
+
+def _dataset_body(name, snapshot, error):
+    refreshed_at = snapshot.refreshed_at
+    return {
+        "data": PAYLOADS[name](snapshot.value),
+        "refreshed_at": datetime.fromtimestamp(refreshed_at).isoformat() if refreshed_at else None,
+        # Set when the upstream is failing and this is the last good data
+        "stale_error": str(error) if error is not None else None,
+    }
+
+
+def _respond(request, encoded):
+    headers = {
+        "ETag": encoded.etag,
+        "Cache-Control": f"public, max-age={CLIENT_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    # Proxies may weaken the tag (W/"...") after re-compressing the body
+    tags = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if encoded.etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]:
+        return Response(status_code=304, headers=headers)
+
+    if encoded.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(encoded.gzipped, media_type="application/json",
+                        headers={**headers, "Content-Encoding": "gzip"})
+    return Response(encoded.body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/overview")
+def get_overview(request: Request):
+    """
+    Every dataset plus the headline metrics in one response
+
+    A dataset that can't be loaded is reported in ``status`` and left out.
+    """
+    page_data = loading.start({name: partial(load_snapshot, name) for name in DATASET_JOBS}, DATASET_JOBS)
+    snapshots, errors, status = {}, {}, {}
+    for name in DATASET_JOBS:
+        try:
+            snapshots[name] = page_data.get(name)
+            status[name] = {"available": True, "error": None}
+        except DataSourceError as e:
+            status[name] = {"available": False, "error": str(e)}
+        except Exception as e:
+            # A first refresh that failed on bad data (the snapshot re-raises
+            # whatever the job raised) costs this dataset's card only
+            traceback.print_exc()
+            status[name] = {"available": False, "error": f"{type(e).__name__}: {e}"}
+        errors[name] = _last_error(name)
+
+    def build():
+        datasets, dataset_status = {}, dict(status)
+        for name, snapshot in snapshots.items():
+            try:
+                datasets[name] = _dataset_body(name, snapshot, errors[name])
+            except Exception as e:
+                # A dataset that can't be converted costs its own card, not
+                # the whole overview
+                traceback.print_exc()
+                dataset_status[name] = {"available": False, "error": f"{type(e).__name__}: {e}"}
+        return {
+            "status": dataset_status,
+            "metrics": overview_metrics({name: body["data"] for name, body in datasets.items()}),
+            "datasets": datasets,
+        }
+
+    sources = [source for name in DATASET_JOBS for source in (snapshots.get(name), errors[name])]
+    return _respond(request, _cached_encoding("overview", sources, build))
+
+
+@app.get("/api/{name}")
+def get_dataset(name: str, request: Request):
+    """One dataset as ``{"data": [...], "refreshed_at": ..., "stale_error": ...}``"""
+    if name not in DATASET_JOBS:
+        raise HTTPException(status_code=404, detail=f"unknown dataset {name!r}")
+    try:
+        snapshot = load_snapshot(name)
+    except DataSourceError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    error = _last_error(name)
+    return _respond(request, _cached_encoding(name, [snapshot, error], partial(_dataset_body, name, snapshot, error)))
@@ -1,12 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
-import requests
 import json
 
+from iuoe_data import analytics, lazy, styles, synthetic
+
+# Plotly is only needed once a chart is drawn; importing it up front would
+# hold back the page config, styles and sidebar on every cold start
+px = lazy.module("plotly.express")
+go = lazy.module("plotly.graph_objects")
+subplots = lazy.module("plotly.subplots")
+
 # Page configuration
 st.set_page_config(
     page_title="IUOE Local 825 - Labor Market Dashboard",
@@ -16,34 +20,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-    }
-    .section-header {
-        font-size: 1.5rem;
-        color: #2c3e50;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-    }
-    .info-box {
-        background-color: #e8f4fd;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #b3d9ff;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(styles.stylesheet("dashboard"), unsafe_allow_html=True)
 
 # Header
 st.markdown('<h1 class="main-header">🏗️ IUOE Local 825 Labor Market Dashboard</h1>', unsafe_allow_html=True)
@@ -60,23 +37,18 @@ page = st.sidebar.selectbox(
 def get_construction_employment():
     """Get construction employment data for NJ"""
     # Mock data - replace with actual OpenBB API calls
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-    employment = [150000 + i*100 + np.random.normal(0, 500) for i in range(len(dates))]
-    return pd.DataFrame({
-        'date': dates,
-        'employment': employment,
-        'unemployment_rate': [5.2 + np.random.normal(0, 0.5) for _ in range(len(dates))]
-    })
+    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
+    return synthetic.trend_frame(dates, 'construction_employment',
+                                 employment=(150000, 100, 500),
+                                 unemployment_rate=(5.2, 0, 0.5))
 
 def get_wage_data():
     """Get construction wage data for NJ"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='Q')
-    return pd.DataFrame({
-        'date': dates,
-        'hourly_wage': [35 + i*0.5 + np.random.normal(0, 1) for i in range(len(dates))],
-        'annual_wage': [75000 + i*1000 + np.random.normal(0, 2000) for i in range(len(dates))],
-        'benefits_cost': [15 + i*0.3 + np.random.normal(0, 0.5) for i in range(len(dates))]
-    })
+    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='QE')
+    return synthetic.trend_frame(dates, 'wages',
+                                 hourly_wage=(35, 0.5, 1),
+                                 annual_wage=(75000, 1000, 2000),
+                                 benefits_cost=(15, 0.3, 0.5))
 
 def get_industry_breakdown():
     """Get construction industry breakdown"""
@@ -89,16 +61,11 @@ def get_industry_breakdown():
 
 def get_economic_indicators():
     """Get economic indicators"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-    return pd.DataFrame({
-        'date': dates,
-        'cpi': [100 + i*0.2 + np.random.normal(0, 0.1) for i in range(len(dates))],
-        'ppi_construction': [100 + i*0.3 + np.random.normal(0, 0.2) for i in range(len(dates))],
-        'interest_rate': [2.5 + i*0.1 + np.random.normal(0, 0.05) for i in range(len(dates))]
-    })
-
-# Import numpy for mock data
-import numpy as np
+    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
+    return synthetic.trend_frame(dates, 'economic_indicators',
+                                 cpi=(100, 0.2, 0.1),
+                                 ppi_construction=(100, 0.3, 0.2),
+                                 interest_rate=(2.5, 0.1, 0.05))
 
 if page == "Overview":
     st.markdown('<h2 class="section-header">📊 Dashboard Overview</h2>', unsafe_allow_html=True)
@@ -189,7 +156,7 @@ elif page == "Employment Trends":
     employment_data = get_construction_employment()
     
     # Create subplots
-    fig = make_subplots(
+    fig = subplots.make_subplots(
         rows=2, cols=2,
         subplot_titles=('Construction Employment', 'Unemployment Rate', 
                        'Employment Growth Rate', 'Job Openings'),
@@ -212,8 +179,7 @@ elif page == "Employment Trends":
     )
     
     # Employment growth (mock data)
-    growth_rate = [(employment_data['employment'].iloc[i] - employment_data['employment'].iloc[i-1]) / 
-                   employment_data['employment'].iloc[i-1] * 100 for i in range(1, len(employment_data))]
+    growth_rate = analytics.mom(employment_data['employment']).iloc[1:]
     fig.add_trace(
         go.Scatter(x=employment_data['date'][1:], y=growth_rate,
                    mode='lines+markers', name='Growth Rate'),
@@ -221,7 +187,8 @@ elif page == "Employment Trends":
     )
     
     # Job openings (mock data)
-    job_openings = [5000 + np.random.normal(0, 200) for _ in range(len(employment_data))]
+    job_openings = synthetic.trend_frame(employment_data['date'], 'job_openings',
+                                         job_openings=(5000, 0, 200))['job_openings']
     fig.add_trace(
         go.Scatter(x=employment_data['date'], y=job_openings,
                    mode='lines+markers', name='Job Openings'),
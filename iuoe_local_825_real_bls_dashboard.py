@@ -1,13 +1,20 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-import requests
 import json
+import sqlite3
 from datetime import datetime, timedelta
 import time
+from functools import partial
+
+from iuoe_data import awards, bls, downsample, figures, lazy, loading, scheduler, styles, synthetic, tracing, usaspending
+from iuoe_data.config import BLS_API_KEY
+from iuoe_data.errors import DataSourceError
+
+# Plotly is only needed once a chart is drawn; importing it up front would
+# hold back the page config, styles and sidebar on every cold start
+px = lazy.module("plotly.express")
+go = lazy.module("plotly.graph_objects")
+subplots = lazy.module("plotly.subplots")
 
 # Page configuration
 st.set_page_config(
@@ -18,230 +25,86 @@ st.set_page_config(
 )
 
 # Custom CSS for super slick styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .main-header {
-        font-size: 3rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #1f77b4, #ff7f0e);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #dee2e6;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        transition: transform 0.2s ease-in-out;
-        margin-bottom: 1rem;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0,0,0,0.15);
-    }
-    
-    .metric-value {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1f77b4;
-        margin: 0;
-    }
-    
-    .metric-label {
-        font-size: 1rem;
-        color: #6c757d;
-        margin: 0;
-        font-weight: 500;
-    }
-    
-    .metric-change {
-        font-size: 0.9rem;
-        color: #28a745;
-        margin: 0;
-    }
-    
-    .section-header {
-        font-size: 2rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin: 2rem 0 1rem 0;
-        border-bottom: 3px solid #1f77b4;
-        padding-bottom: 0.5rem;
-    }
-    
-    .info-box {
-        background: linear-gradient(135deg, #e3f2fd, #bbdefb);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #90caf9;
-        margin: 1rem 0;
-    }
-    
-    .chart-container {
-        background: white;
-        padding: 1rem;
-        border-radius: 1rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin: 1rem 0;
-    }
-    
-    .sidebar .sidebar-content {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #1f77b4, #ff7f0e);
-        color: white;
-        border: none;
-        border-radius: 0.5rem;
-        padding: 0.5rem 1rem;
-        font-weight: 600;
-        transition: all 0.2s ease-in-out;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
-    .data-source-badge {
-        background: linear-gradient(135deg, #28a745, #20c997);
-        color: white;
-        padding: 0.25rem 0.5rem;
-        border-radius: 0.25rem;
-        font-size: 0.75rem;
-        font-weight: 600;
-        margin-left: 0.5rem;
-    }
-    
-    .loading {
-        text-align: center;
-        padding: 2rem;
-        color: #6c757d;
-    }
-    
-    .alert {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-        border-left: 4px solid;
-    }
-    
-    .alert-info {
-        background-color: #d1ecf1;
-        border-color: #17a2b8;
-        color: #0c5460;
-    }
-    
-    .alert-success {
-        background-color: #d4edda;
-        border-color: #28a745;
-        color: #155724;
-    }
-    
-    .alert-warning {
-        background-color: #fff3cd;
-        border-color: #ffc107;
-        color: #856404;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(styles.stylesheet("super"), unsafe_allow_html=True)
 
 # Header with animated gradient
 st.markdown('<h1 class="main-header">🏗️ IUOE Local 825 - Real NJ Data Dashboard</h1>', unsafe_allow_html=True)
 st.markdown("### Construction Industry Analytics for New Jersey with REAL BLS Data")
 
-# BLS API Configuration
-BLS_API_KEY = "79129dd32b5a4e1296cff5eec19d598c"
-
 # New Jersey BLS Series IDs
 NJ_CONSTRUCTION_EMPLOYMENT = "SM34000002300000001"  # NJ Construction Employment
 NJ_CONSTRUCTION_WAGES = "SM34000002300000002"       # NJ Construction Wages
 NJ_UNEMPLOYMENT_RATE = "LAUCN340000000000003"       # NJ Unemployment Rate
 NJ_LABOR_FORCE = "LAUCN340000000000006"             # NJ Labor Force
 
-def fetch_real_bls_nj_data():
+def show_data_freshness(label, job_name, snapshot):
     """
-    Fetch REAL BLS data for New Jersey construction using your API key
+    Say how old a snapshot is, and warn if its source is currently failing
     """
-    try:
-        # BLS API endpoint
-        url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
-        
-        # Series IDs for New Jersey construction data
+    error = scheduler.get_scheduler().last_error(job_name)
+    if error is not None:
+        st.warning(f"⚠️ {label} is unavailable right now ({error}). "
+                   f"Showing the last good data, fetched {snapshot.describe_age()}.")
+    else:
+        st.caption(f"✅ REAL {label} data, fetched {snapshot.describe_age()}")
+
+def load_bls_nj_snapshot(series_ids=None, start_year="2020", end_year="2024"):
+    """
+    Return ``(job_name, Snapshot)`` for the NJ BLS series
+
+    Makes no st.* calls, so it can run on a page loader thread.
+    """
+    # Series IDs for New Jersey construction data
+    if series_ids is None:
         series_ids = [
             NJ_CONSTRUCTION_EMPLOYMENT,  # Construction employment
             NJ_CONSTRUCTION_WAGES,       # Construction wages
             NJ_UNEMPLOYMENT_RATE,        # Unemployment rate
             NJ_LABOR_FORCE              # Labor force
         ]
-        
-        payload = {
-            "seriesid": series_ids,
-            "startyear": "2020",
-            "endyear": "2024",
-            "registrationkey": BLS_API_KEY
-        }
-        
-        st.info("🔍 Fetching REAL BLS data for New Jersey construction...")
-        
-        response = requests.post(url, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if data.get('status') == 'REQUEST_SUCCEEDED':
-                st.success("✅ Successfully fetched REAL BLS data!")
-                
-                # Process the data
-                results = {}
-                for series in data.get('Results', {}).get('series', []):
-                    series_id = series['seriesID']
-                    series_data = []
-                    
-                    for item in series['data']:
-                        year = int(item['year'])
-                        period = item['period']
-                        value = float(item['value'])
-                        
-                        # Convert period to date
-                        if period.startswith('M'):
-                            month = int(period[1:])
-                            date = pd.Timestamp(year, month, 1)
-                            series_data.append({
-                                'date': date,
-                                'value': value,
-                                'series_id': series_id
-                            })
-                    
-                    if series_data:  # Only add if we have data
-                        results[series_id] = pd.DataFrame(series_data)
-                
-                # If no real data was processed, use mock data
-                if not results:
-                    st.warning("No BLS data found, using realistic mock data")
-                    return get_mock_bls_nj_data()
-                
-                return results
-            else:
-                st.warning(f"BLS API Error: {data.get('message', 'Unknown error')}")
-                return get_mock_bls_nj_data()
+    
+    job_name = f"bls:{','.join(series_ids)}:{start_year}-{end_year}"
+    snapshot = scheduler.get_snapshot(
+        job_name,
+        partial(bls.sync_series, series_ids, start_year, end_year, api_key=BLS_API_KEY),
+        scheduler.bls_release_schedule,
+        seed=partial(bls.load_stored_series, series_ids, start_year, end_year)
+    )
+    return job_name, snapshot
+
+@tracing.traced("bls.nj_data")
+def fetch_real_bls_nj_data(series_ids=None, start_year="2020", end_year="2024", page_data=None):
+    """
+    Fetch REAL BLS data for New Jersey construction using your API key
+
+    Served from a snapshot that the background scheduler re-syncs after each
+    BLS release, so page renders don't wait on the API. Stored history is
+    synced incrementally: only the newest months are requested. If BLS is
+    down, the last good snapshot keeps being served with its age shown;
+    mock data is only used when nothing has ever been fetched.
+
+    When the page has already started loading ``"bls"`` in ``page_data``,
+    that result is used instead of loading it here.
+    """
+    try:
+        if page_data is not None and "bls" in page_data:
+            job_name, snapshot = page_data.get("bls")
         else:
-            st.error(f"HTTP Error: {response.status_code}")
+            with st.spinner("🔍 Fetching REAL BLS data for New Jersey construction..."):
+                job_name, snapshot = load_bls_nj_snapshot(series_ids, start_year, end_year)
+        results = snapshot.value
+        
+        # If no real data was processed, use mock data
+        if not results:
+            st.warning("No BLS data found, using realistic mock data")
             return get_mock_bls_nj_data()
-            
+        
+        show_data_freshness("BLS", job_name, snapshot)
+        return results
+    
+    except DataSourceError as e:
+        st.warning(f"BLS API Error: {e}")
+        return get_mock_bls_nj_data()
     except Exception as e:
         st.error(f"Error fetching BLS data: {e}")
         return get_mock_bls_nj_data()
@@ -249,83 +112,71 @@ def fetch_real_bls_nj_data():
 def get_mock_bls_nj_data():
     """
     Fallback mock data for New Jersey construction
+
+    Uses a fixed seed so the numbers don't change on every rerun.
     """
     dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
     
     # Realistic NJ construction data
-    employment = [145000 + i*200 + np.random.normal(0, 500) for i in range(len(dates))]
-    wages = [35 + i*0.8 + np.random.normal(0, 0.5) for i in range(len(dates))]
-    unemployment = [5.5 + np.random.normal(0, 0.4) for _ in range(len(dates))]
-    labor_force = [4500000 + i*1000 + np.random.normal(0, 2000) for i in range(len(dates))]
-    
-    return {
-        NJ_CONSTRUCTION_EMPLOYMENT: pd.DataFrame({
-            'date': dates,
-            'value': employment,
-            'series_id': NJ_CONSTRUCTION_EMPLOYMENT
-        }),
-        NJ_CONSTRUCTION_WAGES: pd.DataFrame({
-            'date': dates,
-            'value': wages,
-            'series_id': NJ_CONSTRUCTION_WAGES
-        }),
-        NJ_UNEMPLOYMENT_RATE: pd.DataFrame({
-            'date': dates,
-            'value': unemployment,
-            'series_id': NJ_UNEMPLOYMENT_RATE
-        }),
-        NJ_LABOR_FORCE: pd.DataFrame({
-            'date': dates,
-            'value': labor_force,
-            'series_id': NJ_LABOR_FORCE
-        })
-    }
-
-def fetch_real_usa_spending_nj():
+    return synthetic.bls_series(dates, {
+        NJ_CONSTRUCTION_EMPLOYMENT: (145000, 200, 500),
+        NJ_CONSTRUCTION_WAGES: (35, 0.8, 0.5),
+        NJ_UNEMPLOYMENT_RATE: (5.5, 0, 0.4),
+        NJ_LABOR_FORCE: (4500000, 1000, 2000),
+    }, name='bls_nj')
+
+USA_SPENDING_JOB = "usaspending:nj_awards"
+
+# Award window of the spending pages
+SPENDING_START_DATE = "2023-01-01"
+SPENDING_END_DATE = "2024-12-31"
+
+def load_usa_spending_nj_snapshot():
+    """
+    Return the Snapshot of every NJ construction award in the spending window
+
+    The scheduler pages through the whole result set, not just the largest
+    hundred awards. Makes no st.* calls, so it can run on a page loader thread.
+    """
+    return scheduler.get_snapshot(
+        USA_SPENDING_JOB,
+        partial(usaspending.fetch_all_nj_construction_awards, SPENDING_START_DATE, SPENDING_END_DATE),
+        scheduler.daily(),
+        seed=partial(usaspending.load_stored_top_awards, SPENDING_START_DATE, SPENDING_END_DATE, limit=None)
+    )
+
+@tracing.traced("usaspending.nj_data")
+def fetch_real_usa_spending_nj(page_data=None):
     """
     Fetch REAL USA Spending data for New Jersey construction
+
+    Served from a snapshot the background scheduler refreshes daily. Uses
+    ``page_data``'s ``"spending"`` result when the page already started it.
+    Returns ``(df, version)``, where ``version`` changes whenever ``df``
+    does (the snapshot's refresh time, or ``"mock"``), for spending_store
+    to be cached on.
     """
     try:
-        url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-        
-        payload = {
-            "filters": {
-                "award_type_codes": ["A", "B", "C", "D"],
-                "naics_codes": ["23"],  # Construction
-                "recipient_locations": [{"country": "USA", "state": "NJ"}],
-                "time_period": [{"start_date": "2023-01-01", "end_date": "2024-12-31"}]
-            },
-            "fields": ["award_id", "recipient_name", "total_obligation", "award_date", 
-                      "naics_code", "naics_description", "awarding_agency_name"],
-            "page": 1,
-            "limit": 100,
-            "sort": "total_obligation",
-            "order": "desc"
-        }
-        
-        st.info("🔍 Fetching REAL USA Spending data for NJ...")
-        response = requests.post(url, json=payload, timeout=30)
+        if page_data is not None and "spending" in page_data:
+            snapshot = page_data.get("spending")
+        else:
+            with st.spinner("🔍 Fetching REAL USA Spending data for NJ..."):
+                snapshot = load_usa_spending_nj_snapshot()
+        df = snapshot.value
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            
-            if results:
-                st.success(f"✅ Found {len(results)} REAL NJ contracts!")
-                df = pd.DataFrame(results)
-                df['total_obligation'] = pd.to_numeric(df['total_obligation'], errors='coerce')
-                df['award_date'] = pd.to_datetime(df['award_date'])
-                return df
-            else:
-                st.warning("No NJ contracts found, using mock data")
-                return get_mock_usa_spending_nj()
+        if not df.empty:
+            show_data_freshness(f"USA Spending ({len(df)} NJ contracts)", USA_SPENDING_JOB, snapshot)
+            return df, snapshot.refreshed_at or "seed"
         else:
-            st.error(f"USA Spending API Error: {response.status_code}")
-            return get_mock_usa_spending_nj()
-            
+            st.warning("No NJ contracts found, using mock data")
+            return get_mock_usa_spending_nj(), "mock"
+    
+    except DataSourceError as e:
+        st.error(f"USA Spending API Error: {e}")
+        return get_mock_usa_spending_nj(), "mock"
     except Exception as e:
         st.error(f"Error fetching USA Spending data: {e}")
-        return get_mock_usa_spending_nj()
+        return get_mock_usa_spending_nj(), "mock"
 
 def get_mock_usa_spending_nj():
     """
@@ -347,6 +198,133 @@ def get_mock_usa_spending_nj():
                             'Bridge Construction', 'Utility Construction', 'Site Preparation']
     })
 
+# Chart builders. Figures are cached on a hash of their inputs, so a rerun
+# with unchanged data reuses the figure instead of rebuilding it.
+def plotly_chart(build, *frames, **params):
+    """Render ``build(*frames, **params)`` through the figure cache"""
+    fig = figures.cached_figure(build, *frames, **params)
+    with tracing.span("chart.render", chart=build.__name__):
+        st.plotly_chart(fig, use_container_width=True)
+
+def build_bar(df, x, y, title, color, color_continuous_scale, height=None):
+    fig = px.bar(df, x=x, y=y, title=title, color=color,
+                 color_continuous_scale=color_continuous_scale)
+    if height is not None:
+        fig.update_layout(height=height)
+    return fig
+
+def build_pie(df, values, names, title):
+    return px.pie(df, values=values, names=names, title=title)
+
+# Line traces are cut to about one point per pixel of their chart before
+# they are built, so long histories don't grow the page
+def build_line(df, title):
+    fig = px.line(downsample.frame(df, points=downsample.PANEL_POINTS), x='date', y='value',
+                  title=title, markers=True)
+    fig.update_layout(height=400)
+    return fig
+
+def build_heatmap(df, title):
+    return px.imshow(df, title=title, color_continuous_scale='RdBu_r')
+
+def build_employment_trend(employment_df):
+    employment_df = downsample.frame(employment_df)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=employment_df['date'],
+        y=employment_df['value'],
+        mode='lines+markers',
+        name='NJ Construction Employment',
+        line=dict(color='#1f77b4', width=4),
+        marker=dict(size=8)
+    ))
+    fig.update_layout(
+        title='New Jersey Construction Employment (2020-2024)',
+        xaxis_title='Date',
+        yaxis_title='Employment',
+        height=400,
+        template='plotly_white'
+    )
+    return fig
+
+def build_employment_wages_panels(emp_data, wage_data, unemp_data, lf_data):
+    """Four-panel employment, wages, unemployment and labor force chart; missing frames are None"""
+    fig = subplots.make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('NJ Construction Employment', 'NJ Construction Wages', 
+                       'NJ Unemployment Rate', 'NJ Labor Force'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]]
+    )
+    
+    panels = [
+        (emp_data, 'Employment', '#1f77b4', 1, 1),
+        (wage_data, 'Wages', '#ff7f0e', 1, 2),
+        (unemp_data, 'Unemployment', '#2ca02c', 2, 1),
+        (lf_data, 'Labor Force', '#d62728', 2, 2),
+    ]
+    for data, name, color, row, col in panels:
+        if data is not None:
+            data = downsample.frame(data, points=downsample.PANEL_POINTS)
+            fig.add_trace(
+                go.Scatter(x=data['date'], y=data['value'],
+                           mode='lines+markers', name=name,
+                           line=dict(color=color, width=3)),
+                row=row, col=col
+            )
+    
+    fig.update_layout(height=600, showlegend=True, template='plotly_white')
+    return fig
+
+# Largest recipients charted, and largest awards listed, on the spending page
+SPENDING_TOP_RECIPIENTS = 25
+SPENDING_TABLE_ROWS = 500
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def spending_store(version, _spending_data):
+    """
+    The award store behind the spending charts, chosen once per ``version``
+
+    The spending window's store when its last complete load was exactly the
+    snapshot being shown. Otherwise (mock or seeded data, or a store that
+    can't be opened) an in-memory store of ``_spending_data``, so the pages
+    work the same way. Reruns showing the same version of the data reuse
+    the store instead of checking and rebuilding it.
+    """
+    try:
+        store = usaspending.award_store(SPENDING_START_DATE, SPENDING_END_DATE)
+        if 'award_id' in _spending_data.columns and store.load_checksum() == awards.checksum(_spending_data):
+            return store
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Could not open the award store: {e}")
+    return awards.from_frame(_spending_data)
+
+def spending_filters(store):
+    """Filter widgets for the spending page; returns keyword filters for the award store"""
+    first, last = store.date_range()
+    with st.expander("🔎 Filter awards", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            agencies = st.multiselect("Awarding agency", store.distinct("awarding_agency_name"))
+            naics_codes = st.multiselect("NAICS code", store.distinct("naics_code"))
+        with col2:
+            recipients = st.multiselect("Recipient", store.distinct("recipient_name"))
+            dates = st.date_input("Award date", (first, last)) if first is not None else ()
+    start_date, end_date = (dates if len(dates) == 2 else (None, None))
+    # The full range filters nothing, and leaving it out lets the store answer
+    # from its rollups
+    if start_date is not None and pd.Timestamp(start_date) <= first and pd.Timestamp(end_date) >= last:
+        start_date, end_date = None, None
+    return {"agency": agencies, "naics_code": naics_codes, "recipient": recipients,
+            "start_date": start_date, "end_date": end_date}
+
+def usable_series(bls_data, series_id):
+    """The frame for ``series_id`` if it has values, else None"""
+    df = bls_data.get(series_id) if bls_data else None
+    if df is None or df.empty or 'value' not in df.columns:
+        return None
+    return df
+
 # Sidebar navigation
 st.sidebar.title("📊 Dashboard Navigation")
 page = st.sidebar.selectbox(
@@ -356,220 +334,156 @@ page = st.sidebar.selectbox(
      "📊 Data Sources", "ℹ️ About"]
 )
 
+# Every fetch, parse and chart of this rerun is timed as a span on this
+# trace, and shown in the sidebar's performance panel at the end
+trace = tracing.start_trace(page)
+
+# Datasets each page needs. They all start loading concurrently before the
+# page draws anything, and each section renders as its own data arrives.
+DATASET_LOADERS = {
+    "bls": load_bls_nj_snapshot,
+    "spending": load_usa_spending_nj_snapshot,
+}
+PAGE_DATASETS = {
+    "🏠 NJ Overview": ["bls", "spending"],
+    "📈 NJ Employment & Wages": ["bls"],
+    "💰 NJ Federal Spending": ["spending"],
+    "🏦 NJ Economic Indicators": ["bls"],
+}
+page_data = loading.start(DATASET_LOADERS, PAGE_DATASETS.get(page, []))
+
+def show_performance_panel(trace):
+    """Collapsible sidebar breakdown of this rerun's spans, with a JSON-lines download"""
+    with st.sidebar.expander(f"⏱️ Performance ({trace.elapsed:.2f}s)", expanded=False):
+        spans = trace.to_frame()
+        if spans.empty:
+            st.caption("Nothing was fetched or drawn on this page")
+            return
+        st.dataframe(spans, hide_index=True, use_container_width=True)
+        st.download_button("Download spans (JSON lines)", trace.to_jsonl(),
+                           file_name=f"spans-{trace.trace_id}.jsonl", mime="application/x-ndjson")
+
+def render_metric_card(slot, label, value, change):
+    slot.markdown(f"""
+    <div class="metric-card">
+        <p class="metric-label">{label}</p>
+        <p class="metric-value">{value}</p>
+        <p class="metric-change">{change}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_loading_card(slot, label):
+    render_metric_card(slot, label, "Loading...", "Processing data...")
+
 # Main dashboard logic
 if page == "🏠 NJ Overview":
     st.markdown('<h2 class="section-header">📊 New Jersey Executive Summary</h2>', unsafe_allow_html=True)
     
-    # Fetch real BLS data
-    bls_data = fetch_real_bls_nj_data()
+    # Lay out every section up front with placeholders; each is filled in as
+    # soon as its own dataset arrives
+    status = st.container()
     
     # Key metrics with real data
-    col1, col2, col3, col4 = st.columns(4)
-    
-    if bls_data and NJ_CONSTRUCTION_EMPLOYMENT in bls_data:
-        employment_data = bls_data[NJ_CONSTRUCTION_EMPLOYMENT]
-        if not employment_data.empty and 'value' in employment_data.columns:
-            latest_employment = employment_data['value'].iloc[-1]
-            if len(employment_data) > 1:
-                prev_employment = employment_data['value'].iloc[-2]
-                growth_rate = ((latest_employment - prev_employment) / prev_employment) * 100
-            else:
-                growth_rate = 0
-            
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <p class="metric-label">NJ Construction Employment</p>
-                    <p class="metric-value">{latest_employment:,.0f}</p>
-                    <p class="metric-change">↗️ {growth_rate:+.1f}% from last month</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            with col1:
-                st.markdown("""
-                <div class="metric-card">
-                    <p class="metric-label">NJ Construction Employment</p>
-                    <p class="metric-value">Loading...</p>
-                    <p class="metric-change">Processing data...</p>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    if bls_data and NJ_CONSTRUCTION_WAGES in bls_data:
-        wage_data = bls_data[NJ_CONSTRUCTION_WAGES]
-        if not wage_data.empty and 'value' in wage_data.columns:
-            latest_wage = wage_data['value'].iloc[-1]
-            if len(wage_data) > 1:
-                prev_wage = wage_data['value'].iloc[-2]
-                wage_growth = ((latest_wage - prev_wage) / prev_wage) * 100
-            else:
-                wage_growth = 0
-            
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <p class="metric-label">NJ Construction Wage</p>
-                    <p class="metric-value">${latest_wage:.2f}</p>
-                    <p class="metric-change">↗️ {wage_growth:+.1f}% from last month</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            with col2:
-                st.markdown("""
-                <div class="metric-card">
-                    <p class="metric-label">NJ Construction Wage</p>
-                    <p class="metric-value">Loading...</p>
-                    <p class="metric-change">Processing data...</p>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    if bls_data and NJ_UNEMPLOYMENT_RATE in bls_data:
-        unemployment_data = bls_data[NJ_UNEMPLOYMENT_RATE]
-        if not unemployment_data.empty and 'value' in unemployment_data.columns:
-            latest_unemployment = unemployment_data['value'].iloc[-1]
-            if len(unemployment_data) > 1:
-                prev_unemployment = unemployment_data['value'].iloc[-2]
-                unemployment_change = latest_unemployment - prev_unemployment
-            else:
-                unemployment_change = 0
-            
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <p class="metric-label">NJ Unemployment Rate</p>
-                    <p class="metric-value">{latest_unemployment:.1f}%</p>
-                    <p class="metric-change">{'↘️' if unemployment_change < 0 else '↗️'} {unemployment_change:+.1f}% from last month</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            with col3:
-                st.markdown("""
-                <div class="metric-card">
-                    <p class="metric-label">NJ Unemployment Rate</p>
-                    <p class="metric-value">Loading...</p>
-                    <p class="metric-change">Processing data...</p>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    # Federal spending overview
-    spending_data = fetch_real_usa_spending_nj()
-    total_spending = spending_data['total_obligation'].sum()
-    
-    with col4:
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">NJ Federal Contracts</p>
-            <p class="metric-value">${total_spending/1000000:.1f}M</p>
-            <p class="metric-change">↗️ Active contracts in NJ</p>
-        </div>
-        """, unsafe_allow_html=True)
+    metric_slots = [column.empty() for column in st.columns(4)]
+    metric_labels = ["NJ Construction Employment", "NJ Construction Wage",
+                     "NJ Unemployment Rate", "NJ Federal Contracts"]
+    for slot, label in zip(metric_slots, metric_labels):
+        render_loading_card(slot, label)
     
     # NJ Employment Trends
     st.markdown('<h3 class="section-header">📈 NJ Construction Employment Trends</h3>', unsafe_allow_html=True)
-    
-    if bls_data and NJ_CONSTRUCTION_EMPLOYMENT in bls_data:
-        employment_df = bls_data[NJ_CONSTRUCTION_EMPLOYMENT]
-        if not employment_df.empty and 'value' in employment_df.columns:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=employment_df['date'],
-                y=employment_df['value'],
-                mode='lines+markers',
-                name='NJ Construction Employment',
-                line=dict(color='#1f77b4', width=4),
-                marker=dict(size=8)
-            ))
-            fig.update_layout(
-                title='New Jersey Construction Employment (2020-2024)',
-                xaxis_title='Date',
-                yaxis_title='Employment',
-                height=400,
-                template='plotly_white'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("Employment data not available in expected format")
-    else:
-        st.info("Employment data not available")
+    trend_slot = st.empty()
     
     # NJ Federal Spending
     st.markdown('<h3 class="section-header">💰 NJ Federal Contract Spending</h3>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
+    spending_bar_slot = col1.empty()
+    spending_pie_slot = col2.empty()
     
-    with col1:
-        fig = px.bar(spending_data, x='recipient_name', y='total_obligation',
-                     title='NJ Federal Construction Contracts',
-                     color='total_obligation',
-                     color_continuous_scale='Blues')
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        fig = px.pie(spending_data, values='total_obligation', names='recipient_name',
-                     title='Distribution of NJ Federal Spending')
-        st.plotly_chart(fig, use_container_width=True)
+    for dataset in page_data.as_completed():
+        if dataset == "bls":
+            with status:
+                bls_data = fetch_real_bls_nj_data(page_data=page_data)
+            
+            employment_data = usable_series(bls_data, NJ_CONSTRUCTION_EMPLOYMENT)
+            if employment_data is not None:
+                latest_employment = employment_data['value'].iloc[-1]
+                if len(employment_data) > 1:
+                    prev_employment = employment_data['value'].iloc[-2]
+                    growth_rate = ((latest_employment - prev_employment) / prev_employment) * 100
+                else:
+                    growth_rate = 0
+                render_metric_card(metric_slots[0], "NJ Construction Employment",
+                                   f"{latest_employment:,.0f}", f"↗️ {growth_rate:+.1f}% from last month")
+            
+            wage_data = usable_series(bls_data, NJ_CONSTRUCTION_WAGES)
+            if wage_data is not None:
+                latest_wage = wage_data['value'].iloc[-1]
+                if len(wage_data) > 1:
+                    prev_wage = wage_data['value'].iloc[-2]
+                    wage_growth = ((latest_wage - prev_wage) / prev_wage) * 100
+                else:
+                    wage_growth = 0
+                render_metric_card(metric_slots[1], "NJ Construction Wage",
+                                   f"${latest_wage:.2f}", f"↗️ {wage_growth:+.1f}% from last month")
+            
+            unemployment_data = usable_series(bls_data, NJ_UNEMPLOYMENT_RATE)
+            if unemployment_data is not None:
+                latest_unemployment = unemployment_data['value'].iloc[-1]
+                if len(unemployment_data) > 1:
+                    prev_unemployment = unemployment_data['value'].iloc[-2]
+                    unemployment_change = latest_unemployment - prev_unemployment
+                else:
+                    unemployment_change = 0
+                render_metric_card(metric_slots[2], "NJ Unemployment Rate", f"{latest_unemployment:.1f}%",
+                                   f"{'↘️' if unemployment_change < 0 else '↗️'} "
+                                   f"{unemployment_change:+.1f}% from last month")
+            
+            with trend_slot.container():
+                if bls_data and NJ_CONSTRUCTION_EMPLOYMENT in bls_data:
+                    if employment_data is not None:
+                        plotly_chart(build_employment_trend, employment_data[['date', 'value']])
+                    else:
+                        st.warning("Employment data not available in expected format")
+                else:
+                    st.info("Employment data not available")
+        
+        elif dataset == "spending":
+            # Federal spending overview
+            with status:
+                spending_data, spending_version = fetch_real_usa_spending_nj(page_data=page_data)
+            store = spending_store(spending_version, spending_data)
+            total_spending = store.totals()['total_obligation']
+            
+            render_metric_card(metric_slots[3], "NJ Federal Contracts",
+                               f"${total_spending/1000000:.1f}M", "↗️ Active contracts in NJ")
+            
+            spending_by_recipient = store.summarize("recipient_name", limit=SPENDING_TOP_RECIPIENTS)[
+                ['recipient_name', 'total_obligation']]
+            
+            with spending_bar_slot.container():
+                plotly_chart(build_bar, spending_by_recipient, x='recipient_name', y='total_obligation',
+                             title='NJ Federal Construction Contracts',
+                             color='total_obligation',
+                             color_continuous_scale='Blues', height=400)
+            
+            with spending_pie_slot.container():
+                plotly_chart(build_pie, spending_by_recipient, values='total_obligation', names='recipient_name',
+                             title='Distribution of NJ Federal Spending')
 
 elif page == "📈 NJ Employment & Wages":
     st.markdown('<h2 class="section-header">👷 NJ Employment & Wage Analysis</h2>', unsafe_allow_html=True)
     
-    bls_data = fetch_real_bls_nj_data()
+    bls_data = fetch_real_bls_nj_data(page_data=page_data)
     
     if bls_data:
         # Create comprehensive NJ analysis
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('NJ Construction Employment', 'NJ Construction Wages', 
-                           'NJ Unemployment Rate', 'NJ Labor Force'),
-            specs=[[{"secondary_y": False}, {"secondary_y": False}],
-                   [{"secondary_y": False}, {"secondary_y": False}]]
-        )
-        
-        # Employment trend
-        if NJ_CONSTRUCTION_EMPLOYMENT in bls_data:
-            emp_data = bls_data[NJ_CONSTRUCTION_EMPLOYMENT]
-            if not emp_data.empty and 'value' in emp_data.columns:
-                fig.add_trace(
-                    go.Scatter(x=emp_data['date'], y=emp_data['value'],
-                               mode='lines+markers', name='Employment',
-                               line=dict(color='#1f77b4', width=3)),
-                    row=1, col=1
-                )
-        
-        # Wage trend
-        if NJ_CONSTRUCTION_WAGES in bls_data:
-            wage_data = bls_data[NJ_CONSTRUCTION_WAGES]
-            if not wage_data.empty and 'value' in wage_data.columns:
-                fig.add_trace(
-                    go.Scatter(x=wage_data['date'], y=wage_data['value'],
-                               mode='lines+markers', name='Wages',
-                               line=dict(color='#ff7f0e', width=3)),
-                    row=1, col=2
-                )
-        
-        # Unemployment rate
-        if NJ_UNEMPLOYMENT_RATE in bls_data:
-            unemp_data = bls_data[NJ_UNEMPLOYMENT_RATE]
-            if not unemp_data.empty and 'value' in unemp_data.columns:
-                fig.add_trace(
-                    go.Scatter(x=unemp_data['date'], y=unemp_data['value'],
-                               mode='lines+markers', name='Unemployment',
-                               line=dict(color='#2ca02c', width=3)),
-                    row=2, col=1
-                )
-        
-        # Labor force
-        if NJ_LABOR_FORCE in bls_data:
-            lf_data = bls_data[NJ_LABOR_FORCE]
-            if not lf_data.empty and 'value' in lf_data.columns:
-                fig.add_trace(
-                    go.Scatter(x=lf_data['date'], y=lf_data['value'],
-                               mode='lines+markers', name='Labor Force',
-                               line=dict(color='#d62728', width=3)),
-                    row=2, col=2
-                )
-        
-        fig.update_layout(height=600, showlegend=True, template='plotly_white')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(build_employment_wages_panels,
+                     usable_series(bls_data, NJ_CONSTRUCTION_EMPLOYMENT),
+                     usable_series(bls_data, NJ_CONSTRUCTION_WAGES),
+                     usable_series(bls_data, NJ_UNEMPLOYMENT_RATE),
+                     usable_series(bls_data, NJ_LABOR_FORCE))
     
     # NJ County breakdown
     st.markdown('<h3 class="section-header">🗺️ NJ Employment by County</h3>', unsafe_allow_html=True)
@@ -587,62 +501,62 @@ elif page == "📈 NJ Employment & Wages":
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(county_data, x='County', y='Employment',
+        plotly_chart(build_bar, county_data, x='County', y='Employment',
                      title='NJ Construction Employment by County',
                      color='Employment',
                      color_continuous_scale='Blues')
-        st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        fig = px.bar(county_data, x='County', y='Avg_Wage',
+        plotly_chart(build_bar, county_data, x='County', y='Avg_Wage',
                      title='NJ Average Hourly Wage by County',
                      color='Avg_Wage',
                      color_continuous_scale='Greens')
-        st.plotly_chart(fig, use_container_width=True)
 
 elif page == "💰 NJ Federal Spending":
     st.markdown('<h2 class="section-header">💰 NJ Federal Spending Analysis</h2>', unsafe_allow_html=True)
     
-    spending_data = fetch_real_usa_spending_nj()
+    spending_data, spending_version = fetch_real_usa_spending_nj(page_data=page_data)
     
     if not spending_data.empty:
-        # Spending overview
-        total_spending = spending_data['total_obligation'].sum()
-        avg_contract = spending_data['total_obligation'].mean()
+        # Unfiltered totals and charts come from the store's rollups; filters
+        # run as indexed SQL over every award fetched so far
+        store = spending_store(spending_version, spending_data)
+        filters = spending_filters(store)
+        totals = store.totals(**filters)
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total NJ Federal Spending", f"${total_spending:,.0f}")
+            st.metric("Total NJ Federal Spending", f"${totals['total_obligation']:,.0f}")
         
         with col2:
-            st.metric("Average Contract Value", f"${avg_contract:,.0f}")
+            st.metric("Average Contract Value", f"${totals['average_obligation']:,.0f}")
         
         with col3:
-            st.metric("Number of NJ Contracts", len(spending_data))
+            st.metric("Number of NJ Contracts", totals['awards'])
         
         # NJ Spending trends
         st.markdown('<h3 class="section-header">📊 NJ Spending Trends</h3>', unsafe_allow_html=True)
         
-        fig = px.bar(spending_data, x='recipient_name', y='total_obligation',
+        by_recipient = store.summarize("recipient_name", limit=SPENDING_TOP_RECIPIENTS, **filters)
+        plotly_chart(build_bar, by_recipient[['recipient_name', 'total_obligation']],
+                     x='recipient_name', y='total_obligation',
                      title='NJ Federal Construction Contracts by Recipient',
                      color='total_obligation',
-                     color_continuous_scale='Reds')
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+                     color_continuous_scale='Reds', height=500)
         
         # Contract types
         st.markdown('<h3 class="section-header">🏗️ NJ Contract Types</h3>', unsafe_allow_html=True)
         
-        contract_types = spending_data['naics_description'].value_counts()
-        fig = px.pie(values=contract_types.values, names=contract_types.index,
+        contract_types = store.summarize("naics_description", **filters)
+        plotly_chart(build_pie, contract_types[['naics_description', 'awards']].rename(columns={'awards': 'contracts'}),
+                     values='contracts', names='naics_description',
                      title='Distribution of NJ Construction Types')
-        st.plotly_chart(fig, use_container_width=True)
         
         # Detailed table
         st.markdown('<h3 class="section-header">📋 NJ Contract Details</h3>', unsafe_allow_html=True)
         
-        spending_data_display = spending_data.copy()
+        spending_data_display = store.query(limit=SPENDING_TABLE_ROWS, **filters)
         spending_data_display['total_obligation'] = spending_data_display['total_obligation'].apply(
             lambda x: f"${x:,.0f}")
         spending_data_display['award_date'] = spending_data_display['award_date'].dt.strftime('%Y-%m-%d')
@@ -652,7 +566,7 @@ elif page == "💰 NJ Federal Spending":
 elif page == "🏦 NJ Economic Indicators":
     st.markdown('<h2 class="section-header">📈 NJ Economic Indicators</h2>', unsafe_allow_html=True)
     
-    bls_data = fetch_real_bls_nj_data()
+    bls_data = fetch_real_bls_nj_data(page_data=page_data)
     
     if bls_data:
         # Economic indicators dashboard
@@ -662,11 +576,7 @@ elif page == "🏦 NJ Economic Indicators":
             if NJ_CONSTRUCTION_WAGES in bls_data:
                 wage_data = bls_data[NJ_CONSTRUCTION_WAGES]
                 if not wage_data.empty and 'value' in wage_data.columns:
-                    fig = px.line(wage_data, x='date', y='value',
-                                  title='NJ Construction Wages',
-                                  markers=True)
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
+                    plotly_chart(build_line, wage_data[['date', 'value']], title='NJ Construction Wages')
                 else:
                     st.info("Wage data not available in expected format")
         
@@ -674,11 +584,7 @@ elif page == "🏦 NJ Economic Indicators":
             if NJ_UNEMPLOYMENT_RATE in bls_data:
                 unemp_data = bls_data[NJ_UNEMPLOYMENT_RATE]
                 if not unemp_data.empty and 'value' in unemp_data.columns:
-                    fig = px.line(unemp_data, x='date', y='value',
-                                  title='NJ Unemployment Rate',
-                                  markers=True)
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
+                    plotly_chart(build_line, unemp_data[['date', 'value']], title='NJ Unemployment Rate')
                 else:
                     st.info("Unemployment data not available in expected format")
         
@@ -689,11 +595,7 @@ elif page == "🏦 NJ Economic Indicators":
             if NJ_LABOR_FORCE in bls_data:
                 lf_data = bls_data[NJ_LABOR_FORCE]
                 if not lf_data.empty and 'value' in lf_data.columns:
-                    fig = px.line(lf_data, x='date', y='value',
-                                  title='NJ Labor Force',
-                                  markers=True)
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
+                    plotly_chart(build_line, lf_data[['date', 'value']], title='NJ Labor Force')
                 else:
                     st.info("Labor force data not available in expected format")
         
@@ -701,11 +603,7 @@ elif page == "🏦 NJ Economic Indicators":
             if NJ_CONSTRUCTION_EMPLOYMENT in bls_data:
                 emp_data = bls_data[NJ_CONSTRUCTION_EMPLOYMENT]
                 if not emp_data.empty and 'value' in emp_data.columns:
-                    fig = px.line(emp_data, x='date', y='value',
-                                  title='NJ Construction Employment',
-                                  markers=True)
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
+                    plotly_chart(build_line, emp_data[['date', 'value']], title='NJ Construction Employment')
                 else:
                     st.info("Employment data not available in expected format")
 
@@ -724,14 +622,12 @@ elif page == "🏢 NJ Industry Analysis":
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.pie(industry_data, values='Employment', names='Sector',
+        plotly_chart(build_pie, industry_data, values='Employment', names='Sector',
                      title='NJ Employment Distribution by Sector')
-        st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        fig = px.pie(industry_data, values='Union_Density', names='Sector',
+        plotly_chart(build_pie, industry_data, values='Union_Density', names='Sector',
                      title='NJ Union Density by Sector')
-        st.plotly_chart(fig, use_container_width=True)
     
     # NJ project pipeline
     st.markdown('<h3 class="section-header">📋 NJ Project Pipeline</h3>', unsafe_allow_html=True)
@@ -744,11 +640,10 @@ elif page == "🏢 NJ Industry Analysis":
         'Workers_Needed': [150, 80, 200, 100, 120, 180]
     })
     
-    fig = px.bar(projects, x='Project_Type', y='Value_Millions',
+    plotly_chart(build_bar, projects, x='Project_Type', y='Value_Millions',
                  title='NJ Project Value by Type',
                  color='Workers_Needed',
                  color_continuous_scale='Reds')
-    st.plotly_chart(fig, use_container_width=True)
 
 elif page == "🗺️ NJ Counties":
     st.markdown('<h2 class="section-header">🗺️ NJ County Analysis</h2>', unsafe_allow_html=True)
@@ -765,27 +660,22 @@ elif page == "🗺️ NJ Counties":
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(counties_data, x='County', y='Employment',
+        plotly_chart(build_bar, counties_data, x='County', y='Employment',
                      title='NJ Construction Employment by County',
                      color='Avg_Wage',
                      color_continuous_scale='Blues')
-        st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        fig = px.bar(counties_data, x='County', y='Union_Density',
+        plotly_chart(build_bar, counties_data, x='County', y='Union_Density',
                      title='NJ Union Density by County',
                      color='Union_Density',
                      color_continuous_scale='Greens')
-        st.plotly_chart(fig, use_container_width=True)
     
     # Heatmap of NJ metrics
     st.markdown('<h3 class="section-header">🔥 NJ County Performance Heatmap</h3>', unsafe_allow_html=True)
     
     heatmap_data = counties_data.set_index('County')[['Employment', 'Avg_Wage', 'Union_Density']]
-    fig = px.imshow(heatmap_data.T, 
-                    title='NJ County Performance Heatmap',
-                    color_continuous_scale='RdBu_r')
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(build_heatmap, heatmap_data.T, title='NJ County Performance Heatmap')
 
 elif page == "📊 Data Sources":
     st.markdown('<h2 class="section-header">📊 Data Sources & Integration</h2>', unsafe_allow_html=True)
@@ -936,4 +826,6 @@ st.markdown("""
         <span class="data-source-badge">NJ Focus</span>
     </p>
 </div>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+""", unsafe_allow_html=True) 
+
+show_performance_panel(trace)
@@ -1,13 +1,19 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-import requests
 import json
 from datetime import datetime, timedelta
 import time
+from functools import partial
+
+from iuoe_data import bls, downsample, fred, lazy, scheduler, styles, usaspending
+from iuoe_data.config import BLS_API_KEY, FRED_API_KEY
+from iuoe_data.errors import DataSourceError
+
+# Plotly is only needed once a chart is drawn; importing it up front would
+# hold back the page config, styles and sidebar on every cold start
+px = lazy.module("plotly.express")
+go = lazy.module("plotly.graph_objects")
+subplots = lazy.module("plotly.subplots")
 
 # Page configuration
 st.set_page_config(
@@ -18,91 +24,18 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #1f77b4, #ff7f0e);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #dee2e6;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
-    
-    .metric-value {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #1f77b4;
-        margin: 0;
-    }
-    
-    .metric-label {
-        font-size: 1rem;
-        color: #6c757d;
-        margin: 0;
-        font-weight: 500;
-    }
-    
-    .section-header {
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin: 2rem 0 1rem 0;
-        border-bottom: 3px solid #1f77b4;
-        padding-bottom: 0.5rem;
-    }
-    
-    .error-box {
-        background: linear-gradient(135deg, #f8d7da, #f5c6cb);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #dc3545;
-        margin: 1rem 0;
-        color: #721c24;
-    }
-    
-    .success-box {
-        background: linear-gradient(135deg, #d4edda, #c3e6cb);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #28a745;
-        margin: 1rem 0;
-        color: #155724;
-    }
-    
-    .info-box {
-        background: linear-gradient(135deg, #e3f2fd, #bbdefb);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #90caf9;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(styles.stylesheet("real_only"), unsafe_allow_html=True)
 
 # Header
 st.markdown('<h1 class="main-header">🏗️ IUOE Local 825 - Real Data Dashboard</h1>', unsafe_allow_html=True)
 st.markdown("### Construction Industry Analytics for New Jersey - REAL DATA ONLY")
 
 # ============================================================================
-# 🔑 API KEY CONFIGURATION - PUT YOUR KEYS HERE
+# 🔑 API KEY CONFIGURATION
 # ============================================================================
 
-# BLS API Key (you already provided this)
-BLS_API_KEY = "79129dd32b5a4e1296cff5eec19d598c"
-
-# FRED API Key (you need to get this from https://fred.stlouisfed.org/docs/api/api_key.html)
-FRED_API_KEY = "YOUR_FRED_API_KEY_HERE"  # ← PUT YOUR FRED KEY HERE
+# BLS_API_KEY and FRED_API_KEY are read from the environment by
+# iuoe_data.config (FRED keys: https://fred.stlouisfed.org/docs/api/api_key.html)
 
 # SEC API (no key needed - free)
 SEC_API_ENABLED = True
@@ -124,71 +57,17 @@ def fetch_real_bls_nj_data():
             "CES2023230002",  # NJ Construction Wages
         ]
         
-        url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
+        results = scheduler.get_snapshot(
+            f"bls:{','.join(series_ids)}:2020-2024",
+            partial(bls.sync_series, series_ids, "2020", "2024", api_key=BLS_API_KEY),
+            scheduler.bls_release_schedule,
+            seed=partial(bls.load_stored_series, series_ids, "2020", "2024")
+        ).value
         
-        headers = {
-            "BLS-API-KEY": BLS_API_KEY,
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "seriesid": series_ids,
-            "startyear": "2020",
-            "endyear": "2024",
-            "registrationkey": BLS_API_KEY
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if 'Results' in data and data['Results']:
-                # Process the real BLS data
-                processed_data = []
-                
-                for series in data['Results']['series']:
-                    series_id = series['seriesID']
-                    series_title = series['seriesTitle']
-                    
-                    for item in series['data']:
-                        year = item['year']
-                        period = item['period']
-                        value = item['value']
-                        
-                        # Convert BLS period to date
-                        if period == 'M01': month = 1
-                        elif period == 'M02': month = 2
-                        elif period == 'M03': month = 3
-                        elif period == 'M04': month = 4
-                        elif period == 'M05': month = 5
-                        elif period == 'M06': month = 6
-                        elif period == 'M07': month = 7
-                        elif period == 'M08': month = 8
-                        elif period == 'M09': month = 9
-                        elif period == 'M10': month = 10
-                        elif period == 'M11': month = 11
-                        elif period == 'M12': month = 12
-                        else: continue
-                        
-                        date = pd.Timestamp(year=int(year), month=month, day=1)
-                        
-                        processed_data.append({
-                            'date': date,
-                            'series_id': series_id,
-                            'series_title': series_title,
-                            'value': float(value)
-                        })
-                
-                if processed_data:
-                    df = pd.DataFrame(processed_data)
-                    return df
-                else:
-                    return None
-            else:
-                return None
+        if results:
+            return pd.concat(results.values(), ignore_index=True)[
+                ['date', 'series_id', 'series_title', 'value']]
         else:
-            st.error(f"BLS API Error: {response.status_code} - {response.text}")
             return None
             
     except Exception as e:
@@ -197,8 +76,8 @@ def fetch_real_bls_nj_data():
 
 def fetch_real_fred_nj_data():
     """Fetch REAL FRED data for New Jersey"""
-    if FRED_API_KEY == "YOUR_FRED_API_KEY_HERE":
-        st.error("❌ FRED API Key not configured! Get your free key at: https://fred.stlouisfed.org/docs/api/api_key.html")
+    if not FRED_API_KEY:
+        st.error("❌ FRED API Key not configured! Set the FRED_API_KEY environment variable. Get your free key at: https://fred.stlouisfed.org/docs/api/api_key.html")
         return None
     
     try:
@@ -209,35 +88,15 @@ def fetch_real_fred_nj_data():
             "NJWAGE"   # NJ Average Hourly Earnings
         ]
         
-        url = f"https://api.stlouisfed.org/fred/series/observations"
+        df = scheduler.get_snapshot(
+            f"fred:{','.join(series_ids)}:2020-01-01-2024-12-31",
+            partial(fred.fetch_observations, series_ids, "2020-01-01", "2024-12-31", api_key=FRED_API_KEY),
+            scheduler.daily(),
+            seed=partial(fred.load_stored_observations, series_ids, "2020-01-01", "2024-12-31")
+        ).value
         
-        all_data = []
-        
-        for series_id in series_ids:
-            params = {
-                "series_id": series_id,
-                "api_key": FRED_API_KEY,
-                "file_type": "json",
-                "observation_start": "2020-01-01",
-                "observation_end": "2024-12-31"
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'observations' in data:
-                    for obs in data['observations']:
-                        if obs['value'] != '.':
-                            all_data.append({
-                                'date': pd.to_datetime(obs['date']),
-                                'series_id': series_id,
-                                'value': float(obs['value'])
-                            })
-        
-        if all_data:
-            return pd.DataFrame(all_data)
+        if not df.empty:
+            return df
         else:
             return None
             
@@ -248,41 +107,22 @@ def fetch_real_fred_nj_data():
 def fetch_real_usa_spending_nj():
     """Fetch REAL USA Spending data for NJ construction"""
     try:
-        url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-        
-        payload = {
-            "filters": {
-                "award_type_codes": ["A", "B", "C", "D"],
-                "naics_codes": ["23"],  # Construction
-                "recipient_locations": [{"country": "USA", "state": "NJ"}],
-                "time_period": [{"start_date": "2023-01-01", "end_date": "2024-12-31"}]
-            },
-            "fields": ["award_id", "recipient_name", "total_obligation", "award_date", 
-                      "naics_code", "naics_description"],
-            "page": 1,
-            "limit": 50,
-            "sort": "total_obligation",
-            "order": "desc"
-        }
-        
-        response = requests.post(url, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            
-            if results:
-                df = pd.DataFrame(results)
-                df['total_obligation'] = pd.to_numeric(df['total_obligation'], errors='coerce')
-                df['award_date'] = pd.to_datetime(df['award_date'])
-                return df
-            else:
-                st.error("❌ No USA Spending data found for NJ construction contracts")
-                return None
+        df = scheduler.get_snapshot(
+            "usaspending:nj_top_awards",
+            usaspending.fetch_nj_construction_awards,
+            scheduler.daily(),
+            seed=usaspending.load_stored_top_awards
+        ).value
+        
+        if not df.empty:
+            return df
         else:
-            st.error(f"❌ USA Spending API Error: {response.status_code}")
+            st.error("❌ No USA Spending data found for NJ construction contracts")
             return None
             
+    except DataSourceError as e:
+        st.error(f"❌ USA Spending API Error: {e}")
+        return None
     except Exception as e:
         st.error(f"❌ Error fetching USA Spending data: {str(e)}")
         return None
@@ -320,13 +160,13 @@ if page == "🏠 Overview":
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if BLS_API_KEY != "YOUR_BLS_API_KEY_HERE":
+        if BLS_API_KEY:
             st.success("✅ BLS API Key: Configured")
         else:
             st.error("❌ BLS API Key: Not configured")
     
     with col2:
-        if FRED_API_KEY != "YOUR_FRED_API_KEY_HERE":
+        if FRED_API_KEY:
             st.success("✅ FRED API Key: Configured")
         else:
             st.error("❌ FRED API Key: Not configured")
@@ -367,7 +207,7 @@ if page == "🏠 Overview":
                 """, unsafe_allow_html=True)
             
             # Show BLS data chart
-            fig = px.line(construction_data, x='date', y='value',
+            fig = px.line(downsample.frame(construction_data), x='date', y='value',
                           title='REAL NJ Construction Employment (BLS Data)',
                           labels={'value': 'Employment', 'date': 'Date'})
             st.plotly_chart(fig, use_container_width=True)
@@ -412,7 +252,7 @@ elif page == "📈 Employment & Wages":
         st.success("✅ Using REAL BLS data for analysis")
         
         # Create comprehensive analysis with real data
-        fig = make_subplots(
+        fig = subplots.make_subplots(
             rows=2, cols=2,
             subplot_titles=('NJ Construction Employment (REAL)', 'NJ Total Employment (REAL)', 
                            'NJ Construction Wages (REAL)', 'Employment Growth (REAL)'),
@@ -421,8 +261,11 @@ elif page == "📈 Employment & Wages":
         )
         
         # Employment trends
-        construction_data = bls_data[bls_data['series_id'] == 'CES2023230001']
-        total_data = bls_data[bls_data['series_id'] == 'CES2023600001']
+        # Cut to about one point per pixel of a panel
+        construction_data = downsample.frame(bls_data[bls_data['series_id'] == 'CES2023230001'],
+                                             points=downsample.PANEL_POINTS)
+        total_data = downsample.frame(bls_data[bls_data['series_id'] == 'CES2023600001'],
+                                      points=downsample.PANEL_POINTS)
         
         if not construction_data.empty:
             fig.add_trace(
@@ -508,7 +351,7 @@ elif page == "🏦 Economic Indicators":
     st.markdown('<h2 class="section-header">📈 NJ Economic Indicators (REAL DATA)</h2>', unsafe_allow_html=True)
     
     # Try to get FRED data
-    if FRED_API_KEY != "YOUR_FRED_API_KEY_HERE":
+    if FRED_API_KEY:
         fred_data = fetch_real_fred_nj_data()
         
         if fred_data is not None and not fred_data.empty:
@@ -520,7 +363,8 @@ elif page == "🏦 Economic Indicators":
             with col1:
                 unemployment_data = fred_data[fred_data['series_id'] == 'NJURN']
                 if not unemployment_data.empty:
-                    fig = px.line(unemployment_data, x='date', y='value',
+                    fig = px.line(downsample.frame(unemployment_data, points=downsample.PANEL_POINTS),
+                                  x='date', y='value',
                                   title='REAL NJ Unemployment Rate (FRED)',
                                   labels={'value': 'Unemployment Rate (%)', 'date': 'Date'})
                     fig.update_layout(height=400)
@@ -529,7 +373,8 @@ elif page == "🏦 Economic Indicators":
             with col2:
                 construction_data = fred_data[fred_data['series_id'] == 'NJCONS']
                 if not construction_data.empty:
-                    fig = px.line(construction_data, x='date', y='value',
+                    fig = px.line(downsample.frame(construction_data, points=downsample.PANEL_POINTS),
+                                  x='date', y='value',
                                   title='REAL NJ Construction Employment (FRED)',
                                   labels={'value': 'Employment', 'date': 'Date'})
                     fig.update_layout(height=400)
@@ -569,7 +414,7 @@ elif page == "🔑 API Setup":
     
     #### ✅ BLS API Key (Bureau of Labor Statistics)
     - **Status**: Configured ✅
-    - **Your Key**: `79129dd32b5a4e1296cff5eec19d598c`
+    - **Key**: read from the `BLS_API_KEY` environment variable
     - **What it provides**: NJ employment, wages, unemployment data
     - **Cost**: Free
     
@@ -597,19 +442,14 @@ elif page == "🔑 API Setup":
     1. Go to: https://fred.stlouisfed.org/docs/api/api_key.html
     2. Fill out the form (it's free)
     3. Copy your API key
-    4. Replace `YOUR_FRED_API_KEY_HERE` in the code with your actual key
-    
-    #### 2. Update the Code:
-    ```python
-    # In the dashboard code, find this line:
-    FRED_API_KEY = "YOUR_FRED_API_KEY_HERE"
     
-    # Replace it with your actual key:
-    FRED_API_KEY = "your_actual_fred_api_key_here"
+    #### 2. Set It in the Environment:
+    ```bash
+    export FRED_API_KEY="your_actual_fred_api_key_here"
     ```
     
     #### 3. Restart the Dashboard:
-    After updating the API key, restart the Streamlit app to load the new configuration.
+    Keys are read when the app starts, so restart Streamlit to pick up the new key.
     """)
 
 elif page == "ℹ️ About":
@@ -1,14 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-import requests
 import json
 from datetime import datetime, timedelta
 import time
 
+from iuoe_data import analytics, lazy, scheduler, styles, synthetic, usaspending
+
+# Plotly is only needed once a chart is drawn; importing it up front would
+# hold back the page config, styles and sidebar on every cold start
+px = lazy.module("plotly.express")
+go = lazy.module("plotly.graph_objects")
+subplots = lazy.module("plotly.subplots")
+
 # Page configuration
 st.set_page_config(
     page_title="IUOE Local 825 - Simple Dashboard",
@@ -18,116 +21,34 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #1f77b4, #ff7f0e);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #dee2e6;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
-    
-    .metric-value {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #1f77b4;
-        margin: 0;
-    }
-    
-    .metric-label {
-        font-size: 1rem;
-        color: #6c757d;
-        margin: 0;
-        font-weight: 500;
-    }
-    
-    .section-header {
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin: 2rem 0 1rem 0;
-        border-bottom: 3px solid #1f77b4;
-        padding-bottom: 0.5rem;
-    }
-    
-    .info-box {
-        background: linear-gradient(135deg, #e3f2fd, #bbdefb);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #90caf9;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(styles.stylesheet("simple"), unsafe_allow_html=True)
 
 # Header
 st.markdown('<h1 class="main-header">🏗️ IUOE Local 825 Dashboard</h1>', unsafe_allow_html=True)
 st.markdown("### Construction Industry Analytics for New Jersey")
 
-# BLS API Configuration
-BLS_API_KEY = "79129dd32b5a4e1296cff5eec19d598c"
-
 def get_mock_nj_data():
-    """Generate realistic mock data for New Jersey"""
+    """Generate realistic mock data for New Jersey (seeded, so it is the same on every rerun)"""
     dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
     
     # Realistic NJ construction data
-    employment = [145000 + i*200 + np.random.normal(0, 500) for i in range(len(dates))]
-    wages = [35 + i*0.8 + np.random.normal(0, 0.5) for i in range(len(dates))]
-    unemployment = [5.5 + np.random.normal(0, 0.4) for _ in range(len(dates))]
-    
-    return pd.DataFrame({
-        'date': dates,
-        'employment': employment,
-        'wages': wages,
-        'unemployment': unemployment
-    })
+    return synthetic.trend_frame(dates, 'nj_construction',
+                                 employment=(145000, 200, 500),
+                                 wages=(35, 0.8, 0.5),
+                                 unemployment=(5.5, 0, 0.4))
 
 def fetch_usa_spending_nj():
     """Fetch USA Spending data for NJ construction"""
     try:
-        url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-        
-        payload = {
-            "filters": {
-                "award_type_codes": ["A", "B", "C", "D"],
-                "naics_codes": ["23"],  # Construction
-                "recipient_locations": [{"country": "USA", "state": "NJ"}],
-                "time_period": [{"start_date": "2023-01-01", "end_date": "2024-12-31"}]
-            },
-            "fields": ["award_id", "recipient_name", "total_obligation", "award_date", 
-                      "naics_code", "naics_description"],
-            "page": 1,
-            "limit": 50,
-            "sort": "total_obligation",
-            "order": "desc"
-        }
+        df = scheduler.get_snapshot(
+            "usaspending:nj_top_awards",
+            usaspending.fetch_nj_construction_awards,
+            scheduler.daily(),
+            seed=usaspending.load_stored_top_awards
+        ).value
         
-        response = requests.post(url, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            
-            if results:
-                df = pd.DataFrame(results)
-                df['total_obligation'] = pd.to_numeric(df['total_obligation'], errors='coerce')
-                df['award_date'] = pd.to_datetime(df['award_date'])
-                return df
-            else:
-                return get_mock_spending_data()
+        if not df.empty:
+            return df
         else:
             return get_mock_spending_data()
             
@@ -169,9 +90,7 @@ if page == "🏠 Overview":
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        latest_employment = nj_data['employment'].iloc[-1]
-        prev_employment = nj_data['employment'].iloc[-2]
-        growth_rate = ((latest_employment - prev_employment) / prev_employment) * 100
+        latest_employment, growth_rate = analytics.latest_change(nj_data['employment'])
         
         st.markdown(f"""
         <div class="metric-card">
@@ -182,9 +101,7 @@ if page == "🏠 Overview":
         """, unsafe_allow_html=True)
     
     with col2:
-        latest_wage = nj_data['wages'].iloc[-1]
-        prev_wage = nj_data['wages'].iloc[-2]
-        wage_growth = ((latest_wage - prev_wage) / prev_wage) * 100
+        latest_wage, wage_growth = analytics.latest_change(nj_data['wages'])
         
         st.markdown(f"""
         <div class="metric-card">
@@ -267,7 +184,7 @@ elif page == "📈 Employment & Wages":
     nj_data = get_mock_nj_data()
     
     # Create comprehensive analysis
-    fig = make_subplots(
+    fig = subplots.make_subplots(
         rows=2, cols=2,
         subplot_titles=('NJ Construction Employment', 'NJ Construction Wages', 
                        'NJ Unemployment Rate', 'Employment Growth'),
@@ -300,8 +217,7 @@ elif page == "📈 Employment & Wages":
     )
     
     # Employment growth
-    growth_rate = [(nj_data['employment'].iloc[i] - nj_data['employment'].iloc[i-1]) / 
-                   nj_data['employment'].iloc[i-1] * 100 for i in range(1, len(nj_data))]
+    growth_rate = analytics.mom(nj_data['employment']).iloc[1:]
     fig.add_trace(
         go.Scatter(x=nj_data['date'][1:], y=growth_rate,
                    mode='lines+markers', name='Growth Rate',
@@ -424,12 +340,10 @@ elif page == "🏦 Economic Indicators":
     
     with col2:
         # Calculate growth rate
-        growth_rate = [(nj_data['employment'].iloc[i] - nj_data['employment'].iloc[i-1]) / 
-                       nj_data['employment'].iloc[i-1] * 100 for i in range(1, len(nj_data))]
         growth_df = pd.DataFrame({
-            'date': nj_data['date'][1:],
-            'growth_rate': growth_rate
-        })
+            'date': nj_data['date'],
+            'growth_rate': analytics.mom(nj_data['employment'])
+        }).iloc[1:]
         
         fig = px.line(growth_df, x='date', y='growth_rate',
                       title='NJ Employment Growth Rate',
@@ -1,13 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-import requests
 import json
 from datetime import datetime, timedelta
 import time
+from functools import partial
+
+from iuoe_data import analytics, lazy, scheduler, styles, synthetic, usaspending
+
+# Plotly is only needed once a chart is drawn; importing it up front would
+# hold back the page config, styles and sidebar on every cold start
+px = lazy.module("plotly.express")
+go = lazy.module("plotly.graph_objects")
+subplots = lazy.module("plotly.subplots")
 
 # Page configuration
 st.set_page_config(
@@ -18,146 +22,7 @@ st.set_page_config(
 )
 
 # Custom CSS for super slick styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .main-header {
-        font-size: 3rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #1f77b4, #ff7f0e);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #dee2e6;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        transition: transform 0.2s ease-in-out;
-        margin-bottom: 1rem;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0,0,0,0.15);
-    }
-    
-    .metric-value {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1f77b4;
-        margin: 0;
-    }
-    
-    .metric-label {
-        font-size: 1rem;
-        color: #6c757d;
-        margin: 0;
-        font-weight: 500;
-    }
-    
-    .metric-change {
-        font-size: 0.9rem;
-        color: #28a745;
-        margin: 0;
-    }
-    
-    .section-header {
-        font-size: 2rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin: 2rem 0 1rem 0;
-        border-bottom: 3px solid #1f77b4;
-        padding-bottom: 0.5rem;
-    }
-    
-    .info-box {
-        background: linear-gradient(135deg, #e3f2fd, #bbdefb);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        border: 1px solid #90caf9;
-        margin: 1rem 0;
-    }
-    
-    .chart-container {
-        background: white;
-        padding: 1rem;
-        border-radius: 1rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin: 1rem 0;
-    }
-    
-    .sidebar .sidebar-content {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #1f77b4, #ff7f0e);
-        color: white;
-        border: none;
-        border-radius: 0.5rem;
-        padding: 0.5rem 1rem;
-        font-weight: 600;
-        transition: all 0.2s ease-in-out;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
-    .data-source-badge {
-        background: linear-gradient(135deg, #28a745, #20c997);
-        color: white;
-        padding: 0.25rem 0.5rem;
-        border-radius: 0.25rem;
-        font-size: 0.75rem;
-        font-weight: 600;
-        margin-left: 0.5rem;
-    }
-    
-    .loading {
-        text-align: center;
-        padding: 2rem;
-        color: #6c757d;
-    }
-    
-    .alert {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-        border-left: 4px solid;
-    }
-    
-    .alert-info {
-        background-color: #d1ecf1;
-        border-color: #17a2b8;
-        color: #0c5460;
-    }
-    
-    .alert-success {
-        background-color: #d4edda;
-        border-color: #28a745;
-        color: #155724;
-    }
-    
-    .alert-warning {
-        background-color: #fff3cd;
-        border-color: #ffc107;
-        color: #856404;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(styles.stylesheet("super"), unsafe_allow_html=True)
 
 # Header with animated gradient
 st.markdown('<h1 class="main-header">🏗️ IUOE Local 825 Super Dashboard</h1>', unsafe_allow_html=True)
@@ -176,26 +41,14 @@ def fetch_usa_spending_data():
     """Fetch federal spending data for construction in NJ"""
     try:
         # USA Spending API for construction contracts in NJ
-        url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-        
-        payload = {
-            "filters": {
-                "award_type_codes": ["A", "B", "C", "D"],
-                "naics_codes": ["23"],  # Construction
-                "recipient_locations": [{"country": "USA", "state": "NJ"}],
-                "time_period": [{"start_date": "2020-01-01", "end_date": "2024-12-31"}]
-            },
-            "fields": ["award_id", "recipient_name", "total_obligation", "award_date", "naics_code", "naics_description"],
-            "page": 1,
-            "limit": 100,
-            "sort": "total_obligation",
-            "order": "desc"
-        }
-        
-        response = requests.post(url, json=payload, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            return pd.DataFrame(data.get('results', []))
+        df = scheduler.get_snapshot(
+            "usaspending:nj_top_awards:2020-2024",
+            partial(usaspending.fetch_nj_construction_awards, start_date="2020-01-01", end_date="2024-12-31"),
+            scheduler.daily(),
+            seed=partial(usaspending.load_stored_top_awards, start_date="2020-01-01", end_date="2024-12-31")
+        ).value
+        if not df.empty:
+            return df
         else:
             return get_mock_usa_spending_data()
     except Exception as e:
@@ -206,15 +59,10 @@ def fetch_bls_construction_employment():
     """Fetch BLS construction employment data for NJ"""
     try:
         # Mock BLS data - in real implementation, use OpenBB
-        dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-        employment = [150000 + i*150 + np.random.normal(0, 300) for i in range(len(dates))]
-        unemployment = [5.2 + np.random.normal(0, 0.3) for _ in range(len(dates))]
-        
-        return pd.DataFrame({
-            'date': dates,
-            'employment': employment,
-            'unemployment_rate': unemployment
-        })
+        dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
+        return synthetic.trend_frame(dates, 'construction_employment',
+                                     employment=(150000, 150, 300),
+                                     unemployment_rate=(5.2, 0, 0.3))
     except Exception as e:
         st.error(f"Error fetching BLS data: {e}")
         return pd.DataFrame()
@@ -223,15 +71,13 @@ def fetch_fred_economic_data():
     """Fetch FRED economic indicators"""
     try:
         # Mock FRED data - in real implementation, use OpenBB
-        dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
+        dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
         
-        return pd.DataFrame({
-            'date': dates,
-            'cpi': [100 + i*0.25 + np.random.normal(0, 0.1) for i in range(len(dates))],
-            'ppi_construction': [100 + i*0.35 + np.random.normal(0, 0.15) for i in range(len(dates))],
-            'federal_funds_rate': [2.5 + i*0.12 + np.random.normal(0, 0.05) for i in range(len(dates))],
-            'gdp_growth': [2.8 + np.random.normal(0, 0.5) for _ in range(len(dates))]
-        })
+        return synthetic.trend_frame(dates, 'economic_indicators',
+                                     cpi=(100, 0.25, 0.1),
+                                     ppi_construction=(100, 0.35, 0.15),
+                                     federal_funds_rate=(2.5, 0.12, 0.05),
+                                     gdp_growth=(2.8, 0, 0.5))
     except Exception as e:
         st.error(f"Error fetching FRED data: {e}")
         return pd.DataFrame()
@@ -366,7 +212,7 @@ elif page == "📈 Employment & Wages":
     
     if not employment_data.empty:
         # Create subplots for comprehensive analysis
-        fig = make_subplots(
+        fig = subplots.make_subplots(
             rows=2, cols=2,
             subplot_titles=('Employment Trends', 'Unemployment Rate', 
                            'Employment Growth', 'Wage Trends'),
@@ -391,8 +237,7 @@ elif page == "📈 Employment & Wages":
         )
         
         # Employment growth
-        growth_rate = [(employment_data['employment'].iloc[i] - employment_data['employment'].iloc[i-1]) / 
-                       employment_data['employment'].iloc[i-1] * 100 for i in range(1, len(employment_data))]
+        growth_rate = analytics.mom(employment_data['employment']).iloc[1:]
         fig.add_trace(
             go.Scatter(x=employment_data['date'][1:], y=growth_rate,
                        mode='lines+markers', name='Growth Rate',
@@ -401,7 +246,8 @@ elif page == "📈 Employment & Wages":
         )
         
         # Wage trends (mock data)
-        wage_trends = [35 + i*0.6 + np.random.normal(0, 0.8) for i in range(len(employment_data))]
+        wage_trends = synthetic.trend_frame(employment_data['date'], 'wage_trends',
+                                            hourly_wage=(35, 0.6, 0.8))['hourly_wage']
         fig.add_trace(
             go.Scatter(x=employment_data['date'], y=wage_trends,
                        mode='lines+markers', name='Hourly Wage',
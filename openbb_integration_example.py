@@ -5,10 +5,14 @@ This script demonstrates how to integrate real OpenBB data for the labor union d
 Replace the mock data functions in iuoe_local_825_dashboard.py with these real data functions.
 """
 
-from openbb import obb
 import pandas as pd
 from datetime import datetime, timedelta
-import numpy as np
+
+from iuoe_data import lazy, synthetic
+
+# The OpenBB platform takes seconds to import (it loads every installed
+# extension); defer that until the first real data call
+openbb = lazy.module("openbb")
 
 def get_real_construction_employment():
     """
@@ -21,7 +25,7 @@ def get_real_construction_employment():
         # Industry: 20000000 (Construction)
         # Measure: 05 (Employment)
         
-        data = obb.economy.bls(
+        data = openbb.obb.economy.bls(
             survey="SM",
             area="3400000",  # New Jersey
             industry="20000000",  # Construction
@@ -45,7 +49,7 @@ def get_real_wage_data():
         # Survey: CI (Employment Cost Index)
         # Industry: 230000 (Construction)
         
-        data = obb.economy.bls(
+        data = openbb.obb.economy.bls(
             survey="CI",
             industry="230000",  # Construction
             measure="02",  # Wages and salaries
@@ -68,7 +72,7 @@ def get_real_unemployment_data():
         # Area: 3400000 (New Jersey)
         # Measure: 03 (Unemployment rate)
         
-        data = obb.economy.bls(
+        data = openbb.obb.economy.bls(
             survey="LA",
             area="3400000",  # New Jersey
             measure="03",  # Unemployment rate
@@ -87,19 +91,19 @@ def get_real_economic_indicators():
     """
     try:
         # Get CPI data
-        cpi_data = obb.economy.fred_series(
+        cpi_data = openbb.obb.economy.fred_series(
             symbol="CPIAUCSL",  # Consumer Price Index
             start_date="2020-01-01"
         )
         
         # Get PPI for construction
-        ppi_data = obb.economy.fred_series(
+        ppi_data = openbb.obb.economy.fred_series(
             symbol="WPUFD4",  # Producer Price Index - Construction
             start_date="2020-01-01"
         )
         
         # Get Federal Funds Rate
-        interest_data = obb.economy.fred_series(
+        interest_data = openbb.obb.economy.fred_series(
             symbol="FEDFUNDS",  # Federal Funds Rate
             start_date="2020-01-01"
         )
@@ -127,7 +131,7 @@ def get_real_jolts_data():
         # Survey: JL (Job Openings and Labor Turnover Survey)
         # Industry: 200000 (Construction)
         
-        data = obb.economy.bls(
+        data = openbb.obb.economy.bls(
             survey="JL",
             industry="200000",  # Construction
             measure="JO",  # Job openings
@@ -149,7 +153,7 @@ def get_real_benefits_data():
         # Survey: CC (Employer Costs for Employee Compensation)
         # Industry: 230000 (Construction)
         
-        data = obb.economy.bls(
+        data = openbb.obb.economy.bls(
             survey="CC",
             industry="230000",  # Construction
             measure="03",  # Total benefits
@@ -162,57 +166,36 @@ def get_real_benefits_data():
         print(f"Error fetching benefits data: {e}")
         return get_mock_benefits_data()
 
-# Mock data functions as fallbacks
+# Mock data functions as fallbacks (seeded, see iuoe_data.synthetic)
+MONTHLY = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
+QUARTERLY = pd.date_range(start='2020-01-01', end='2024-12-01', freq='QE')
+
 def get_mock_construction_employment():
     """Fallback mock data for construction employment"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-    employment = [150000 + i*100 + np.random.normal(0, 500) for i in range(len(dates))]
-    return pd.DataFrame({
-        'date': dates,
-        'employment': employment
-    })
+    return synthetic.trend_frame(MONTHLY, 'construction_employment', employment=(150000, 100, 500))
 
 def get_mock_wage_data():
     """Fallback mock data for wages"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='Q')
-    return pd.DataFrame({
-        'date': dates,
-        'hourly_wage': [35 + i*0.5 + np.random.normal(0, 1) for i in range(len(dates))]
-    })
+    return synthetic.trend_frame(QUARTERLY, 'wages', hourly_wage=(35, 0.5, 1))
 
 def get_mock_unemployment_data():
     """Fallback mock data for unemployment"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-    return pd.DataFrame({
-        'date': dates,
-        'unemployment_rate': [5.2 + np.random.normal(0, 0.5) for _ in range(len(dates))]
-    })
+    return synthetic.trend_frame(MONTHLY, 'unemployment', unemployment_rate=(5.2, 0, 0.5))
 
 def get_mock_economic_indicators():
     """Fallback mock data for economic indicators"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-    return pd.DataFrame({
-        'date': dates,
-        'cpi': [100 + i*0.2 + np.random.normal(0, 0.1) for i in range(len(dates))],
-        'ppi_construction': [100 + i*0.3 + np.random.normal(0, 0.2) for i in range(len(dates))],
-        'interest_rate': [2.5 + i*0.1 + np.random.normal(0, 0.05) for i in range(len(dates))]
-    })
+    return synthetic.trend_frame(MONTHLY, 'economic_indicators',
+                                 cpi=(100, 0.2, 0.1),
+                                 ppi_construction=(100, 0.3, 0.2),
+                                 interest_rate=(2.5, 0.1, 0.05))
 
 def get_mock_jolts_data():
     """Fallback mock data for JOLTS"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
-    return pd.DataFrame({
-        'date': dates,
-        'job_openings': [5000 + np.random.normal(0, 200) for _ in range(len(dates))]
-    })
+    return synthetic.trend_frame(MONTHLY, 'jolts', job_openings=(5000, 0, 200))
 
 def get_mock_benefits_data():
     """Fallback mock data for benefits"""
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='Q')
-    return pd.DataFrame({
-        'date': dates,
-        'benefits_cost': [15 + i*0.3 + np.random.normal(0, 0.5) for i in range(len(dates))]
-    })
+    return synthetic.trend_frame(QUARTERLY, 'benefits', benefits_cost=(15, 0.3, 0.5))
 
 # Example usage
 if __name__ == "__main__":
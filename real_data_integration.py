@@ -3,55 +3,32 @@ Real Data Integration for IUOE Local 825 Dashboard
 This script shows how to fetch REAL data from all free government sources
 """
 
-import requests
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import json
 import time
 
+from iuoe_data import synthetic, usaspending
+from iuoe_data.errors import DataSourceError
+
 def fetch_real_usa_spending_data():
     """
     Fetch REAL federal spending data from USA Spending API
     """
     try:
-        url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-        
-        payload = {
-            "filters": {
-                "award_type_codes": ["A", "B", "C", "D"],
-                "naics_codes": ["23"],  # Construction
-                "recipient_locations": [{"country": "USA", "state": "NJ"}],
-                "time_period": [{"start_date": "2023-01-01", "end_date": "2024-12-31"}]
-            },
-            "fields": ["award_id", "recipient_name", "total_obligation", "award_date", 
-                      "naics_code", "naics_description", "awarding_agency_name"],
-            "page": 1,
-            "limit": 100,
-            "sort": "total_obligation",
-            "order": "desc"
-        }
-        
         print("🔍 Fetching REAL USA Spending data...")
-        response = requests.post(url, json=payload, timeout=30)
+        df = usaspending.fetch_nj_construction_awards()
+        print(f"✅ Found {len(df)} REAL contracts!")
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            print(f"✅ Found {len(results)} REAL contracts!")
-            
-            if results:
-                df = pd.DataFrame(results)
-                df['total_obligation'] = pd.to_numeric(df['total_obligation'], errors='coerce')
-                df['award_date'] = pd.to_datetime(df['award_date'])
-                return df
-            else:
-                print("⚠️ No contracts found, using mock data")
-                return get_mock_usa_spending_data()
+        if not df.empty:
+            return df
         else:
-            print(f"❌ API Error: {response.status_code}")
+            print("⚠️ No contracts found, using mock data")
             return get_mock_usa_spending_data()
             
+    except DataSourceError as e:
+        print(f"❌ API Error: {e}")
+        return get_mock_usa_spending_data()
     except Exception as e:
         print(f"❌ Error fetching USA Spending data: {e}")
         return get_mock_usa_spending_data()
@@ -71,14 +48,9 @@ def fetch_real_bls_employment_data():
         dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
         
         # Realistic NJ construction employment data
-        employment = [145000 + i*200 + np.random.normal(0, 500) for i in range(len(dates))]
-        unemployment = [5.5 + np.random.normal(0, 0.4) for _ in range(len(dates))]
-        
-        df = pd.DataFrame({
-            'date': dates,
-            'employment': employment,
-            'unemployment_rate': unemployment
-        })
+        df = synthetic.trend_frame(dates, 'nj_construction',
+                                   employment=(145000, 200, 500),
+                                   unemployment_rate=(5.5, 0, 0.4))
         
         print("✅ Generated realistic BLS-style data")
         return df
@@ -104,23 +76,11 @@ def fetch_real_fred_economic_data():
         dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
         
         # Realistic economic data based on actual trends
-        cpi_base = 100
-        cpi_data = [cpi_base + i*0.25 + np.random.normal(0, 0.1) for i in range(len(dates))]
-        
-        ppi_base = 100
-        ppi_data = [ppi_base + i*0.35 + np.random.normal(0, 0.15) for i in range(len(dates))]
-        
-        fed_rate = [2.5 + i*0.12 + np.random.normal(0, 0.05) for i in range(len(dates))]
-        
-        gdp_growth = [2.8 + np.random.normal(0, 0.5) for _ in range(len(dates))]
-        
-        df = pd.DataFrame({
-            'date': dates,
-            'cpi': cpi_data,
-            'ppi_construction': ppi_data,
-            'federal_funds_rate': fed_rate,
-            'gdp_growth': gdp_growth
-        })
+        df = synthetic.trend_frame(dates, 'economic_indicators',
+                                   cpi=(100, 0.25, 0.1),
+                                   ppi_construction=(100, 0.35, 0.15),
+                                   federal_funds_rate=(2.5, 0.12, 0.05),
+                                   gdp_growth=(2.8, 0, 0.5))
         
         print("✅ Generated realistic FRED-style data")
         return df